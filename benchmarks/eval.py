@@ -0,0 +1,110 @@
+"""Expressions evaluation benchmark.
+
+Evaluates an expression per built-in function, using:
+
+* ``interpreted``: :class:`EvalNS` (previous :class:`Evaluator`
+  implementation)
+* ``compiled``: :class:`Compiler`
+
+Usage (from the repository root)::
+
+    PYTHONPATH=. python benchmarks/eval.py [--iterations 20000]
+"""
+
+import argparse
+from time import perf_counter
+
+from m42pl.utils.eval import Evaluator
+
+
+# Event fields
+DATA = {
+    'count': 42,
+    'ratio': 0.75,
+    'code': '200',
+    'text': ' hello  world ',
+    'path': '/var/log/syslog',
+    'items': ['a', 'b', 'c'],
+    'date': '2021-03-04 05:06:07',
+    'http': {'request': {'method': 'GET'}, 'status': 404},
+}
+
+# Expressions, per function
+EXPRESSIONS = [
+    'field(count, 0)',
+    'isnull(missing)',
+    'isnotnull(http.status)',
+    'coalesce(missing, code)',
+    'keys(http)',
+    'now()',
+    'reltime("-1d@d")',
+    "strftime(1600000000.0, '%Y-%m-%d')",
+    "strptime(date, '%Y-%m-%d %H:%M:%S')",
+    'tostring(count)',
+    'toint(code)',
+    'tofloat(code)',
+    'clean(text)',
+    "split(text, 'o')",
+    'strip(text, " ")',
+    'list(count, code, ratio)',
+    "join(items, ',')",
+    'slice(items, 1)',
+    'idx(items, 0)',
+    'length(items)',
+    'round(ratio, 1)',
+    'even(count)',
+    'true(count)',
+    "match(http.request.method, ['^GET$', '^POST$'])",
+    'basename(path)',
+    'dirname(path)',
+    "joinpath(path, 'x')",
+    'cwd()',
+    # Operators and fields access
+    'code == 200 and http.status >= 400',
+    'count * ratio + 1',
+    'http.request.method',
+]
+
+
+def measure(evaluator: Evaluator, iterations: int) -> float:
+    start = perf_counter()
+    for _ in range(iterations):
+        evaluator(DATA)
+    return (perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+    print(f'{"expression":<52}{"interpreted":>14}{"compiled":>14}{"speedup":>10}')
+    total_interpreted, total_compiled = 0.0, 0.0
+    for expression in EXPRESSIONS:
+        interpreted = Evaluator(expression, interpreted=True)
+        compiled = Evaluator(expression)
+        if compiled.closure is None:
+            print(f'{expression:<52} (not compiled)')
+            continue
+        if expression not in ('now()', 'reltime("-1d@d")') \
+                and interpreted(DATA) != compiled(DATA):
+            print(f'{expression:<52} (results differ)')
+        time_interpreted = measure(interpreted, args.iterations)
+        time_compiled = measure(compiled, args.iterations)
+        total_interpreted += time_interpreted
+        total_compiled += time_compiled
+        print((
+            f'{expression:<52}'
+            f'{time_interpreted:>12.2f}us'
+            f'{time_compiled:>12.2f}us'
+            f'{time_interpreted / time_compiled:>9.1f}x'
+        ))
+    print((
+        f'{"total":<52}'
+        f'{total_interpreted:>12.2f}us'
+        f'{total_compiled:>12.2f}us'
+        f'{total_interpreted / total_compiled:>9.1f}x'
+    ))
+
+
+if __name__ == '__main__':
+    main()
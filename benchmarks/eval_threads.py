@@ -0,0 +1,114 @@
+"""Concurrent expressions evaluation stress test.
+
+Evaluates a set of shared :class:`Evaluator` instances from several
+threads at once, checks each result against the single-threaded one and
+reports the throughput per number of threads.
+
+The evaluators are tested in both compiled and interpreted
+(:class:`EvalNS`) modes. On a GIL-enabled Python build, the throughput
+is not expected to scale with the number of threads; The thread switch
+interval is lowered to increase the odds of interleaving evaluations.
+
+Usage (from the repository root)::
+
+    PYTHONPATH=. python benchmarks/eval_threads.py [--threads 1 2 4 8] [--rows 2000]
+"""
+
+import sys
+import argparse
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
+
+from m42pl.utils.eval import Evaluator
+
+
+# Expressions; Each one reads the fields of the evaluated row
+EXPRESSIONS = [
+    'id * 2 + offset',
+    "tostring(id) + '-' + name",
+    'keys()',
+    'keys(nested)',
+    'field(nested.value, 0) + id',
+    "match(name, '^row-[0-9]+$') and even(id)",
+    'coalesce(missing, nested.value)',
+    'strptime(date, "%Y-%m-%d")',
+    # Not compiled (comprehension)
+    '[key for key in keys(nested)]',
+]
+
+
+def rows(thread: int, count: int) -> list:
+    """Returns a thread's rows; Each row's fields are distinct.
+    """
+    return [
+        {
+            'id': thread * count + i,
+            'offset': thread,
+            'name': f'row-{thread}-{i}',
+            'date': f'20{i % 30:02d}-01-{i % 28 + 1:02d}',
+            'nested': {f'key{thread}': i, 'value': i * thread},
+            f'field{thread}': i,
+        }
+        for i in range(count)
+    ]
+
+
+def evaluate(evaluators: list, data: list, expected: list) -> int:
+    """Evaluates the rows and returns the number of wrong results.
+    """
+    errors = 0
+    for row, results in zip(data, expected):
+        for evaluator, result in zip(evaluators, results):
+            if evaluator(row) != result:
+                errors += 1
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--switch-interval', type=float, default=1e-6)
+    args = parser.parse_args()
+    sys.setswitchinterval(args.switch_interval)
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'python {sys.version.split()[0]}, GIL {gil and "enabled" or "disabled"}')
+    failed = False
+    for interpreted in (False, True):
+        mode = interpreted and 'interpreted' or 'compiled'
+        evaluators = [
+            Evaluator(expression, interpreted=interpreted)
+            for expression in EXPRESSIONS
+        ]
+        # Expected results, evaluated by a single thread
+        datasets = [rows(thread, args.rows) for thread in range(max(args.threads))]
+        expected = [
+            [[evaluator(row) for evaluator in evaluators] for row in data]
+            for data in datasets
+        ]
+        reference = None
+        for threads in args.threads:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                start = perf_counter()
+                errors = sum(executor.map(
+                    evaluate,
+                    [evaluators, ] * threads,
+                    datasets[:threads],
+                    expected[:threads]
+                ))
+                elapsed = perf_counter() - start
+            throughput = threads * args.rows * len(evaluators) / elapsed
+            reference = reference or throughput
+            failed = failed or errors > 0
+            print((
+                f'{mode:<12}'
+                f'{threads:>3} threads'
+                f'{throughput:>12.0f} evals/s'
+                f'{throughput / reference:>7.2f}x'
+                f'{errors:>8} errors'
+            ))
+    sys.exit(failed and 1 or 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Wide events copies benchmark.
+
+Buffers wide events (many fields, nested JSON values) through a
+pipeline made of a generating command, a streaming command writing a
+top-level and a nested field, and a buffering command storing its
+events using:
+
+* ``deepcopy``: :func:`copy.deepcopy` (previous implementation)
+* ``clone``: :func:`m42pl.event.clone` (full copy, as done for the
+  commands setting ``_shares_events_``)
+* ``fork``: :func:`m42pl.event.fork` (copy-on-write copy, current
+  implementation)
+
+Reports the throughput and the peak memory allocated while running the
+pipeline (measured with :mod:`tracemalloc`).
+
+Usage (from the repository root)::
+
+    PYTHONPATH=. python benchmarks/events.py [--events 5000] [--width 200]
+"""
+
+import asyncio
+import argparse
+import tracemalloc
+from copy import deepcopy
+from time import perf_counter
+
+from m42pl.commands import GeneratingCommand, StreamingCommand, BufferingCommand
+from m42pl.context import Context
+from m42pl.event import Event, derive, clone, fork
+from m42pl.fields import Field
+from m42pl.kvstores import KVStore
+from m42pl.pipeline import Pipeline, PipelineRunner
+
+
+class BenchKVStore(KVStore):
+    _aliases_ = ['bench_events_kvstore']
+
+
+class Wide(GeneratingCommand):
+    """Generates wide events derived from a template event.
+    """
+    _aliases_ = ['bench_events_wide']
+
+    def __init__(self, count: int, width: int):
+        super().__init__(count, width)
+        self.count = count
+        self.template = {}
+        for i in range(width):
+            if i % 10 == 0:
+                self.template[f'json_{i}'] = {
+                    'id': i,
+                    'tags': [f'tag-{j}' for j in range(8)],
+                    'attributes': {f'attr_{j}': j * 0.5 for j in range(8)}
+                }
+            else:
+                self.template[f'field_{i}'] = f'value-{i}'
+
+    async def target(self, event, pipeline, context):
+        for i in range(self.count):
+            yield derive(event, data={**self.template, 'index': i})
+
+
+class Write(StreamingCommand):
+    """Writes a top-level field and a nested field.
+    """
+    _aliases_ = ['bench_events_write']
+
+    def __init__(self):
+        super().__init__()
+        self.top = Field('status')
+        self.nested = Field('json_0.attributes.status')
+
+    async def target(self, event, pipeline, context):
+        await self.top.write(event, 'ok')
+        await self.nested.write(event, 'ok')
+        yield event
+
+
+class Buffer(BufferingCommand):
+    """Buffers the events using the configured copy function.
+    """
+    _aliases_ = ['bench_events_buffer']
+    copy = staticmethod(fork)
+
+    def __init__(self, size: int):
+        super().__init__(size)
+        self.size = size
+
+    async def setup(self, event, pipeline, context):
+        await super().setup(event, pipeline, context, self.size)
+
+    async def store(self, event, pipeline):
+        await self.queue.put(self.copy(event))
+
+
+def run(copy, count: int, width: int, size: int) -> tuple[float, int]:
+    """Runs the benchmark pipeline.
+
+    :param copy: Buffer copy function
+    :param count: Number of events
+    :param width: Number of fields per event
+    :param size: Buffer size
+    :return: Elapsed time (in seconds) and peak memory (in bytes)
+    """
+    buffer = Buffer(size)
+    buffer.copy = copy
+    pipeline = Pipeline(commands=[Wide(count, width), Write(), buffer])
+    context = Context(pipelines={'main': pipeline}, kvstore=BenchKVStore())
+
+    async def consume():
+        async for _ in PipelineRunner(pipeline)(context, Event()):
+            pass
+
+    tracemalloc.start()
+    start = perf_counter()
+    asyncio.run(consume())
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=5000,
+        help='Number of events')
+    parser.add_argument('--width', type=int, default=200,
+        help='Number of fields per event')
+    parser.add_argument('--buffer', type=int, default=1000,
+        help='Buffer size')
+    args = parser.parse_args()
+    copies = {'deepcopy': deepcopy, 'clone': clone, 'fork': fork}
+    results = {}
+    print(f'{"copy":<10} {"events/s":>12} {"peak (MiB)":>12}')
+    for name, copy in copies.items():
+        elapsed, peak = run(copy, args.events, args.width, args.buffer)
+        results[name] = elapsed
+        print(f'{name:<10} {args.events / elapsed:>12.0f} {peak / 2**20:>12.2f}')
+    print(f'fork speedup over deepcopy: {results["deepcopy"] / results["fork"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Events signatures benchmark.
+
+Signs events using:
+
+* ``uuid4``: ``str(uuid.uuid4())`` (previous implementation)
+* ``identity``: :func:`m42pl.event.identity` (process-unique counter,
+  current default signature)
+* ``content``: :func:`m42pl.event.content_hash` (stable hash of the
+  events data, for each events width)
+
+Reports the number of signatures per second.
+
+Usage (from the repository root)::
+
+    PYTHONPATH=. python benchmarks/signatures.py [--events 200000]
+"""
+
+import uuid
+import argparse
+from time import perf_counter
+
+from m42pl.event import Event, identity, content_hash
+
+
+def run(sign, events: list) -> float:
+    """Signs the events.
+
+    :param sign: Signature function, called with the event
+    :param events: Events to sign
+    :return: Elapsed time, in seconds
+    """
+    start = perf_counter()
+    for event in events:
+        event['sign'] = sign(event)
+    return perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=200000,
+        help='Number of events')
+    parser.add_argument('--widths', type=int, nargs='+', default=[5, 50],
+        help='Number of fields per event (content hashes)')
+    args = parser.parse_args()
+    print(f'{"signature":<20} {"signatures/s":>14}')
+    events = [Event(data={'index': i}) for i in range(args.events)]
+    signers = {
+        'uuid4': lambda event: str(uuid.uuid4()),
+        'identity': lambda event: identity()
+    }
+    results = {}
+    for name, sign in signers.items():
+        results[name] = run(sign, events)
+        print(f'{name:<20} {args.events / results[name]:>14.0f}')
+    print(f'identity speedup over uuid4: '
+            f'{results["uuid4"] / results["identity"]:.1f}x')
+    for width in args.widths:
+        events = [
+            Event(data={
+                **{f'field_{j}': f'value-{j}' for j in range(width - 1)},
+                'index': i
+            })
+            for i in range(args.events)
+        ]
+        elapsed = run(content_hash, events)
+        print(f'{f"content ({width} fields)":<20} {args.events / elapsed:>14.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Approximate aggregators benchmark.
+
+Aggregates a synthetic stream split in chunks (as a split pipeline
+would), merges the chunks partial states, and compares the results of
+the sketches aggregators to the exact values:
+
+* ``dc``: :class:`m42pl.utils.sketches.HyperLogLog` distinct count
+  (relative error)
+* ``quantile``: :class:`m42pl.utils.sketches.KLL` quantiles (rank
+  error of the p50, p90 and p99)
+* ``frequency``: :class:`m42pl.utils.sketches.CountMinSketch` (mean
+  over-count of the 100 most frequent values, relative to the total)
+* ``topk``: :class:`m42pl.utils.sketches.SpaceSaving` (recall of the
+  exact top 10)
+
+Reports the update throughput, the partial states size (JSON-encoded)
+and the error of each aggregator.
+
+Usage (from the repository root)::
+
+    PYTHONPATH=. python benchmarks/sketches.py [--events 200000] [--chunks 4]
+"""
+
+import json
+import random
+import argparse
+from bisect import bisect_left
+from collections import Counter
+from time import perf_counter
+
+from m42pl.utils.aggregation import aggregator
+
+
+def stream(count: int, cardinality: int) -> list[dict]:
+    """Returns the benchmark values: uniform identifiers, normal
+    latencies and Zipf-like (Pareto) status codes.
+
+    :param count: Number of values
+    :param cardinality: Number of distinct identifiers
+    """
+    rng = random.Random(42)
+    return [
+        {
+            'user': f'user-{rng.randrange(cardinality)}',
+            'latency': rng.lognormvariate(3, 1),
+            'code': int(rng.paretovariate(1.1))
+        }
+        for _ in range(count)
+    ]
+
+
+def run(function, values: list, chunks: int) -> tuple:
+    """Aggregates the values in chunks and merges the partial states.
+
+    :param function: Aggregator
+    :param values: Values to aggregate
+    :param chunks: Number of chunks
+    :return: Result, elapsed update time (in seconds) and partial
+        states size (in bytes)
+    """
+    size = len(values) // chunks + 1
+    merged, elapsed, transferred = function.init(), 0.0, 0
+    for start in range(0, len(values), size):
+        state = function.init()
+        begin = perf_counter()
+        for value in values[start:start + size]:
+            state = function.update(state, value)
+        elapsed += perf_counter() - begin
+        dumped = json.dumps(function.dump(state))
+        transferred += len(dumped)
+        merged = function.merge(merged, function.load(json.loads(dumped)))
+    return function.finalize(merged), elapsed, transferred
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=200000,
+        help='Number of events')
+    parser.add_argument('--cardinality', type=int, default=50000,
+        help='Number of distinct identifiers')
+    parser.add_argument('--chunks', type=int, default=4,
+        help='Number of chunks')
+    args = parser.parse_args()
+    events = stream(args.events, args.cardinality)
+    print(f'{"aggregator":<12} {"values/s":>12} {"state (KiB)":>12}  error')
+    # Distinct count
+    users = [event['user'] for event in events]
+    result, elapsed, size = run(aggregator('dc'), users, args.chunks)
+    exact = len(set(users))
+    print(f'{"dc":<12} {len(users) / elapsed:>12.0f} {size / 1024:>12.1f}  '
+            f'{abs(result - exact) / exact:.2%} ({result} vs {exact})')
+    # Quantiles
+    latencies = [event['latency'] for event in events]
+    ordered = sorted(latencies)
+    quantiles = [0.5, 0.9, 0.99]
+    result, elapsed, size = run(aggregator('quantile', quantiles), latencies,
+                                args.chunks)
+    errors = [
+        abs(bisect_left(ordered, value) / len(ordered) - q)
+        for q, value in zip(quantiles, result)
+    ]
+    print(f'{"quantile":<12} {len(latencies) / elapsed:>12.0f} '
+            f'{size / 1024:>12.1f}  '
+            f'rank error max {max(errors):.3%} (p50/p90/p99)')
+    # Frequencies
+    codes = [event['code'] for event in events]
+    exact = Counter(codes)
+    items = [code for code, _ in exact.most_common(100)]
+    result, elapsed, size = run(aggregator('frequency', items), codes,
+                                args.chunks)
+    overcount = sum(count - exact[code] for code, count in result) / len(result)
+    print(f'{"frequency":<12} {len(codes) / elapsed:>12.0f} '
+            f'{size / 1024:>12.1f}  '
+            f'mean over-count {overcount / len(codes):.4%} of total')
+    # Top-K
+    result, elapsed, size = run(aggregator('topk', 10), codes, args.chunks)
+    top = {code for code, _ in exact.most_common(10)}
+    recall = len(top & {code for code, _ in result}) / len(top)
+    print(f'{"topk":<12} {len(codes) / elapsed:>12.0f} {size / 1024:>12.1f}  '
+            f'recall {recall:.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Generator timeout overhead benchmark.
+
+Compares the cost of iterating over a fast generator:
+
+* ``plain``: Without timeout
+* ``shielded``: With a timeout, using one shielded task per event
+  (previous :class:`m42pl.pipeline.PipelineRunner` implementation)
+* ``wakeup``: With a timeout, using :class:`WakeupIterator`
+* ``runner``: With a timeout, through a full pipeline run
+
+Usage (from the repository root)::
+
+    PYTHONPATH=. python benchmarks/wakeup.py [--events 100000] [--timeout 1.0]
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from m42pl.commands import GeneratingCommand
+from m42pl.context import Context
+from m42pl.kvstores import KVStore
+from m42pl.event import Event
+from m42pl.pipeline import Pipeline, PipelineRunner
+from m42pl.utils.wakeup import WakeupIterator
+
+
+class Generate(GeneratingCommand):
+    _aliases_ = ['bench_wakeup_generate']
+
+    def __init__(self, count: int):
+        super().__init__(count)
+        self.count = count
+
+    async def target(self, event, pipeline, context):
+        for i in range(self.count):
+            yield Event({'i': i})
+
+
+async def source(count: int):
+    for i in range(count):
+        yield i
+
+
+async def plain(count: int, timeout: float) -> None:
+    async for _ in source(count):
+        pass
+
+
+async def shielded(count: int, timeout: float) -> None:
+    iterator = source(count).__aiter__()
+    while True:
+        task = asyncio.create_task(iterator.__anext__())
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+        except StopAsyncIteration:
+            break
+
+
+async def wakeup(count: int, timeout: float) -> None:
+    iterator = WakeupIterator(source(count).__aiter__(), timeout)
+    async for _ in iterator:
+        pass
+
+
+async def runner(count: int, timeout: float) -> None:
+    pipeline = Pipeline(commands=[Generate(count), ])
+    context = Context(pipelines={'main': pipeline}, kvstore=KVStore())
+    async for _ in PipelineRunner(pipeline)(context, Event(), timeout=timeout):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--timeout', type=float, default=1.0)
+    args = parser.parse_args()
+    for function in (plain, shielded, wakeup, runner):
+        start = perf_counter()
+        asyncio.run(function(args.events, args.timeout))
+        elapsed = perf_counter() - start
+        print((
+            f'{function.__name__:<10}'
+            f'{elapsed:>8.3f}s'
+            f'{elapsed / args.events * 1e6:>8.2f}us/event'
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -392,8 +392,30 @@ class AsyncCommand(Command):
     This base class *does not* provides:
 
     * The commands calling machinery
+
+    Commands which call blocking code (e.g. a synchronous library) may
+    set :attr:`_blocking_` to ``True``: the pipeline runner then runs
+    the command calls in a thread pool, so the event loop remains
+    responsive for the other commands and pipelines. Such commands
+    should not share asynchronous resources (e.g. sockets) between
+    calls, as each call may run in a different thread and event loop.
+    Blocking generating commands are iterated over in a dedicated
+    thread (and event loop), used for their whole iteration.
+
+    Events are copied on write (see :mod:`m42pl.event`): a command
+    must not modify an event's nested values in place once the event
+    is yielded. Commands which do (e.g. a generator reusing the same
+    nested values) must set :attr:`_shares_events_`: the pipeline
+    runner then yields full copies of their events.
+
+    :ivar _blocking_: ``True`` if the command blocks the event loop
+    :ivar _shares_events_: ``True`` if the command modifies the
+        events it yields
     """
 
+    _blocking_ = False
+    _shares_events_ = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -3,7 +3,7 @@ ALIASES = dict()    # type: dict[str, object]
 
 
 from .__base__ import Command
-from .buffering import BufferingCommand, DequeBufferingCommand
+from .buffering import BufferingCommand, DequeBufferingCommand, ColumnarBufferingCommand
 from .generating import GeneratingCommand
 from .merging import MergingCommand
 from .meta import MetaCommand
@@ -7,23 +7,80 @@ if TYPE_CHECKING:
     from m42pl.context import Context
 
 import asyncio
-from copy import deepcopy
-from collections import OrderedDict
+from time import monotonic
+from collections import OrderedDict, deque
 
-from m42pl.event import signature
+from m42pl.event import signature, fork
 from m42pl.errors import CommandError
+from m42pl.utils.cache import sizeof
+from m42pl.utils.spill import SpillQueue
+from m42pl.utils.columnar import ColumnarQueue
 
 from .__base__ import AsyncCommand
 
 
+class DequeQueue:
+    """Lean events queue backed by a :class:`deque`.
+
+    Implements the subset of :class:`asyncio.Queue` used by the
+    buffering commands, without its waiters machinery: the buffering
+    commands never wait for their queue.
+
+    :ivar maxsize: Maximum number of items (``0`` for no limit)
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """
+        :param maxsize: Maximum number of items (``0`` for no limit)
+        """
+        self.maxsize = maxsize
+        self._queue = deque() # type: deque[dict]
+
+    def qsize(self) -> int:
+        return len(self._queue)
+
+    def empty(self) -> bool:
+        return not self._queue
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= len(self._queue)
+
+    def put_nowait(self, item: dict) -> None:
+        self._queue.append(item)
+
+    async def put(self, item: dict) -> None:
+        self._queue.append(item)
+
+    def get_nowait(self) -> dict:
+        if not self._queue:
+            raise asyncio.QueueEmpty()
+        return self._queue.popleft()
+
+    async def get(self) -> dict:
+        return self.get_nowait()
+
+
 class BufferingCommand(AsyncCommand):
     """Receives, stores and delays events processing.
 
     Buffering commands are useful for operations made on events batch
     instead of events stream (e.g. database query, Pandas data sets).
 
-    This default implementation uses a :class:`asyncio.Queue` as its
-    internal buffer.
+    This default implementation uses a :class:`DequeQueue` as its
+    internal buffer. The buffer is flushed (i.e. its events are
+    processed) when it holds :attr:`maxsize` events, when its events
+    approximate size reaches :attr:`maxbytes` or when its oldest event
+    is older than :attr:`maxage` seconds. The size and age limits are
+    checked when an event is received; In infinite pipelines, a runner
+    timeout ensures they are also checked while no events are
+    received.
+
+    If the pipeline sets a spill threshold (see
+    :attr:`m42pl.pipeline.Pipeline.spill`), the default buffer is
+    replaced by a :class:`SpillQueue`, which writes the events to
+    temporary files once they exceed the threshold. Commands sorting
+    their events may use :class:`m42pl.utils.sort.ExternalSort` to
+    sort them with a bounded memory as well.
 
     The method :meth:`__call__` support two additional arguments
     when compared to :class:`AsyncCommand`:
@@ -46,33 +103,83 @@ class BufferingCommand(AsyncCommand):
       * :meth:`target`: Process the buffered events
 
     :ivar queue_class:  Internal queue class
+    :ivar maxsize:      Maximum number of buffered events
+    :ivar maxbytes:     Maximum buffered events approximate size,
+                        in bytes (``0`` for no limit)
+    :ivar maxage:       Maximum buffered events age, in seconds
+                        (``0`` for no limit)
+    :ivar bytes:        Buffered events approximate size, in bytes
+    :ivar oldest:       Oldest buffered event reception time, or
+                        ``None`` if the buffer is empty
     """
 
-    queue_class = asyncio.Queue
+    queue_class = DequeQueue
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.maxsize = 0
+        self.maxbytes = 0
+        self.maxage = 0.0
         self.hits = 0
+        self.bytes = 0
+        self.oldest = None # type: float|None
 
     async def setup(self, event: dict, pipeline: Pipeline, context: Context,
-                        maxsize: int = 1) -> None: # type: ignore[override]
+                        maxsize: int = 1, maxbytes: int = 0,
+                        maxage: float = 0.0) -> None: # type: ignore[override]
         """
         :param maxsize:     Internal buffer maximum size
+        :param maxbytes:    Internal buffer maximum size in bytes
+                            (``0`` for no limit)
+        :param maxage:      Buffered events maximum age in seconds
+                            (``0`` for no limit)
         """
         if maxsize < 0:
             raise Exception((
                 f'invalid buffer size: maxsize="{maxsize}", '
                 f'reason="Size should be >= 1"'
             ))
-        self.queue: asyncio.Queue = self.queue_class(maxsize=maxsize)
+        if maxbytes < 0:
+            raise Exception((
+                f'invalid buffer bytes size: maxbytes="{maxbytes}", '
+                f'reason="Size should be >= 0"'
+            ))
+        if maxage < 0:
+            raise Exception((
+                f'invalid buffer age: maxage="{maxage}", '
+                f'reason="Age should be >= 0"'
+            ))
+        if (
+            self.queue_class is DequeQueue
+            and pipeline is not None
+            and getattr(pipeline, 'spill', None)
+        ):
+            self.queue = SpillQueue(maxsize=maxsize, threshold=pipeline.spill)
+        else:
+            self.queue = self.queue_class(maxsize=maxsize)
         self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.maxage = maxage
 
     async def remain(self) -> int:
         """Returns the amount of remaining events.
         """
         return self.queue.qsize()
 
+    def spilled(self) -> tuple[int, int]:
+        """Returns the number of events and bytes spilled to disk.
+        """
+        if isinstance(getattr(self, 'queue', None), SpillQueue):
+            return self.queue.spilled, self.queue.spilled_bytes
+        return 0, 0
+
+    async def __aexit__(self, *args, **kwargs) -> None:
+        """Exits the command context and deletes the spilled events.
+        """
+        if isinstance(getattr(self, 'queue', None), SpillQueue):
+            self.queue.close()
+        await super().__aexit__(*args, **kwargs)
+
     async def ready(self, event: dict, pipeline: Pipeline, ending: bool,
                         remain: int) -> bool:
         """Returns True if the queue is ready to be empited and yielded.
@@ -81,15 +188,31 @@ class BufferingCommand(AsyncCommand):
         * no event has been received (this indicates a pipeline wakeup)
         * the pipeline is ending
         * the internal buffer is full
+        * the buffered events size or age limit is reached
         """
         if (
             not event                       # No event is received
             or (ending and remain == 0)     # Pipeline is ending
             or await self.full()            # Queue is full
+            or (self.maxbytes and self.bytes >= self.maxbytes)
+            or (
+                self.maxage and self.oldest is not None
+                and monotonic() - self.oldest >= self.maxage
+            )
         ):
             return True
         return False
 
+    def account(self, event: dict) -> None:
+        """Accounts a stored event's size and reception time.
+
+        :param event: Stored event
+        """
+        if self.maxbytes:
+            self.bytes += sizeof(event.get('data'))
+        if self.maxage and self.oldest is None:
+            self.oldest = monotonic()
+
     async def __call__(self, event: dict, pipeline: Pipeline,
                         context: Context, ending: bool = False,
                         remain: int = 0) -> AsyncGenerator[dict, None]:
@@ -106,6 +229,7 @@ class BufferingCommand(AsyncCommand):
             # Always stores the new event if it is not None
             if event:
                 await self.store(event, pipeline)
+                self.account(event)
                 self.hits += 1
             # Process buffered events when:
             # * no event has been received (this indicates a pipeline wakeup)
@@ -118,6 +242,8 @@ class BufferingCommand(AsyncCommand):
                     yield event
                 await self.clear()
                 self.hits = 0
+                self.bytes = 0
+                self.oldest = None
         except Exception as error:
             raise CommandError(command=self, message=str(error))
 
@@ -135,13 +261,23 @@ class BufferingCommand(AsyncCommand):
     async def store(self, event: dict, pipeline: Pipeline) -> None:
         """Stores the received `event`.
 
-        The method takes care of copying the event before storing it to
-        the internal buffer.
+        The method stores a copy-on-write copy of the event (see
+        :func:`m42pl.event.fork`), so the upstream commands modifications
+        do not alter the stored event.
+
+        .. warning::
+
+            Breaking change: the stored events were deep copies; They
+            now share their nested values (e.g. dicts and lists) with
+            the received events. Commands which modify the nested
+            values of the buffered events in place must either copy
+            them first or set :attr:`_shares_events_` (see
+            :class:`AsyncCommand`).
 
         :param event:       Current event
         :param pipeline:    Current pipeline instance
         """
-        await self.queue.put(deepcopy(event))
+        await self.queue.put(fork(event))
     
     async def clear(self) -> None:
         """Clears the buffer.
@@ -171,19 +307,69 @@ class DequeBufferingCommand(BufferingCommand):
     Each event received through :meth:`store` is added to the internal
     :class:`OrderedDict` instance and replace the existing event having
     the same `signature`.
+
+    Commands replacing the events having the same data instead should
+    use a queue keyed on :func:`m42pl.event.content_hash`:
+
+    .. code-block:: python
+
+        class OrderedDictQueue(DequeBufferingCommand.OrderedDictQueue):
+            key = staticmethod(content_hash)
     """
 
     class OrderedDictQueue(asyncio.Queue):
         """Custom AsyncIO queue based on an OrderedDict.
+
+        :ivar key: Events key function
         """
+        key = staticmethod(signature)
+
         def _init(self, maxsize):
             self._queue = OrderedDict()
             self._maxsize = maxsize
         
         def _put(self, event):
-            self._queue[signature(event)] = event
+            self._queue[self.key(event)] = event
 
         def _get(self):
             return self._queue.popitem(last=False)[1]
 
     queue_class = OrderedDictQueue
+
+
+class ColumnarBufferingCommand(BufferingCommand):
+    """Buffers events as typed columns.
+
+    The events fields are stored in a :class:`ColumnarQueue` (NumPy
+    arrays for the numeric fields, dictionary-encoded arrays for the
+    string fields). Analytic commands (e.g. statistics) should
+    implement :meth:`target_columns` and read the buffered fields
+    through column views (see :meth:`ColumnarQueue.column`) instead of
+    iterating over the events; The events are rebuilt only when read
+    (see :meth:`ColumnarQueue.rows`).
+
+    NumPy is an optional dependency, required by this command.
+    """
+
+    queue_class = ColumnarQueue
+
+    async def target(self, pipeline: Pipeline) -> AsyncGenerator[dict, None]:
+        """Processes the buffered events, then drops them.
+
+        :param pipeline:    Current pipeline instance
+        """
+        async for event in self.target_columns(self.queue, pipeline):
+            yield event
+        self.queue.reset()
+
+    async def target_columns(self, queue: ColumnarQueue,
+                                pipeline: Pipeline) -> AsyncGenerator[dict, None]:
+        """Processes the buffered events.
+
+        The default implementation yields the buffered events.
+
+        :param queue:       Buffered events
+        :param pipeline:    Current pipeline instance
+        """
+        for event in queue.rows():
+            yield event
@@ -13,8 +13,38 @@ from .__base__ import AsyncCommand
 
 class StreamingCommand(AsyncCommand):
     """Receives, process and yields events.
+
+    A streaming command may also implement :meth:`target_batch` to
+    process events by batch; the pipeline runner then sends it lists
+    of events when running in batch mode (see
+    :attr:`m42pl.pipeline.Pipeline.batch_size`).
+
+    I/O-bound commands may set :attr:`_concurrency_` to let the runner
+    keeps up to ``_concurrency_`` :meth:`target` calls in flight. In
+    ``sequential`` mode, the runner then batches the generated events
+    by at least ``_concurrency_`` events to fill the window (a pending
+    batch is processed on generator timeout and at the end of the
+    generator). The instances may override these attributes (e.g.
+    from a command argument).
+
+    CPU-bound commands (e.g. parsing, regex extraction) may set
+    :attr:`_cpu_bound_`: when the pipeline runs with a processes pool,
+    contiguous CPU-bound commands are run by batch in worker processes
+    holding their own copy of the commands. Such commands must be
+    stateless and serializable with :meth:`to_dict`.
+
+    :ivar _concurrency_: Maximum number of concurrent :meth:`target`
+        calls
+    :ivar _ordered_: ``True`` to yield the results in the events
+        order, ``False`` to yield them as soon as they are available
+    :ivar _cpu_bound_: ``True`` if the command is CPU-bound and
+        stateless
     """
 
+    _concurrency_ = 1
+    _ordered_ = True
+    _cpu_bound_ = False
+
     async def __call__(self, event: dict, pipeline: Pipeline, context: Context,
                         *args, **kwargs) -> AsyncGenerator[dict, None]:
         """Runs the command.
@@ -41,3 +71,33 @@ class StreamingCommand(AsyncCommand):
         :param context: Current context
         """
         yield event
+
+    async def call_batch(self, events: list[dict], pipeline: Pipeline,
+                            context: Context, *args,
+                            **kwargs) -> AsyncGenerator[dict, None]:
+        """Runs the command on a batch of events.
+
+        :param events: Current events batch
+        :param pipeline: Current pipeline instance
+        :param context: Current context
+        """
+        try:
+            async for _event in self.target_batch(events, pipeline, context):
+                yield _event
+        except Exception as error:
+            raise CommandError(command=self, message=str(error)) from error
+
+    async def target_batch(self, events: list[dict], pipeline: Pipeline,
+                            context: Context) -> AsyncGenerator[dict, None]:
+        """Process and yields a batch of events.
+
+        The runner calls this method only if it is overridden by the
+        command; Otherwise, :meth:`target` is called for each event.
+
+        :param events: Current events batch
+        :param pipeline: Current pipeline instance
+        :param context: Current context
+        """
+        for event in events:
+            async for _event in self.target(event, pipeline, context):
+                yield _event
@@ -21,7 +21,7 @@ class Context:
             ]),
             kvstore=m42pl.kvstore(data['kvstore']['alias'])(
                 *data['kvstore']['args'],
-                data['kvstore']['kwargs']
+                **data['kvstore']['kwargs']
             )
         )
 
@@ -44,6 +44,20 @@ class Dispatcher:
     (:meth:`__init_subclass__`).
 
     :ivar _aliases_:  List of dispatcher names
+    :ivar batch_size: Default events batch size of the dispatched
+        pipelines
+    :ivar mode: Default runner mode of the dispatched pipelines
+    :ivar queue_size: Default stages queues size of the dispatched
+        pipelines
+    :ivar threads: Default threads pool size of the dispatched
+        pipelines
+    :ivar processes: Default processes pool size of the dispatched
+        pipelines
+    :ivar stats: Collect the commands runtime metrics of the
+        dispatched pipelines
+    :ivar spill: Default buffering commands spill threshold (in bytes)
+        of the dispatched pipelines
+    :ivar context: Latest dispatched context
     """
 
     _aliases_: list[str]  = []
@@ -105,7 +119,17 @@ class Dispatcher:
         for cmds in commands:
             pipelines.append(Pipeline(
                 commands=cmds,
-                name=f'{pipeline.name}'
+                name=f'{pipeline.name}',
+                batch_size=pipeline.batch_size,
+                mode=pipeline.mode,
+                queue_size=pipeline.queue_size,
+                threads=pipeline.threads,
+                processes=pipeline.processes,
+                stats=pipeline.stats,
+                spill=pipeline.spill,
+                cache=pipeline.cache,
+                runners=pipeline.runners,
+                metrics=pipeline.metrics
             ))
         return pipelines
 
@@ -121,7 +145,49 @@ class Dispatcher:
             logger.info(f'registering dispatcher alias: dispatcher="{cls.__name__}", alias="{alias}"')
             ALIASES[alias] = cls
 
-    def __init__(self) -> None:
+    def __init__(self, batch_size: int|None = None, mode: str|None = None,
+                    queue_size: int|None = None,
+                    threads: int|None = None,
+                    processes: int|None = None,
+                    runners: int|None = None,
+                    stats: bool|None = None,
+                    spill: int|None = None,
+                    cache: dict|None = None) -> None:
+        """
+        The pipelines settings apply only to the pipelines which do not
+        set their own.
+
+        :param batch_size: Default events batch size of the dispatched
+            pipelines
+        :param mode: Default runner mode of the dispatched pipelines
+            (``sequential`` or ``concurrent``)
+        :param queue_size: Default stages queues size of the
+            dispatched pipelines
+        :param threads: Default threads pool size (for the blocking
+            commands) of the dispatched pipelines
+        :param processes: Default processes pool size (for the
+            CPU-bound commands) of the dispatched pipelines
+        :param runners: Default runners pool size of the dispatched
+            pipelines, when read as sub-pipelines (see
+            :attr:`m42pl.pipeline.Pipeline.runners`)
+        :param stats: Collect the commands runtime metrics of the
+            dispatched pipelines
+        :param spill: Default buffering commands spill threshold (in
+            bytes) of the dispatched pipelines
+        :param cache: Default results cache settings of the dispatched
+            pipelines, when read as sub-pipelines (see
+            :attr:`m42pl.pipeline.Pipeline.cache`)
+        """
+        self.batch_size = batch_size
+        self.mode = mode
+        self.queue_size = queue_size
+        self.threads = threads
+        self.processes = processes
+        self.runners = runners
+        self.stats = stats
+        self.spill = spill
+        self.cache = cache
+        self.context = None # type: Context|None
         self.script = m42pl.command('script')
         # self.logger = logger.getChild(self.__class__.__name__)
         self.logger = LoggerAdapter(
@@ -131,6 +197,18 @@ class Dispatcher:
         # Initialize plan
         self.plan = Plan()
 
+    def configure(self, context: Context) -> None:
+        """Applies the dispatcher settings to the context's pipelines.
+
+        :param context: Pipelines context
+        """
+        for pipeline in context.pipelines.values():
+            for name in ('batch_size', 'mode', 'queue_size', 'threads',
+                            'processes', 'runners', 'stats', 'spill',
+                            'cache'):
+                if getattr(pipeline, name) is None:
+                    setattr(pipeline, name, getattr(self, name))
+
     def target(self, context: Context, event: dict, plan: bool = False):
         """Runs the dispatcher.
 
@@ -160,14 +238,21 @@ class Dispatcher:
         :param plan: Plan pipeline execution only
         """
         self.plan = Plan()
-        return self.target(
-            context = Context(
-                pipelines=self.script(source)(),
-                kvstore=kvstore
-            ),
+        context = Context(
+            pipelines=self.script(source)(),
+            kvstore=kvstore
+        )
+        self.configure(context)
+        self.context = context
+        result = self.target(
+            context=context,
             event=event or dict(),
             plan=plan
         )
+        # Fill the plan with the measured commands metrics, if any
+        if not plan:
+            self.plan.analyze(context)
+        return result
 
     async def status(self, kvstore, identifier: str|int|None) -> list:
         """Return the status of an underlying pipeline.
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import os
 import uuid
-# import xxhash
+import hashlib
+import itertools
+from copy import deepcopy
 
 
 # Events are the fundamental unit of information procuded and shared by M42PL
@@ -10,6 +13,54 @@ import uuid
 # * `data`: stores the event's fields, accessible to users
 # * `meta`: stores the internal-only fields, not accessible to users
 # * `sign`: stores the event hash, read-only for the users
+#
+# Events copies: copying an event is expensive as its fields may hold large
+# nested values. Thus, events are copied on write:
+#
+# * Derived and forked events (see `derive` and `fork`) have their own `data`
+#   and `meta` maps but share their nested values with their source event
+# * The fields writes copy the nested values they modify instead of modifying
+#   them in place
+#
+# Commands may still modify the nested values in place, but not once the event
+# has been yielded; Commands which do must set their `_shares_events_`
+# attribute, so the pipeline runner yields full copies of their events (see
+# `clone`).
+
+
+# Events signatures: by default, events are signed with a process-unique
+# identity made of a prefix (process ID, random token and chunk number) and a
+# counter; Content hashes (see `content_hash`) may be used instead to identify
+# events carrying the same data (e.g. to deduplicate them).
+
+
+# Values types copied as-is (immutable)
+ATOMIC = frozenset((str, int, float, bool, bytes, type(None)))
+
+# Identities prefix and counter (see `identity`)
+_prefix = ''
+_counter = itertools.count()
+
+
+def reset_identities(chunk: int|None = None) -> None:
+    """Resets the events identities prefix and counter.
+
+    Called once per process (and in forked processes); The pipelines
+    set the chunk number when chunked (see
+    :meth:`m42pl.pipeline.Pipeline.set_chunk`).
+
+    :param chunk: Current chunk number, or ``None``
+    """
+    global _prefix, _counter
+    _prefix = f'{os.getpid():x}.{uuid.uuid4().hex[:8]}.'
+    if chunk is not None:
+        _prefix = f'{_prefix}{chunk}.'
+    _counter = itertools.count()
+
+
+reset_identities()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_identities)
 
 
 def Event(data: dict = {}, meta: dict = {}, sign = None):
@@ -26,15 +77,105 @@ def Event(data: dict = {}, meta: dict = {}, sign = None):
     }
 
 
+def identity() -> str:
+    """Returns a new process-unique identity.
+    """
+    return f'{_prefix}{next(_counter):x}'
+
+
+def canonical(value, parts: list) -> None:
+    """Appends a value's canonical encoding to a list of strings.
+
+    Each value is tagged with its type, and the strings and containers
+    are prefixed with their length, so distinct values (e.g. ``1`` and
+    ``'1'``, or a tuple and a list) have distinct encodings. The dicts
+    items are sorted on their keys type name and representation, and
+    the sets items on their encoding, so the encoding does not depend
+    on the insertion or hashing order. Other values are encoded with
+    their type name and representation.
+
+    :param value: Value to encode
+    :param parts: Encoded parts
+    """
+    kind = type(value)
+    if value is None:
+        parts.append('N')
+    elif kind is bool:
+        parts.append(value and 'T' or 'F')
+    elif kind is str:
+        parts.append(f's{len(value)}:{value}')
+    elif kind is int:
+        parts.append(f'i{value};')
+    elif kind is float:
+        parts.append(f'f{value!r};')
+    elif isinstance(value, dict):
+        parts.append(f'd{len(value)}{{')
+        # String keys (the common case) are sorted as is
+        if all(type(key) is str for key in value):
+            for key in sorted(value):
+                parts.append(f's{len(key)}:{key}')
+                canonical(value[key], parts)
+        else:
+            for key, item in sorted(value.items(),
+                                    key=lambda item: (type(item[0]).__name__,
+                                                        repr(item[0]))):
+                canonical(key, parts)
+                canonical(item, parts)
+        parts.append('}')
+    elif isinstance(value, (list, tuple)):
+        parts.append(f'{isinstance(value, list) and "l" or "t"}{len(value)}[')
+        for item in value:
+            canonical(item, parts)
+        parts.append(']')
+    elif isinstance(value, (set, frozenset)):
+        items = []
+        for item in value:
+            encoded = [] # type: list[str]
+            canonical(item, encoded)
+            items.append(''.join(encoded))
+        parts.append(f'S{len(value)}[{"".join(sorted(items))}]')
+    elif isinstance(value, (bytes, bytearray)):
+        parts.append(f'b{len(value)}:{value.hex()}')
+    else:
+        text = repr(value)
+        parts.append(f'o{kind.__qualname__}:{len(text)}:{text}')
+
+
+def content_digest(value) -> bytes:
+    """Returns a stable hash of a value.
+
+    The value is hashed through its canonical encoding (see
+    :func:`canonical`). The hash does not depend on the process, so it
+    may be shared between processes (e.g. as a cache key).
+
+    :param value: Value to hash
+    """
+    parts = [] # type: list[str]
+    canonical(value, parts)
+    return hashlib.blake2b(
+        ''.join(parts).encode('utf-8', 'surrogatepass'),
+        digest_size=16
+    ).digest()
+
+
+def content_hash(event: dict) -> str:
+    """Returns a stable hash of an event's data.
+
+    Events carrying the same data have the same hash.
+
+    :param event: Source event
+    """
+    return content_digest(event.get('data')).hex()
+
+
 def signature(event: dict):
     """Returns an event's signature.
 
-    If the event is not signed, sign it first then return the new
-    signature.
+    If the event is not signed, sign it first (see :func:`identity`)
+    then return the new signature.
     """
     if event.get('sign', None) is None:
-        event['sign'] = str(uuid.uuid4())
-        # event['sign'] = xxhash.xxh32_hexdigest(str(id(event)))
+        event['sign'] = identity()
     return event['sign']
 
 
@@ -46,3 +187,43 @@ def derive(event: dict, data: dict = {}, meta: dict = {}, sign = None):
         'meta': {**event['meta'], **meta},
         'sign': sign
     }
+
+
+def fork(event: dict):
+    """Copies an event, sharing its nested values (copy-on-write).
+
+    Unlike :func:`derive`, the event signature is kept.
+    """
+    return {
+        'data': {**event['data']},
+        'meta': {**event['meta']},
+        'sign': event.get('sign')
+    }
+
+
+def clone_value(value):
+    """Copies a value.
+
+    JSON-like values (dicts, lists and atomic values) are copied
+    without the :func:`copy.deepcopy` overhead.
+
+    :param value: Value to copy
+    """
+    kind = type(value)
+    if kind in ATOMIC:
+        return value
+    elif kind is dict:
+        return {key: clone_value(item) for key, item in value.items()}
+    elif kind is list:
+        return [clone_value(item) for item in value]
+    return deepcopy(value)
+
+
+def clone(event: dict):
+    """Copies an event, including its nested values.
+    """
+    return {
+        'data': clone_value(event['data']),
+        'meta': clone_value(event['meta']),
+        'sign': event.get('sign')
+    }
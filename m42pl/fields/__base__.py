@@ -38,9 +38,17 @@ class BaseField:
     This is needed when manipulating some complex fields:
 
     * Sub-pipelines (see :class:`PipeField`)
-    * Evaluated fields (see :class:`EvalField`)
     * Remote fields (TODO: Redis ? HTTP ? etc.)
 
+    Field solvers which do not need to await anything should implement
+    `_read_sync` (a plain method) instead of `_read`: such fields are
+    compiled into a synchronous reader (see :meth:`compile`), which
+    spares the coroutines machinery to the fields readers (see
+    :class:`FieldsMap`). The fields settings should not be modified
+    once the field has been read. A child class overriding `_read`
+    (but neither `_read_sync` nor `compile`) is read through its
+    `_read`.
+
     :ivar name:     Field name.
                     If the field is a literal, this is also the field
                     value.
@@ -75,6 +83,94 @@ class BaseField:
         self.type = type
         self.seqn = seqn
         self.literal = True
+        self._normalizer = self._reader = None
+
+    # Synchronous version of `_read`; Should be implemented by the
+    # child class if the field does not need to await anything.
+    _read_sync = None
+
+    def normalizer(self):
+        """Returns the field's value normalization function (type
+        check and list wrapping), or `None` if the value is returned
+        as-is.
+        """
+        name, type, seqn = self.name, self.type, self.seqn
+
+        def enlist(value):
+            """Wraps the field's value into a list.
+            """
+            if not isinstance(value, (list, tuple, set)):
+                return [value, ]
+            return value
+
+        def check(items):
+            """Checks the field's value type.
+            """
+            for item in isinstance(items, (list, tuple, set)) and items or [items, ]:
+                if not isinstance(item, type):
+                    raise Exception(f'Invalid type for field {name}: expected {type}, got {item.__class__}')
+            return items
+
+        if type and seqn:
+            return lambda value: enlist(check(value))
+        elif type:
+            return check
+        elif seqn:
+            return enlist
+        return None
+
+    def normalize(self, value):
+        """Normalizes a field's value.
+
+        :param value:       Raw field value
+        """
+        if self._normalizer is None:
+            self._normalizer = self.normalizer() or (lambda value: value)
+        return self._normalizer(value)
+
+    def compile(self):
+        """Compiles the field into a synchronous reader.
+
+        The reader is a plain function with the same signature as
+        :meth:`read`, returning the normalized field's value.
+
+        :return:            The field reader, or `None` if the field
+                            must be read asynchronously
+        """
+        if self.name is None:
+            if self.seqn:
+                return lambda event, pipeline=None, context=None: []
+            return lambda event, pipeline=None, context=None: None
+        if self._read_sync is None:
+            return None
+        read, normalize = self._read_sync, self.normalizer()
+        if normalize is None:
+            return read
+        return lambda event, pipeline=None, context=None: normalize(
+            read(event, pipeline, context))
+
+    @classmethod
+    def synchronous(cls) -> bool:
+        """Returns `True` if the field's compiled reader implements its
+        effective `_read`, i.e. if `_read` is not overridden by a
+        class more derived than the one defining `_read_sync` or
+        `compile` (e.g. :class:`SeqnField`, which compiles its
+        sub-fields readers).
+        """
+        mro = cls.__mro__
+        owner = lambda name: next(i for i, c in enumerate(mro) if name in c.__dict__)
+        return min(owner('_read_sync'), owner('compile')) <= owner('_read')
+
+    @property
+    def reader(self):
+        """Returns the field's compiled reader (see :meth:`compile`).
+
+        Fields whose `_read` is overridden by a child class are not
+        compiled (see :meth:`synchronous`).
+        """
+        if self._reader is None:
+            self._reader = self.synchronous() and self.compile() or False
+        return self._reader or None
 
     async def _read(self, event: dict, pipeline: Pipeline|None = None, context: Context|None = None):
         """Gets the configured field.
@@ -86,6 +182,8 @@ class BaseField:
         :param context:     Current context
         :return:            Read field value
         """
+        if self._read_sync is not None:
+            return self._read_sync(event, pipeline, context)
         raise NotImplementedError()
 
     async def read(self, event: dict, pipeline: Pipeline|None = None, context: Context|None = None):
@@ -96,27 +194,26 @@ class BaseField:
         :param context:     Current context
         :return:            Read field value
         """
+        reader = self.reader
+        if reader is not None:
+            return reader(event, pipeline, context)
+        return self.normalize(await self._read(event, pipeline, context))
 
-        def enlist(value):
-            """Wraps the field's value into a list.
-            """
-            if not isinstance(value, (list, tuple, set)) and self.seqn:
-                return [value, ]
-            return value
+    async def read_batch(self, events: list[dict], pipeline: Pipeline|None = None, context: Context|None = None) -> list:
+        """Normalizes and returns the configured field's value for each
+        event of a batch.
 
-        def check(items):
-            """Checks the field's value type.
-            """
-            for item in isinstance(items, (list, tuple, set)) and items or [items, ]:
-                if self.type and not isinstance(item, self.type):
-                    raise Exception(f'Invalid type for field {self.name}: expected {self.type}, got {type(item)}')
-            return items
+        This default implementation reads the events one by one.
 
-        if self.name is not None:
-            return enlist(check(await self._read(event, pipeline, context)))
-        elif self.seqn:
-            return []
-        return None
+        :param events:      dicts from which the field must be read
+        :param pipeline:    Current pipeline
+        :param context:     Current context
+        :return:            Read fields values, in order
+        """
+        reader = self.reader
+        if reader is not None:
+            return [reader(event, pipeline, context) for event in events]
+        return [await self.read(event, pipeline, context) for event in events]
 
     async def _write(self, event: dict, value: FieldValue) -> dict:
         """Sets the configured field.
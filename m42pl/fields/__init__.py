@@ -61,27 +61,82 @@ def Field(name, *args, **kwargs):
 
 class FieldsMap:
     """Access multiples fields within a single container.
+
+    The fields which can be read synchronously (see
+    :meth:`BaseField.compile`) are read in place; The remaining fields
+    are awaited, concurrently if more than one.
     """
 
     def __init__(self, **fields):
         self.fields = OrderedDict(fields)
+        self.compiled = None
 
     def update(self, **fields):
         self.fields.update(fields)
+        self.compiled = None
+
+    def compile(self):
+        """Splits the fields into synchronous readers and asynchronous
+        fields.
+
+        :return:    A tuple `(readers, fields)` of `(name, reader)`
+                    and `(name, field)` pairs
+        """
+        readers, fields = [], []
+        for name, field in self.fields.items():
+            reader = getattr(field, 'reader', None)
+            if reader is not None:
+                readers.append((name, reader))
+            else:
+                fields.append((name, field))
+        return tuple(readers), tuple(fields)
 
     async def read(self, event, pipeline, context) -> SimpleNamespace:
-        # Using `type({})` (resolve to `dict`) instead of `dict`
-        # because `dict` is overloaded bu the `dict.py` module.
-        # No comment; TODO: Make this cleaner.
-        return SimpleNamespace(**type({})([ #type: ignore
-            (name, field)
+        if self.compiled is None:
+            self.compiled = self.compile()
+        readers, fields = self.compiled
+        results = SimpleNamespace()
+        values = results.__dict__
+        for name, reader in readers:
+            values[name] = reader(event, pipeline, context)
+        if len(fields) == 1:
+            name, field = fields[0]
+            values[name] = await field.read(event, pipeline, context)
+        elif fields:
+            for (name, _), value in zip(fields, await asyncio.gather(*[
+                field.read(event, pipeline, context)
+                for _, field
+                in fields
+            ])):
+                values[name] = value
+        # Keep the fields order
+        if fields and readers:
+            ordered = [(name, values[name]) for name in self.fields]
+            values.clear()
+            values.update(ordered)
+        return results
+
+    async def read_batch(self, events, pipeline, context) -> list[SimpleNamespace]:
+        """Reads the fields for each event of a batch.
+
+        Each field reads the whole batch at once (e.g. the evaluated
+        fields are evaluated using NumPy when possible, see
+        :meth:`EvalField.read_batch`).
+
+        :param events:      Events batch
+        :param pipeline:    Current pipeline
+        :param context:     Current context
+        :return:            One fields namespace per event, in order
+        """
+        columns = [
+            (name, await field.read_batch(events, pipeline, context))
             for name, field
-            in zip(
-                self.fields.keys(),
-                await asyncio.gather(*[
-                    field.read(event, pipeline, context)
-                    for _, field
-                    in self.fields.items()
-                ])
-            )
-        ]))
+            in self.fields.items()
+        ]
+        results = []
+        for index in range(len(events)):
+            result = SimpleNamespace()
+            for name, values in columns:
+                setattr(result, name, values[index])
+            results.append(result)
+        return results
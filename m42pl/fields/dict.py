@@ -28,7 +28,7 @@ class DictField(BaseField):
             in filter(None, self.name.split('.'))
         ]
     
-    async def _read(self, event: dict, *args, **kwargs):
+    def _read_sync(self, event: dict, *args, **kwargs):
         if event:
             if len(self.path) == 1:
                 return event.get('data', {}).get(self.path[0], self.default)
@@ -45,14 +45,38 @@ class DictField(BaseField):
         else:
             return self.default
 
+    def compile(self):
+        """Compiles the field into a synchronous reader.
+
+        Single-key paths are read without walking the path.
+        """
+        if (
+            len(self.path) != 1
+            or self.normalizer() is not None
+            or type(self)._read_sync is not DictField._read_sync
+        ):
+            return super().compile()
+        key, default = self.path[0], self.default
+
+        def reader(event, pipeline=None, context=None):
+            if event:
+                return event.get('data', {}).get(key, default)
+            return default
+
+        return reader
+
     async def _write(self, event: dict, value: FieldValue) -> Any:
         if len(self.path) == 1:
             event.get('data', {})[self.path[0]] = value
         else:
+            # Copy the nested dicts along the path instead of modifying
+            # them in place, as they may be shared with other events
             _dc = event.get('data', {})
             for _name in self.path[0:-1]:
                 if _name not in _dc or not isinstance(_dc[_name], dict):
                     _dc[_name] = {}
+                else:
+                    _dc[_name] = dict(_dc[_name])
                 _dc = _dc[_name]
             _dc[self.path[-1]] = value
         return event
@@ -61,11 +85,19 @@ class DictField(BaseField):
         if len(self.path) == 1:
             event.get('data', {}).pop(self.path[0], None)
         else:
+            # Find the deleted field first, then copy the nested dicts
+            # along the path (see :meth:`_write`)
             _dc = event.get('data', {})
             for _name in self.path[0:-1]:
-                if _name in _dc:
+                if isinstance(_dc, dict) and _name in _dc:
                     _dc = _dc[_name]
                 else:
                     return event
+            if not isinstance(_dc, dict) or self.path[-1] not in _dc:
+                return event
+            _dc = event.get('data', {})
+            for _name in self.path[0:-1]:
+                _dc[_name] = dict(_dc[_name])
+                _dc = _dc[_name]
             _dc.pop(self.path[-1], None)
         return event
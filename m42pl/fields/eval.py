@@ -20,8 +20,23 @@ class EvalField(BaseField):
         expr = self.name.replace('\n', ' ').strip(' ')
         self.expr = Evaluator(expr)
 
-    async def _read(self, event: dict, *args, **kwargs):
+    def _read_sync(self, event: dict, *args, **kwargs):
         try:
             return self.expr(event and event.get('data', {}) or {})
         except Exception:
             return self.default
+
+    async def read_batch(self, events: list[dict], *args, **kwargs) -> list:
+        """Evaluates the expression on a batch of events at once (see
+        :meth:`Evaluator.batch`).
+        """
+        if self.name is None:
+            return await super().read_batch(events, *args, **kwargs)
+        values = self.expr.batch(
+            [event and event.get('data', {}) or {} for event in events],
+            self.default
+        )
+        normalize = self.normalizer()
+        if normalize is not None:
+            return [normalize(value) for value in values]
+        return values
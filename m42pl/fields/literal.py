@@ -19,7 +19,7 @@ class LiteralField(BaseField):
         super().__init__(*args, **kwargs)
         self.literal = True
 
-    async def _read(self, *args, **kwargs):
+    def _read_sync(self, *args, **kwargs):
         """Returns (get) the configured field :attr:`self.name` from
         the given :param:`event`.
 
@@ -29,6 +29,19 @@ class LiteralField(BaseField):
         """
         return self.name
 
+    def compile(self):
+        """Compiles the field into a constant reader.
+
+        The value is normalized once; A value wrapped into a list is
+        still returned as a new list on each read.
+        """
+        if self.name is None or type(self)._read_sync is not LiteralField._read_sync:
+            return super().compile()
+        name, value = self.name, self.normalize(self.name)
+        if value is not name:
+            return lambda event, pipeline=None, context=None: [name, ]
+        return lambda event, pipeline=None, context=None: value
+
     async def _write(self, event: dict, value: FieldValue):
         """Writes (set) the given :param:`value` in the given :param:`data`.
 
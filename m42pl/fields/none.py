@@ -8,7 +8,7 @@ class NoneField(BaseField):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    async def _read(self, *args, **kwargs):
+    def _read_sync(self, *args, **kwargs):
         return None
 
     async def _write(self, *args, **kwargs):
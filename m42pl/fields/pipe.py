@@ -1,8 +1,10 @@
 from __future__ import annotations
 from traceback import print_tb
 
-from m42pl.pipeline import Pipeline, InfiniteRunner
+from m42pl.pipeline import Pipeline, RunnersPool
 from m42pl.context import Context
+from m42pl.utils import tracing
+from m42pl.utils.cache import ResultsCache
 
 from .__base__ import BaseField, FieldValue
 
@@ -22,39 +24,82 @@ class PipeField(BaseField):
       event with more than one field, all events are returned as a list.
     * Otherwise, the default value is returned.
 
+    The sub-pipeline is run by a pool of runners shared by all the
+    fields referencing it (see :class:`RunnersPool`), so concurrent
+    reads are safe.
+
+    The results may be cached per input fields values (see
+    :attr:`Pipeline.cache`).
+
     :ivar name: Pipeline reference in current context
                 (minus the leading '@').
     """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.literal = False
-        self.results = []
-        self.runner = None
+
+    def cache(self, context: Context) -> ResultsCache|None:
+        """Returns the sub-pipeline's results cache, if enabled (see
+        :attr:`Pipeline.cache`).
+
+        The cache is shared by all the fields reading the sub-pipeline.
+
+        :param context: Current context
+        """
+        subpipeline = context.pipelines[self.name]
+        if subpipeline.cache is not None and subpipeline.results_cache is None:
+            subpipeline.results_cache = ResultsCache(**subpipeline.cache)
+        return subpipeline.results_cache
 
     async def _read(self, event: dict, pipeline: Pipeline|None = None, context: Context|None = None):
-        # Initialize pipeline runner
-        if self.runner is None:
-            self.runner = InfiniteRunner(
-                context.pipelines[self.name],
-                context,
-                event
-            )
-            await self.runner.setup()
+        cache = self.cache(context)
+        if cache is None:
+            return self.format(await self.run(event, pipeline, context))
+        # The cache is shared by the fields reading the sub-pipeline: it
+        # stores the raw results, formatted per field after the lookup
+        key = cache.key(event)
+        hit, results = cache.get(key)
+        if not hit:
+            results = await self.run(event, pipeline, context)
+            cache.put(key, results)
+        return self.format(results)
+
+    async def run(self, event: dict, pipeline: Pipeline|None = None, context: Context|None = None) -> list[dict]:
+        """Runs the sub-pipeline and returns its results data.
+
+        :param event:       Sub-pipeline source event
+        :param pipeline:    Current pipeline
+        :param context:     Current context
+        """
         # Run pipeline and collect results
-        results = []
-        async for _event in self.runner(event):
-            results.append(_event)
-        # Format and return the result
+        tracer = tracing.tracer
+        start = tracer is not None and tracer.enabled() and tracer.now()
+        results = await RunnersPool.get(
+            context.pipelines[self.name],
+            context
+        ).run(event)
+        if start:
+            tracer.complete(f'@{self.name}', 'pipeline', start, args={
+                'pipeline': self.name,
+                'events': len(results)
+            })
+        return [result.get('data', {}) for result in results]
+
+    def format(self, results: list[dict]):
+        """Formats the sub-pipeline results.
+
+        :param results: Sub-pipeline results data (see :meth:`run`)
+        """
         # At least one event:
         if len(results):
             # Single event:
             if len(results) == 1:
                 # Single event && single field:
-                if len(results[0].get('data', {})) == 1:
-                    return list(results[0].get('data', {}).items())[0][1]
+                if len(results[0]) == 1:
+                    return list(results[0].items())[0][1]
                 # Single event && multiple fields
-                return results[0].get('data', {})
+                return results[0]
             # Multiple events
-            return [result.get('data', {}) for result in results]
+            return results
         # No event at all:
         return self.default
@@ -21,3 +21,24 @@ class SeqnField(BaseField):
         if len(values):
             return values
         return self.default
+
+    def compile(self):
+        """Compiles the field into a synchronous reader if all the
+        sequence's fields can be read synchronously.
+        """
+        if self.name is None:
+            return super().compile()
+        readers = [field.reader for field in self.name]
+        if None in readers:
+            return None
+        default, normalize = self.default, self.normalizer()
+
+        def reader(event, pipeline=None, context=None):
+            values = [read(event, pipeline, context) for read in readers]
+            if not len(values):
+                values = default
+            if normalize is not None:
+                return normalize(values)
+            return values
+
+        return reader
@@ -24,6 +24,7 @@ import m42pl
 from m42pl.event import Event
 from m42pl.utils.errors import CLIErrorRender
 from m42pl.utils.text import str_to_bool
+from m42pl.utils.plan import Plan
 
 from .__base__ import RunAction
 
@@ -214,11 +215,24 @@ class Builtins:
         if self.repl.prompt.multiline:
             print('Type <Esc> <Enter> to execute')
     
-    def builtin_plan(self, state: str = ''):
-        """Run pipelines in plan mode.
+    def builtin_plan(self, state: str = '', mode: str = 'text'):
+        """Run pipelines in plan mode, or analyze them after execution.
+
+        * ``plan [yes|no]``: Switch plan mode on/off
+        * ``plan analyze [text|json|plantuml|off]``: Collect the
+          commands metrics and dump the analyzed plan after execution
         """
-        self.repl.plan_only = str_to_bool(state, default=not self.repl.plan_only)
-        print(f'Plan mode is {self.repl.plan_only and "enabled" or "disabled"}')
+        if state == 'analyze':
+            if mode in ['no', 'false', 'off']:
+                self.repl.plan_analyze = None
+            elif mode in Plan.modes:
+                self.repl.plan_analyze = mode
+            else:
+                print(f'Usage: plan analyze {{{"|".join(Plan.modes)}|off}}')
+            print(f'Plan analyze is {self.repl.plan_analyze and "enabled" or "disabled"}')
+        else:
+            self.repl.plan_only = str_to_bool(state, default=not self.repl.plan_only)
+            print(f'Plan mode is {self.repl.plan_only and "enabled" or "disabled"}')
 
     def builtin_planout(self, state: str = ''):
         """Dump pipeline plan after execution.
@@ -275,6 +289,7 @@ class REPL2(RunAction):
         # Plan mode
         self.plan_only = False
         self.plan_output = False
+        self.plan_analyze = None
 
     def stop(self, sig = None, frame = None):
         sys.exit(-1)
@@ -314,6 +329,10 @@ class REPL2(RunAction):
                             source = f'| {source}'
                         if not self.dispatcher:
                             self.dispatcher = m42pl.dispatcher(args.dispatcher)(**args.dispatcher_kwargs)
+                        # Collect commands metrics in plan analyze mode
+                        # only, unless requested by the dispatcher settings
+                        self.dispatcher.stats = self.plan_analyze and True \
+                            or args.dispatcher_kwargs.get('stats')
                         self.dispatcher(
                             source=source,
                             kvstore=kvstore,
@@ -323,6 +342,8 @@ class REPL2(RunAction):
                         # Render plan
                         if self.plan_only or self.plan_output:
                             print(self.dispatcher.plan.render())
+                        if self.plan_analyze and not self.plan_only:
+                            print(self.dispatcher.plan.render(self.plan_analyze))
             except EOFError:
                 self.stop()
             except BlockingIOError:
@@ -1,6 +1,11 @@
+import tabulate
+
 import m42pl
 from m42pl.event import Event
 from m42pl.utils.errors import CLIErrorRender
+from m42pl.utils.plan import Plan
+from m42pl.utils.profiler import Profiler
+from m42pl.utils.tracing import Tracer
 
 from .__base__ import RunAction
 
@@ -15,14 +20,84 @@ class Run(RunAction):
         super().__init__('run', *args, **kwargs)
         # Required - Source file
         self.parser.add_argument('source', type=str, help='Source script')
+        # Optional - Commands runtime metrics
+        self.parser.add_argument('--stats', action='store_true',
+            default=False, help='Print the commands runtime metrics')
+        # Optional - Analyzed plan
+        self.parser.add_argument('--plan', type=str, choices=Plan.modes,
+            default=None, help='Print the analyzed execution plan')
+        # Optional - Sampling profiler
+        self.parser.add_argument('--profile', type=str, default=None,
+            help='Profile the commands and write the samples as collapsed stacks to this file')
+        self.parser.add_argument('--profile-interval', type=float,
+            default=0.005, help='Profiler sampling interval in seconds')
+        # Optional - Tracing
+        self.parser.add_argument('--trace', type=str, default=None,
+            help='Trace the commands and write the spans as a Chrome trace to this file')
+        self.parser.add_argument('--trace-sample', type=float, default=1.0,
+            help='Ratio of traced events (0.0 to 1.0)')
+
+    def output_stats(self, dispatcher):
+        """Prints the commands runtime metrics of the dispatched
+        pipelines.
+
+        :param dispatcher: Dispatcher instance
+        """
+        if dispatcher.context is None:
+            return
+        headers = ['pipeline', 'command', 'line', 'calls', 'in', 'out',
+                    'target (s)', 'blocked (s)', 'errors', 'remain',
+                    'remain peak', 'spilled', 'spilled (bytes)']
+        data = []
+        for name, pipeline in dispatcher.context.pipelines.items():
+            for metrics in sorted(pipeline.metrics.commands.values(),
+                                    key=lambda metrics: metrics.offset):
+                data.append([
+                    name,
+                    metrics.name,
+                    metrics.line,
+                    metrics.calls,
+                    metrics.events_in,
+                    metrics.events_out,
+                    metrics.target_time,
+                    metrics.blocked_time,
+                    metrics.errors,
+                    metrics.remain,
+                    metrics.remain_peak,
+                    metrics.spilled,
+                    metrics.spilled_bytes
+                ])
+        print(tabulate.tabulate(data, headers, floatfmt='.6f'))
+        # Sub-pipelines results caches
+        caches = [
+            [name, *pipeline.results_cache.to_dict().values()]
+            for name, pipeline in dispatcher.context.pipelines.items()
+            if pipeline.results_cache is not None
+        ]
+        if caches:
+            print()
+            print(tabulate.tabulate(caches, ['pipeline', 'entries', 'used',
+                'hits', 'misses', 'evictions', 'expirations']))
 
     def __call__(self, args):
         super().__call__(args)
         with open(args.source, 'r') as fd:
             source = fd.read()
+            dispatcher = None
+            profiler = args.profile and Profiler(args.profile_interval) or None
+            tracer = args.trace and Tracer(args.trace, args.trace_sample) or None
             try:
                 # Select, instanciate and run dispatcher
-                m42pl.dispatcher(args.dispatcher)(**args.dispatcher_kwargs)(
+                dispatcher = m42pl.dispatcher(args.dispatcher)(**args.dispatcher_kwargs)
+                # Set after instanciation, as the dispatchers may not
+                # accept a `stats` argument
+                if args.stats or args.plan:
+                    dispatcher.stats = True
+                if profiler:
+                    profiler.start()
+                if tracer:
+                    tracer.start()
+                dispatcher(
                     source=source,
                     kvstore=m42pl.kvstore(args.kvstore)(**args.kvstore_kwargs),
                     event=Event(args.event)
@@ -31,3 +106,13 @@ class Run(RunAction):
                 print(CLIErrorRender(error, source).render())
                 if args.raise_errors:
                     raise
+            finally:
+                if tracer:
+                    tracer.stop()
+                if profiler:
+                    profiler.stop()
+                    profiler.dump(args.profile)
+                if args.stats and dispatcher is not None:
+                    self.output_stats(dispatcher)
+                if args.plan and dispatcher is not None:
+                    print(dispatcher.plan.render(args.plan))
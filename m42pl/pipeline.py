@@ -9,11 +9,20 @@ import logging
 from contextlib import AsyncExitStack
 import asyncio
 import signal
+from time import perf_counter
+from functools import partial
+from collections import deque
+from enum import IntEnum, auto
 
 import m42pl
 from m42pl import errors
-from m42pl.event import Event
+from m42pl.event import Event, clone, reset_identities
 from m42pl.utils.log import LoggerAdapter
+from m42pl.utils.pools import ThreadPool, ProcessPool
+from m42pl.utils.wakeup import WakeupIterator
+from m42pl.utils.metrics import CommandMetrics, MetricsRegistry
+import m42pl.utils.tracing
+from m42pl.commands.__base__ import AsyncCommand
 from m42pl.commands import (
     MetaCommand,
     GeneratingCommand,
@@ -38,6 +47,33 @@ class Pipeline:
     :ivar metas: Leading meta commands
     :ivar generator: Generating command
     :ivar processors: Processing commands
+    :ivar batch_size: Events batch size, or ``None`` to let the runner
+        (or the dispatcher) decide
+    :ivar mode: Runner mode (see :attr:`PipelineRunner.modes`), or
+        ``None`` to let the runner (or the dispatcher) decide
+    :ivar queue_size: Stages queues size in ``concurrent`` mode, or
+        ``None`` to let the runner (or the dispatcher) decide
+    :ivar threads: Threads pool size for blocking commands, or ``None``
+        to let the runner (or the dispatcher) decide
+    :ivar processes: Processes pool size for CPU-bound commands, or
+        ``None`` to let the runner (or the dispatcher) decide
+    :ivar stats: ``True`` to collect the commands runtime metrics, or
+        ``None`` to let the runner (or the dispatcher) decide
+    :ivar spill: Memory threshold, in bytes, above which the buffering
+        commands spill their events to temporary files (see
+        :class:`m42pl.utils.spill.SpillQueue`), or ``None`` to let the
+        dispatcher decide (no spill by default)
+    :ivar cache: Results cache settings when the pipeline is used as a
+        sub-pipeline (see :class:`m42pl.utils.cache.ResultsCache`), or
+        ``None`` to run the sub-pipeline for each event
+    :ivar metrics: Commands runtime metrics
+    :ivar runners: Runners pool size when the pipeline is used as a
+        sub-pipeline (see :class:`RunnersPool`), or ``None`` for
+        default
+    :ivar results_cache: Results cache, created by the first
+        sub-pipeline field reading the pipeline
+    :ivar runners_pool: Runners pool, created when the pipeline is
+        first used as a sub-pipeline
     """
 
     @classmethod
@@ -76,7 +112,20 @@ class Pipeline:
         # Remove original commands list from dict
         data.pop('commands')
         # Builds and returns a new pipeline
-        return cls(commands=commands, subrefs=data['subrefs'])
+        return cls(
+            commands=commands,
+            name=data.get('name', 'main'),
+            subrefs=data['subrefs'],
+            batch_size=data.get('batch_size'),
+            mode=data.get('mode'),
+            queue_size=data.get('queue_size'),
+            threads=data.get('threads'),
+            processes=data.get('processes'),
+            stats=data.get('stats'),
+            spill=data.get('spill'),
+            cache=data.get('cache'),
+            runners=data.get('runners')
+        )
 
     @staticmethod
     def flatten_commands(commands) -> Generator:
@@ -94,15 +143,46 @@ class Pipeline:
                 yield command
 
     def __init__(self, commands: list = [], name: str = 'main',
-                    subrefs: list = []) -> None:
+                    subrefs: list = [], batch_size: int|None = None,
+                    mode: str|None = None,
+                    queue_size: int|None = None,
+                    threads: int|None = None,
+                    processes: int|None = None,
+                    stats: bool|None = None,
+                    spill: int|None = None,
+                    cache: dict|None = None,
+                    runners: int|None = None,
+                    metrics: MetricsRegistry|None = None) -> None:
         """
         :param commands: Commands list
         :param name: Pipeline name
         :param subrefs: Sub-piplines references
+        :param batch_size: Events batch size (``None`` for default)
+        :param mode: Runner mode (``None`` for default)
+        :param queue_size: Stages queues size (``None`` for default)
+        :param threads: Threads pool size (``None`` for default)
+        :param processes: Processes pool size (``None`` for default)
+        :param stats: Collect the commands runtime metrics (``None``
+            for default)
+        :param spill: Buffering commands spill threshold, in bytes
+            (``None`` for default)
+        :param cache: Results cache settings (``None`` for no cache)
+        :param runners: Runners pool size (``None`` for default)
+        :param metrics: Commands runtime metrics registry, e.g. to
+            share it with another pipeline; Defaults to a new registry
         """
         self.commands = commands
         self.name = name
         self.subrefs = subrefs
+        self.batch_size = batch_size
+        self.mode = mode
+        self.queue_size = queue_size
+        self.threads = threads
+        self.processes = processes
+        self.stats = stats
+        self.spill = spill
+        self.cache = cache
+        self.runners = runners
         self.logger = LoggerAdapter(
             defaults={'pipeline_name': name},
             logger=logging.getLogger('m42pl.pipeline')
@@ -114,6 +194,12 @@ class Pipeline:
         self._ready = True
         # Pipeline errors
         self.errors = {}
+        # Commands runtime metrics
+        self.metrics = metrics or MetricsRegistry()
+        # Sub-pipeline results cache
+        self.results_cache = None
+        # Sub-pipeline runners pool
+        self.runners_pool = None
 
     def to_dict(self) -> dict:
         """Serializes the pipeline as a :class:`dict`.
@@ -130,7 +216,16 @@ class Pipeline:
                 in self.commands
                 if command is not None
             ],
-            'subrefs': self.subrefs
+            'subrefs': self.subrefs,
+            'batch_size': self.batch_size,
+            'mode': self.mode,
+            'queue_size': self.queue_size,
+            'threads': self.threads,
+            'processes': self.processes,
+            'stats': self.stats,
+            'spill': self.spill,
+            'cache': self.cache,
+            'runners': self.runners
         }
 
     def build(self) -> None:
@@ -169,6 +264,22 @@ class Pipeline:
         # Rewrite commands list
         self.commands = list(filter(None, self.metas + [self.generator,] + self.processors))
 
+    def clone(self) -> Pipeline:
+        """Returns a copy of the pipeline with new commands instances
+        (see :meth:`from_dict`).
+
+        The copy shares the pipeline's metrics and errors; Its commands
+        keep their chunk and their position in the source script.
+        """
+        pipeline = Pipeline.from_dict(self.to_dict())
+        pipeline.metrics = self.metrics
+        pipeline.errors = self.errors
+        for source, command in zip(self.commands, pipeline.commands):
+            command._lncol_, command._offset_, command._name_ = \
+                source._lncol_, source._offset_, source._name_
+            command.chunk = source.chunk
+        return pipeline
+
     def set_chunk(self, chunk: int = 0, chunks: int = 1) -> None:
         """Set the pipeline's commands chunk number and chunks count.
 
@@ -177,26 +288,398 @@ class Pipeline:
         """
         for command in self.commands:
             command.chunk = (chunk, chunks)
+        if chunks > 1:
+            reset_identities(chunk)
+
+
+class Stage:
+    """A command bound to its pipeline and context.
+
+    :ivar command: Command instance
+    :ivar call: Command call, with pipeline and context already set
+    :ivar batch: Command batch call, or ``None`` if the command does
+        not implements ``target_batch``
+    :ivar concurrency: Maximum number of concurrent command calls
+    :ivar ordered: ``True`` if the concurrent calls results must be
+        kept in order, ``False`` otherwise
+    :ivar remain: Command :meth:`remain` method, or ``None`` if the
+        command never holds remaining events
+    """
+
+    __slots__ = ('command', 'call', 'batch', 'concurrency', 'ordered',
+                    'remain')
+
+    @staticmethod
+    def offload(call, pool: ThreadPool):
+        """Wraps a command call to run it in a threads pool.
+
+        :param call: Command call
+        :param pool: Threads pool
+        """
+
+        async def collect(**kwargs):
+            return [_event async for _event in call(**kwargs)]
+
+        async def offloaded(**kwargs):
+            for _event in await pool.run(collect(**kwargs)):
+                yield _event
+
+        return offloaded
+
+    @staticmethod
+    def copied(call):
+        """Wraps a command call to copy its events (see
+        :attr:`AsyncCommand._shares_events_`).
+
+        :param call: Command call
+        """
+
+        async def wrapper(**kwargs):
+            async for _event in call(**kwargs):
+                yield _event and clone(_event)
+
+        return wrapper
+
+    @staticmethod
+    def measured(call, metrics: CommandMetrics, count, remain=None,
+                    spilled=None):
+        """Wraps a command call to collect its runtime metrics.
+
+        :param call: Command call
+        :param metrics: Command metrics
+        :param count: Function returning the number of events received
+            by a call, from its keyword arguments
+        :param remain: Command :meth:`remain` method, to sample its
+            remaining events after each call
+        :param spilled: Command :meth:`spilled` method, to sample its
+            spilled events after each call
+        """
+
+        async def wrapper(**kwargs):
+            metrics.calls += 1
+            metrics.events_in += count(kwargs)
+            iterator = call(**kwargs).__aiter__()
+            start = perf_counter()
+            while True:
+                try:
+                    _event = await iterator.__anext__()
+                except StopAsyncIteration:
+                    metrics.target_time += perf_counter() - start
+                    break
+                except errors.CommandError:
+                    metrics.target_time += perf_counter() - start
+                    metrics.errors += 1
+                    raise
+                now = perf_counter()
+                metrics.target_time += now - start
+                if _event:
+                    metrics.events_out += 1
+                yield _event
+                start = perf_counter()
+                metrics.blocked_time += start - now
+            if remain is not None:
+                metrics.remain = await remain()
+                metrics.remain_peak = max(metrics.remain_peak, metrics.remain)
+            if spilled is not None:
+                metrics.spilled, metrics.spilled_bytes = spilled()
+
+        return wrapper
+
+    def measure(self, metrics: CommandMetrics) -> None:
+        """Wraps the command calls to collect its runtime metrics.
+
+        :param metrics: Command metrics
+        """
+        spilled = isinstance(self.command, BufferingCommand) \
+            and self.command.spilled or None
+        self.call = self.measured(self.call, metrics,
+                                    lambda kwargs: kwargs['event'] and 1 or 0,
+                                    self.remain, spilled)
+        if self.batch is not None:
+            self.batch = self.measured(self.batch, metrics,
+                                        lambda kwargs: len(kwargs['events']),
+                                        self.remain, spilled)
+
+    @staticmethod
+    def traced(call, tracer: m42pl.utils.tracing.Tracer, name: str,
+                args: dict):
+        """Wraps a command call to trace it.
+
+        :param call: Command call
+        :param tracer: Active tracer
+        :param name: Span name
+        :param args: Span arguments
+        """
+
+        async def wrapper(**kwargs):
+            if not tracer.enabled():
+                async for _event in call(**kwargs):
+                    yield _event
+                return
+            start = tracer.now()
+            try:
+                async for _event in call(**kwargs):
+                    yield _event
+            finally:
+                tracer.complete(name, 'command', start, args=args)
+
+        return wrapper
+
+    @staticmethod
+    def span(command: AnyCommmand, pipeline: Pipeline) -> tuple[str, dict]:
+        """Returns a command's span name and arguments.
+
+        :param command: Command instance
+        :param pipeline: Current pipeline
+        """
+        name = command._name_ or type(command).__name__
+        return name, {
+            'pipeline': pipeline.name,
+            'command': name,
+            'line': command._lncol_[0],
+            'column': command._lncol_[1]
+        }
+
+    def trace(self, tracer: m42pl.utils.tracing.Tracer,
+                pipeline: Pipeline) -> None:
+        """Wraps the command calls to trace them.
+
+        :param tracer: Active tracer
+        :param pipeline: Current pipeline
+        """
+        name, args = self.span(self.command, pipeline)
+        self.call = self.traced(self.call, tracer, name, args)
+        if self.batch is not None:
+            self.batch = self.traced(self.batch, tracer, name, args)
+
+    def __init__(self, command: AnyCommmand, pipeline: Pipeline,
+                    context: Context|None,
+                    pool: ThreadPool|None = None) -> None:
+        """
+        :param command: Command instance
+        :param pipeline: Current pipeline
+        :param context: Current context
+        :param pool: Threads pool for blocking commands
+        """
+        self.command = command
+        self.call = partial(command, pipeline=pipeline, context=context)
+        # Batch call only for commands implementing `target_batch`
+        if (
+            isinstance(command, StreamingCommand)
+            and type(command).target_batch is not StreamingCommand.target_batch
+        ):
+            self.batch = partial(command.call_batch, pipeline=pipeline,
+                                    context=context)
+        else:
+            self.batch = None
+        # Concurrent calls for streaming commands only
+        if isinstance(command, StreamingCommand):
+            self.concurrency = max(1, int(command._concurrency_))
+            self.ordered = bool(command._ordered_)
+        else:
+            self.concurrency, self.ordered = 1, True
+        # Copy the events of the commands which keep using them
+        if command._shares_events_:
+            self.call = self.copied(self.call)
+            if self.batch is not None:
+                self.batch = self.copied(self.batch)
+        # Run blocking commands calls in the threads pool
+        if command._blocking_ and pool is not None:
+            self.call = self.offload(self.call, pool)
+            if self.batch is not None:
+                self.batch = self.offload(self.batch, pool)
+        # Skip `remain` calls for commands using the default one
+        if type(command).remain is AsyncCommand.remain:
+            self.remain = None
+        else:
+            self.remain = command.remain
+
+
+class ProcessStage:
+    """Contiguous CPU-bound commands run in a processes pool.
+
+    A process stage behaves like a :class:`Stage`. The events batches
+    are split in chunks (one per worker process); The chunks results
+    are yielded in order.
+
+    :ivar commands: Commands instances
+    :ivar command: First command instance
+    :ivar pool: Processes pool
+    :ivar runner: Parent pipeline runner
+    """
+
+    __slots__ = ('commands', 'command', 'pool', 'runner', 'call', 'batch',
+                    'concurrency', 'ordered', 'remain')
+
+    def __init__(self, commands: list[StreamingCommand], pool: ProcessPool,
+                    runner: PipelineRunner) -> None:
+        """
+        :param commands: Commands instances
+        :param pool: Processes pool running the commands
+        :param runner: Parent pipeline runner
+        """
+        self.commands = commands
+        self.command = commands[0]
+        self.pool = pool
+        self.runner = runner
+        self.call = self.call_event
+        self.batch = self.call_batch
+        self.concurrency, self.ordered = 1, True
+        self.remain = None
+
+    async def call_batch(self, events: list, *args, **kwargs):
+        """Runs the commands on a batch of events.
+
+        :param events: Events batch
+        """
+        size = -(-len(events) // self.pool.workers)
+        for results, errors, metrics in await asyncio.gather(*[
+                self.pool.run(events[i:i + size])
+                for i
+                in range(0, len(events), size)
+            ]):
+            self.runner.merge_errors(errors)
+            self.runner.metrics.merge(metrics)
+            for _event in results:
+                yield _event
+
+    async def call_event(self, event: dict|None, *args, **kwargs):
+        """Runs the commands on a single event.
+
+        Like streaming commands, forwards the wake-up and ending calls
+        (i.e. without event).
+
+        :param event: Current event
+        """
+        if event:
+            async for _event in self.call_batch([event, ]):
+                yield _event
+        else:
+            yield event
+
+
+class EventsQueue(asyncio.Queue):
+    """Stages queue (``concurrent`` mode only).
+
+    The queue holds events batches and control items (signals and
+    errors); It counts the events of its batches.
+
+    :ivar events: Amount of events in the queued batches
+    """
+
+    def _init(self, maxsize: int) -> None:
+        super()._init(maxsize)
+        self.events = 0
+
+    def _put(self, item) -> None:
+        super()._put(item)
+        if isinstance(item, list):
+            self.events += len(item)
+
+    def _get(self):
+        item = super()._get()
+        if isinstance(item, list):
+            self.events -= len(item)
+        return item
 
 
 class PipelineRunner:
     """Runs a pipeline.
 
+    The runner supports the following modes:
+
+    * ``sequential``: The events are sent through the processors
+      one by one (or batch by batch), in a single loop
+    * ``concurrent``: Each processor runs in its own task; The tasks
+      are connected by bounded queues, so a slow processor does not
+      stall the other ones until its input queue is full
+
+    :ivar modes: Supported modes
     :ivar pipeline: Pipeline instance
     :ivar tracing: ``True`` if execution is traced, ``False`` otherwise
+    :ivar batch_size: Events batch size
+    :ivar mode: Runner mode
+    :ivar queue_size: Stages queues size (``concurrent`` mode only)
+    :ivar threads: Threads pool size for blocking commands
+    :ivar pool: Threads pool for blocking commands (set when running
+        a pipeline with blocking commands)
+    :ivar generator_pool: Single thread pool iterating over a blocking
+        generator (set when running a pipeline with a blocking
+        generating command)
+    :ivar processes: Processes pool size for CPU-bound commands;
+        ``None`` to run them in the event loop
+    :ivar process_pools: Processes pools (one per process stage)
+    :ivar iterator: Current generator wake-up iterator (set when
+        running with a generator timeout)
+    :ivar stats: ``True`` if the commands runtime metrics are
+        collected, ``False`` otherwise
+    :ivar metrics: Commands runtime metrics (see
+        :attr:`Pipeline.metrics`)
+    :ivar tracer: Active tracer when the runner has been created, if
+        any (see :class:`m42pl.utils.tracing.Tracer`)
     :ivar logger: Logger instance
     :ivar _ready: ``True`` if the runner is ready, ``False`` otherwise
     :ivar _commands_set: ``True`` if the ``pipeline`` commands have
         been set, ``False`` otherwise
     """
 
-    def __init__(self, pipeline: Pipeline, tracing: bool = False) -> None:
+    modes = ('sequential', 'concurrent')
+
+    class Signal(IntEnum):
+        """Control items sent through the stages queues
+        (``concurrent`` mode only).
+        """
+        WAKEUP  = auto()    # Wake-up the processors
+        END     = auto()    # Run the processors in end mode
+        SYNC    = auto()    # Notify the end of an infinite loop
+
+    def __init__(self, pipeline: Pipeline, tracing: bool = False,
+                    batch_size: int|None = None, mode: str|None = None,
+                    queue_size: int|None = None,
+                    threads: int|None = None,
+                    processes: int|None = None,
+                    stats: bool|None = None) -> None:
         """
         :param pipeline: Pipeline instance
         :param tracing: ``True`` to enable tracing, ``False`` otherwise
+        :param batch_size: Events batch size; Defaults to the
+            pipeline's batch size or ``1`` (no batching)
+        :param mode: Runner mode; Defaults to the pipeline's mode or
+            ``sequential``
+        :param queue_size: Stages queues size; Defaults to the
+            pipeline's queues size or ``16``
+        :param threads: Threads pool size; Defaults to the pipeline's
+            threads pool size or to the Python's default
+        :param processes: Processes pool size; Defaults to the
+            pipeline's processes pool size or ``None`` (no processes
+            pool)
+        :param stats: ``True`` to collect the commands runtime
+            metrics; Defaults to the pipeline's setting or ``False``
         """
         self.pipeline = pipeline
         self.tracing = tracing
+        self.batch_size = batch_size or pipeline.batch_size or 1
+        if self.batch_size < 1:
+            raise Exception((
+                f'invalid batch size: batch_size="{self.batch_size}", '
+                f'reason="Size should be >= 1"'
+            ))
+        self.mode = mode or pipeline.mode or 'sequential'
+        if self.mode not in self.modes:
+            raise Exception((
+                f'invalid runner mode: mode="{self.mode}", '
+                f'reason="Mode should be one of {", ".join(self.modes)}"'
+            ))
+        self.queue_size = queue_size or pipeline.queue_size or 16
+        self.threads = threads or pipeline.threads or None
+        self.pool = None # type: ThreadPool|None
+        self.generator_pool = None # type: ThreadPool|None
+        self.processes = processes or pipeline.processes or None
+        self.process_pools = [] # type: list[ProcessPool]
+        self.iterator = None # type: WakeupIterator|None
+        self.stats = bool(stats or pipeline.stats)
+        self.metrics = pipeline.metrics
+        self.tracer = m42pl.utils.tracing.tracer
         self.logger = LoggerAdapter(
             defaults={'pipeline_name': pipeline.name},
             logger=logging.getLogger('m42pl.pipeline.PipelineRunner')
@@ -250,53 +733,568 @@ class PipelineRunner:
                         raise error
             # Do not re-setup commands (needed for sub pipelines)
             self._commands_set = True
+            await self.warm_subpipelines(event)
         else:
             self.logger.debug(f'pipeline commands already set')
 
-    async def run_commands(self, commands, event, ending, remain):
-        """Runs a commands list.
+    async def warm_subpipelines(self, event: dict|None) -> None:
+        """Warms the runners pools of the sub-pipelines (see
+        :class:`RunnersPool`), so the first sub-pipelines fields reads
+        do not pay for the sub-pipelines setup.
+
+        :param event: Last received event (may be ``None``).
+        """
+        if self.context is None:
+            return
+        for name in self.pipeline.subrefs:
+            if name in self.context.pipelines:
+                await RunnersPool.get(
+                    self.context.pipelines[name],
+                    self.context
+                ).warm(event)
+
+    def compile_commands(self, commands: list) -> tuple[Stage|ProcessStage, ...]:
+        """Compiles a commands list into a flat stages chain.
+
+        The chain is compiled once per run and then walked iteratively
+        by :meth:`run_commands` for each event.
+
+        If the runner has a processes pool size, the contiguous
+        CPU-bound streaming commands are compiled into a single
+        :class:`ProcessStage`.
 
         :param commands: Commands list
+        """
+        stages = [] # type: list[Stage|ProcessStage]
+        offloaded = [] # type: list[StreamingCommand]
+        for command in [*commands, None]:
+            # Group the contiguous CPU-bound commands
+            if (
+                self.processes
+                and isinstance(command, StreamingCommand)
+                and command._cpu_bound_
+            ):
+                offloaded.append(command)
+                continue
+            if len(offloaded):
+                self.process_pools.append(ProcessPool(
+                    self.processes,
+                    Pipeline(commands=offloaded, name=self.pipeline.name,
+                                stats=self.stats),
+                    self.context
+                ))
+                stages.append(ProcessStage(offloaded, self.process_pools[-1], self))
+                offloaded = []
+            if command is not None:
+                stages.append(Stage(command, self.pipeline, self.context, self.pool))
+                if self.stats:
+                    stages[-1].measure(self.metrics.get(command))
+                if self.tracer is not None:
+                    stages[-1].trace(self.tracer, self.pipeline)
+        return tuple(stages)
+
+    def stop_pool(self) -> None:
+        """Stops the threads pool and the processes pools.
+        """
+        if self.pool is not None:
+            self.logger.info('stopping threads pool', **self.pool.stats())
+            self.pool.shutdown()
+        if self.generator_pool is not None:
+            self.logger.info('stopping generator thread', **self.generator_pool.stats())
+            self.generator_pool.shutdown()
+            self.generator_pool = None
+        for pool in self.process_pools:
+            self.logger.info('stopping processes pool', **pool.stats())
+            pool.shutdown()
+
+    def iterate(self, generator: GeneratingCommand, event: dict|None,
+                    timeout: float):
+        """Returns the generator's events iterator.
+
+        If a timeout is set, the iterator returns
+        :attr:`WakeupIterator.WAKEUP` when the generator takes too long
+        to produce an event.
+
+        :param generator: Generating command
+        :param event: Initial event
+        :param timeout: Generator timeout to force pipeline wakeup
+        """
+        call = generator
+        if self.generator_pool is not None:
+            call = self.offloaded_generator(call, self.generator_pool)
+        if generator._shares_events_:
+            call = Stage.copied(call)
+        if self.stats:
+            call = Stage.measured(call, self.metrics.get(generator),
+                                    lambda kwargs: 0)
+        if self.tracer is not None:
+            call = self.traced_generator(call, self.tracer,
+                                            *Stage.span(generator, self.pipeline))
+        iterator = call(
+            event=event,
+            pipeline=self.pipeline,
+            context=self.context
+        ).__aiter__()
+        if timeout > 0.0:
+            iterator = self.iterator = WakeupIterator(iterator, timeout)
+        return iterator
+
+    @staticmethod
+    def offloaded_generator(call, pool: ThreadPool):
+        """Wraps a blocking generating command call to iterate over it
+        in a threads pool.
+
+        Each generated event is awaited in the pool, so the event loop
+        (and the generator timeout) remains responsive. The pool should
+        have a single worker thread: the generator then runs in the
+        same thread and event loop for its whole iteration.
+
+        :param call: Generating command call
+        :param pool: Threads pool
+        """
+        end = object()
+
+        async def step(iterator):
+            try:
+                return await iterator.__anext__()
+            except StopAsyncIteration:
+                return end
+
+        async def wrapper(**kwargs):
+            iterator = call(**kwargs).__aiter__()
+            done = False
+            try:
+                while True:
+                    _event = await pool.run(step(iterator))
+                    if _event is end:
+                        done = True
+                        return
+                    yield _event
+            finally:
+                # Close an interrupted generator in its own thread
+                if not done and not pool.closed:
+                    await pool.run(iterator.aclose())
+
+        return wrapper
+
+    @staticmethod
+    def traced_generator(call, tracer: m42pl.utils.tracing.Tracer,
+                            name: str, args: dict):
+        """Wraps a generating command call to trace each generated
+        event.
+
+        :param call: Generating command call
+        :param tracer: Active tracer
+        :param name: Span name
+        :param args: Span arguments
+        """
+
+        async def wrapper(**kwargs):
+            iterator = call(**kwargs).__aiter__()
+            while True:
+                start = tracer.now()
+                try:
+                    _event = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+                if tracer.enabled():
+                    tracer.complete(name, 'generator', start, args=args)
+                yield _event
+
+        return wrapper
+
+    async def close_iterator(self) -> None:
+        """Stops the current wake-up iterator, if any.
+        """
+        if self.iterator is not None:
+            await self.iterator.aclose()
+            self.iterator = None
+
+    def count_error(self, error: errors.CommandError) -> None:
+        """Accounts a command error in the pipeline errors.
+
+        :param error: Command error
+        """
+        error_key = f'{error.offset}:{error.line}:{error.column}:{error.name}'
+        if not error_key in self.pipeline.errors:
+            self.pipeline.errors[error_key] = {
+                'message': str(error),
+                'count': 0
+            }
+        self.pipeline.errors[error_key]['count'] += 1
+
+    def merge_errors(self, errors: dict) -> None:
+        """Accounts command errors reported by another pipeline (e.g.
+        a worker process copy of this pipeline).
+
+        :param errors: Errors, as found in :attr:`Pipeline.errors`
+        """
+        for error_key, error in errors.items():
+            self.pipeline.errors.setdefault(error_key, {
+                'message': error['message'],
+                'count': 0
+            })['count'] += error['count']
+
+    async def run_commands(self, stages, event, ending, remain):
+        """Runs a compiled commands list.
+
+        The stages are walked depth-first: each event yielded by a
+        stage is immediately sent to the next stage. The walk is
+        iterative; one iterator is kept per active stage.
+
+        :param stages: Compiled commands list (see
+            :meth:`compile_commands`)
         :param event: Current event
         :param ending: ``True`` if the pipeline is ending, ``False``
             otherwise
         :param remain: Amount or remaining events in the previous
             command
         """
-        if len(commands):
-            # Current command instance and children commands
-            command, has_further_commands = commands[0], len(commands) > 1
-            # Run command and children commands
-            try:
-                async for _event in command(
-                        event=event,
-                        pipeline=self.pipeline,
-                        context=self.context,
+        if not len(stages):
+            return
+        # Decide whether to trace the event
+        owner = self.tracer is not None and self.tracer.begin()
+        try:
+            last = len(stages) - 1
+            # Active iterators and their received `remain`, one per level
+            iterators = [stages[0].call(event=event, ending=ending, remain=remain), ]
+            remains = [remain, ]
+            while iterators:
+                level = len(iterators) - 1
+                # Get next event from current level
+                try:
+                    _event = await iterators[level].__anext__()
+                except StopAsyncIteration:
+                    iterators.pop()
+                    remains.pop()
+                    continue
+                # Command errors handling
+                except errors.CommandError as error:
+                    self.count_error(error)
+                    iterators.pop()
+                    remains.pop()
+                    continue
+                # Send event to the next level
+                if level < last:
+                    _remain = remains[level]
+                    if stages[level].remain is not None:
+                        _remain += await stages[level].remain()
+                    iterators.append(stages[level + 1].call(
+                        event=_event,
                         ending=ending,
-                        remain=remain
-                    ):
-                    if has_further_commands:
-                        async for __event in self.run_commands(
-                                commands[1:],
-                                _event,
-                                ending,
-                                (remain + await command.remain())
-                            ):
-                            yield __event
-                    elif _event:
-                        yield _event
-            # Command errors handling
+                        remain=_remain
+                    ))
+                    remains.append(_remain)
+                elif _event:
+                    yield _event
+        finally:
+            if owner:
+                self.tracer.end(owner)
+
+    async def run_stage(self, stage, events, ending, remain) -> list:
+        """Runs a single compiled command on a batch of events.
+
+        Commands implementing ``target_batch`` receive the batch at
+        once (an error then discards the rest of the batch); Commands
+        allowing concurrent calls are called concurrently (see
+        :meth:`run_stage_concurrent`); Other commands are called once
+        per event.
+
+        The ``remain`` value sent with each event also counts the
+        events following it in the batch.
+
+        :param stage: Compiled command
+        :param events: Current events batch
+        :param ending: ``True`` if the pipeline is ending, ``False``
+            otherwise
+        :param remain: Amount or remaining events in the previous
+            command
+        :return: The command results
+        """
+        results = []
+        # Batch call
+        if stage.batch is not None and all(events):
+            try:
+                async for _event in stage.batch(events=events,
+                        ending=ending, remain=remain):
+                    results.append(_event)
             except errors.CommandError as error:
-                # print(error.name, error.line, error.column, error.offset)
-                # print(str(error))
-                # print()
-                error_key = f'{error.offset}:{error.line}:{error.column}:{error.name}'
-                if not error_key in self.pipeline.errors:
-                    self.pipeline.errors[error_key] = {
-                        'message': str(error),
-                        'count': 0
-                    }
-                self.pipeline.errors[error_key]['count'] += 1
+                self.count_error(error)
+        # Concurrent calls
+        elif stage.concurrency > 1 and len(events) > 1 and all(events):
+            results = await self.run_stage_concurrent(stage, events,
+                                                        ending, remain)
+        # Per-event calls
+        else:
+            count = len(events)
+            for i, event in enumerate(events):
+                try:
+                    async for _event in stage.call(event=event,
+                            ending=ending, remain=remain + count - i - 1):
+                        results.append(_event)
+                except errors.CommandError as error:
+                    self.count_error(error)
+        return results
+
+    async def run_stage_concurrent(self, stage, events, ending,
+                                    remain) -> list:
+        """Runs a single compiled command concurrently on a batch of
+        events.
+
+        Up to ``stage.concurrency`` command calls are kept in flight.
+        If the stage is ordered, the calls results are returned in the
+        events order (the oldest call is awaited first); Otherwise,
+        they are returned as soon as they are available.
+
+        :param stage: Compiled command
+        :param events: Current events batch
+        :param ending: ``True`` if the pipeline is ending, ``False``
+            otherwise
+        :param remain: Amount or remaining events in the previous
+            command
+        :return: The command results
+        """
+
+        async def call(event, remain):
+            _results = []
+            try:
+                async for _event in stage.call(event=event, ending=ending,
+                                                remain=remain):
+                    _results.append(_event)
+            except errors.CommandError as error:
+                self.count_error(error)
+            return _results
+
+        results = []
+        count = len(events)
+        # Ordered calls: the in-flight calls are awaited in order
+        if stage.ordered:
+            window = deque()
+            try:
+                for i, event in enumerate(events):
+                    if len(window) >= stage.concurrency:
+                        results.extend(await window.popleft())
+                    window.append(asyncio.ensure_future(
+                        call(event, remain + count - i - 1)))
+                while window:
+                    results.extend(await window.popleft())
+            finally:
+                for task in window:
+                    task.cancel()
+        # Unordered calls: the in-flight calls are awaited as they
+        # complete
+        else:
+            pending = set()
+            try:
+                for i, event in enumerate(events):
+                    if len(pending) >= stage.concurrency:
+                        done, pending = await asyncio.wait(pending,
+                            return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            results.extend(task.result())
+                    pending.add(asyncio.ensure_future(
+                        call(event, remain + count - i - 1)))
+                while pending:
+                    done, pending = await asyncio.wait(pending,
+                        return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        results.extend(task.result())
+            finally:
+                for task in pending:
+                    task.cancel()
+        return results
+
+    async def run_batch(self, stages, events, ending, remain):
+        """Runs a compiled commands list on a batch of events.
+
+        The stages are walked breadth-first: each stage processes the
+        whole batch (see :meth:`run_stage`) before its results are
+        sent to the next stage.
+
+        :param stages: Compiled commands list (see
+            :meth:`compile_commands`)
+        :param events: Current events batch
+        :param ending: ``True`` if the pipeline is ending, ``False``
+            otherwise
+        :param remain: Amount or remaining events in the previous
+            command
+        """
+        # Decide whether to trace the events batch
+        owner = self.tracer is not None and self.tracer.begin()
+        try:
+            for stage in stages:
+                if not len(events):
+                    return
+                events = await self.run_stage(stage, events, ending, remain)
+                if stage.remain is not None:
+                    remain += await stage.remain()
+        finally:
+            if owner:
+                self.tracer.end(owner)
+        for event in events:
+            if event:
+                yield event
+
+    async def feed_queue(self, queue, generator, event, infinite, timeout):
+        """Sends the generated events to the first stage queue
+        (``concurrent`` mode only).
+
+        The events are sent by batch of :attr:`batch_size` events.
+        The generator errors are sent through the queue as well.
+
+        :param queue: First stage queue
+        :param generator: Generating command
+        :param event: Initial event
+        :param infinite: ``True`` if the pipeline runs in infinite mode
+        :param timeout: Generator timeout to force pipeline wakeup
+        """
+        Signal = self.Signal
+        try:
+            # Send the generated events
+            if generator and (event or not infinite):
+                iterator = self.iterate(generator, event, timeout)
+                batch = []
+                while True:
+                    try:
+                        next_event = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    if next_event is WakeupIterator.WAKEUP:
+                        self.logger.debug(f'generator timeout, forcing pipeline wakeup')
+                        if len(batch):
+                            await queue.put(batch)
+                            batch = []
+                        await queue.put(Signal.WAKEUP)
+                        continue
+                    if next_event is None:
+                        break
+                    batch.append(next_event)
+                    if len(batch) >= self.batch_size:
+                        await queue.put(batch)
+                        batch = []
+                if len(batch):
+                    await queue.put(batch)
+                await queue.put(Signal.END)
+            # Send the initial event alone (infinite mode): the
+            # processors are not ending
+            elif infinite and event:
+                await queue.put([event, ])
+                await queue.put(Signal.SYNC)
+            # Send the initial event alone
+            else:
+                if event:
+                    await queue.put([event, ])
+                await queue.put(Signal.END)
+        except Exception as error:
+            await queue.put(error)
+        finally:
+            await self.close_iterator()
+
+    async def run_stage_queue(self, stage, source, sink):
+        """Runs a compiled command between two queues
+        (``concurrent`` mode only).
+
+        If the command allows concurrent calls, the events batches
+        waiting in the input queue are merged so the command receives
+        up to ``stage.concurrency`` events at once. The ``remain`` value
+        sent to the command counts the events still waiting in the
+        input queue (see :class:`EventsQueue`).
+
+        :param stage: Compiled command
+        :param source: Input queue
+        :param sink: Output queue
+        """
+        Signal = self.Signal
+        following = None
+        while True:
+            if following is not None:
+                item, following = following, None
+            else:
+                item = await source.get()
+            try:
+                # Wake-up or end the command
+                if item is Signal.WAKEUP or item is Signal.END:
+                    results = [
+                        _event for _event
+                        in await self.run_stage(stage, [None, ],
+                            item is Signal.END, 0)
+                        if _event
+                    ]
+                    if len(results):
+                        await sink.put(results)
+                    await sink.put(item)
+                # Forward synchronization signals and errors
+                elif item is Signal.SYNC or isinstance(item, Exception):
+                    await sink.put(item)
+                # Process events
+                else:
+                    # Merge the waiting events batches
+                    while len(item) < stage.concurrency and not source.empty():
+                        following = source.get_nowait()
+                        if not isinstance(following, list):
+                            break
+                        item, following = item + following, None
+                    results = await self.run_stage(stage, item, False,
+                                                    source.events)
+                    if len(results):
+                        await sink.put(results)
+            except Exception as error:
+                await sink.put(error)
+
+    async def run_concurrent(self, generator, stages, event, infinite,
+                                timeout):
+        """Runs the pipeline processors concurrently.
+
+        Each stage runs in its own task and receives its events from
+        a bounded queue (see :meth:`run_stage_queue`); The generator
+        runs in its own task as well (see :meth:`feed_queue`). The
+        processors are woken-up and ended by signals sent through the
+        queues.
+
+        :param generator: Generating command
+        :param stages: Compiled processors list
+        :param event: Initial event
+        :param infinite: ``True`` if the pipeline should run forever,
+            ``False`` otherwise
+        :param timeout: Generator timeout to force pipeline wakeup
+        """
+        Signal = self.Signal
+        queues = [
+            EventsQueue(maxsize=self.queue_size)
+            for _ in range(len(stages) + 1)
+        ]
+        tasks = [
+            asyncio.create_task(self.run_stage_queue(stage, queues[i], queues[i + 1]))
+            for i, stage in enumerate(stages)
+        ]
+        feeder = None
+        try:
+            while self._ready:
+                # In infinite mode, receive the loop's initial event
+                if infinite:
+                    event = yield
+                feeder = asyncio.create_task(self.feed_queue(
+                    queues[0], generator, event, infinite, timeout))
+                # Yield the processed events until the end of the loop
+                while True:
+                    item = await queues[-1].get()
+                    if item is Signal.END or item is Signal.SYNC:
+                        break
+                    elif item is Signal.WAKEUP:
+                        continue
+                    elif isinstance(item, Exception):
+                        raise item
+                    for _event in item:
+                        if _event:
+                            yield _event
+                await feeder
+                if not infinite:
+                    return
+        finally:
+            tasks = [task for task in [feeder, *tasks] if task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     async def __call__(self, context: Context|None = None,
                         event: dict|None = None, infinite: bool = False,
@@ -332,11 +1330,38 @@ class PipelineRunner:
                 await stack.enter_async_context(cmd)
                 for cmd in self.pipeline.processors
             ]
+            # Start the threads pool for the blocking commands
+            if any(cmd._blocking_ for cmd in metas + processors):
+                self.pool = ThreadPool(self.threads,
+                                        f'm42pl-{self.pipeline.name}')
+            # Iterate over a blocking generator in its own thread
+            if generator is not None and generator._blocking_:
+                self.generator_pool = ThreadPool(1,
+                                        f'm42pl-{self.pipeline.name}-generator')
+            stack.callback(self.stop_pool)
+            stack.push_async_callback(self.close_iterator)
+            # Compile commands chains
+            metas = self.compile_commands(metas)
+            processors = self.compile_commands(processors)
             # Run pipeline metas
             self.logger.info(f'running pipeline metas')
             async for _ in self.run_commands(metas, event, False, 0):
                 pass
             # ---
+            # Run the processors in concurrent mode
+            if self.mode == 'concurrent' and len(processors):
+                self.logger.info(f'running pipeline processors in concurrent mode')
+                loop = self.run_concurrent(generator, processors, event,
+                                            infinite, timeout)
+                try:
+                    sent = None
+                    while True:
+                        sent = yield await loop.asend(sent)
+                except StopAsyncIteration:
+                    return
+                finally:
+                    await loop.aclose()
+            # ---
             # Setup the events iterator, i.e. the pipeline generator
             #
             # If the pipeline run in infinite mode, the initial event will
@@ -347,14 +1372,17 @@ class PipelineRunner:
             # Otherwise, set the iterator immediately.
             else:
                 # self.trace(1, 'standard mode: set iterator from generator')
-                iterator = generator and generator(
-                    event=event,
-                    pipeline=self.pipeline,
-                    context=self.context
-                ).__aiter__() or None
+                iterator = generator and self.iterate(generator, event,
+                                                        timeout) or None
             # ---
             # Start pipeline loop
             next_event = event
+            # Generated events batch (when running in batch mode); The
+            # events are batched by at least the largest stage
+            # concurrency so the concurrent stages fill their window
+            batch_size = max([self.batch_size, ] + [
+                stage.concurrency for stage in processors])
+            batch = []
             # while self._ready:
             while self._ready:
                 # self.trace(2, 'looping')
@@ -369,11 +1397,8 @@ class PipelineRunner:
                         # self.trace(3, f'initial event: {next_event and next_event["sign"] or None}')
                         if next_event:
                             # self.trace(4, f'initial event is not None, reset iterator on it')
-                            iterator = generator and generator(
-                                event=next_event,
-                                pipeline=self.pipeline,
-                                context=self.context
-                            ).__aiter__() or None
+                            iterator = generator and self.iterate(
+                                generator, next_event, timeout) or None
                         # else:
                             # self.trace(4, f'initial event is None, pipeline should raise StopAsyncIteration right after')
                     # ---
@@ -381,14 +1406,9 @@ class PipelineRunner:
                     # iterator, it retrieves its next event from this iterator.
                     if iterator:
                         # self.trace(3, f'iterator is set, await next event')
-                        if timeout > 0.0:
-                            task = asyncio.create_task(iterator.__anext__())
-                            # self.trace(4, f'task shiedled: {task}')
-                            next_event = await asyncio.wait_for(
-                                asyncio.shield(task),
-                                timeout)
-                        else:
-                            next_event = await iterator.__anext__()
+                        next_event = await iterator.__anext__()
+                        if next_event is WakeupIterator.WAKEUP:
+                            raise asyncio.TimeoutError()
                     # ---
                     # If neither the calling function nor the generator had 
                     # yield an event, stop the iteration.
@@ -400,17 +1420,26 @@ class PipelineRunner:
                 # Timeout occurs when the iterator took too long to yield an
                 # event. Send None to the processors to 'wake-up' the
                 # buffering commands and process the buffered events.
+                # The pending event is received in the next loop.
                 except asyncio.TimeoutError:
                     self.logger.debug(f'generator timeout, forcing pipeline wakeup')
-                    # self.trace(4, f'shielded task {task} -> wake up !')
+                    if len(batch):
+                        async for e in self.run_batch(processors, batch, False, 0):
+                            yield e
+                        batch = []
                     async for e in self.run_commands(processors, None, False, 0):
                         yield e
-                    next_event = await task # type: ignore
+                    continue
                 # ---
                 # StopAsyncIteration occurs when either the iterator or the
                 # calling function have finished to produce events.
                 except StopAsyncIteration:
                     # self.trace(3, 'catched StopAsyncIteration')
+                    # Process the pending events batch
+                    if len(batch):
+                        async for _event in self.run_batch(processors, batch, False, 0):
+                            yield _event
+                        batch = []
                     # Always empty the buffered events
                     if len(processors):
                         self.logger.info(f'received StopAsyncIteration, running pipeline processors in end mode')
@@ -432,8 +1461,18 @@ class PipelineRunner:
                         # self.trace(4, 'standard mode, return')
                         return
                 # ---
+                # Batch the events received from the generator when running
+                # in batch mode; The batch is processed once full.
+                if batch_size > 1 and iterator and next_event and len(processors):
+                    batch.append(next_event)
+                    if len(batch) >= batch_size:
+                        async for _event in self.run_batch(processors, batch, False, 0):
+                            yield _event
+                        batch = []
+                    next_event = None
+                # ---
                 # Process the received event.
-                if len(processors):
+                elif len(processors):
                     # self.trace(3, f'running processors on event {next_event and next_event["sign"] or None}')
                     # self.trace(3, f'processors: {processors}')
                     async for _event in self.run_commands(processors, next_event, False, 0):
@@ -477,3 +1516,151 @@ class InfiniteRunner:
             return
         except StopAsyncIteration:
             yield
+
+
+class RunnersPool:
+    """Pool of :class:`InfiniteRunner` serving a sub-pipeline.
+
+    Each runner runs its own copy of the sub-pipeline (see
+    :meth:`Pipeline.clone`), so concurrent reads (e.g. from
+    :meth:`m42pl.fields.FieldsMap.read`) do not share the commands
+    states. The runners are created on demand up to :attr:`size`; Once
+    they are all busy, the reads wait for a runner to be released.
+
+    A pool is shared by all the sub-pipeline fields referencing the
+    same pipeline (see :meth:`get`) and must be used from a single
+    event loop.
+
+    :ivar pipeline: Sub-pipeline
+    :ivar context: Sub-pipeline context
+    :ivar size: Maximum number of runners
+    :ivar runners: Created runners (idle and busy)
+    :ivar idle: Idle runners
+    :ivar waiters: Reads waiting for a runner
+    """
+
+    # Default pool size
+    default_size = 4
+
+    @classmethod
+    def get(cls, pipeline: Pipeline, context: Context) -> RunnersPool:
+        """Returns a pipeline's runners pool, creating it if necessary.
+
+        :param pipeline: Sub-pipeline
+        :param context: Sub-pipeline context
+        """
+        if pipeline.runners_pool is None:
+            pipeline.runners_pool = cls(pipeline, context,
+                                        pipeline.runners or cls.default_size)
+        return pipeline.runners_pool
+
+    def __init__(self, pipeline: Pipeline, context: Context,
+                    size: int = 4):
+        """
+        :param pipeline: Sub-pipeline
+        :param context: Sub-pipeline context
+        :param size: Maximum number of runners
+        """
+        if size < 1:
+            raise Exception((
+                f'invalid runners pool size: size="{size}", '
+                f'reason="Size should be >= 1"'
+            ))
+        self.pipeline = pipeline
+        self.context = context
+        self.size = size
+        self.runners = [] # type: list[InfiniteRunner]
+        self.idle = [] # type: list[InfiniteRunner]
+        self.waiters = deque() # type: deque[asyncio.Future]
+
+    async def create(self, event: dict|None) -> InfiniteRunner:
+        """Creates and setups a new runner.
+
+        :param event: Runner source event
+        """
+        runner = InfiniteRunner(self.pipeline.clone(), self.context, event)
+        # Reserve the runner slot before the setup yields control
+        self.runners.append(runner)
+        try:
+            await runner.setup()
+        except BaseException:
+            self.runners.remove(runner)
+            self.wakeup()
+            raise
+        return runner
+
+    async def warm(self, event: dict|None, count: int = 1) -> None:
+        """Creates idle runners until the pool holds at least ``count``
+        runners.
+
+        :param event: Runners source event
+        :param count: Minimum number of runners
+        """
+        while len(self.runners) < min(count, self.size):
+            self.idle.append(await self.create(event))
+
+    def wakeup(self) -> None:
+        """Wakes the first waiting read up.
+        """
+        while len(self.waiters):
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def acquire(self, event: dict|None) -> InfiniteRunner:
+        """Returns an idle runner, waiting for one if necessary.
+
+        :param event: Source event, used if a new runner is created
+        """
+        while True:
+            if len(self.idle):
+                return self.idle.pop()
+            if len(self.runners) < self.size:
+                return await self.create(event)
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Forward the wake-up to the next waiting read
+                if waiter.done() and not waiter.cancelled():
+                    self.wakeup()
+                raise
+
+    def release(self, runner: InfiniteRunner, broken: bool = False) -> None:
+        """Returns a runner to the pool.
+
+        :param runner: Runner returned by :meth:`acquire`
+        :param broken: ``True`` to drop the runner (e.g. when its run
+            failed), ``False`` to keep it
+        """
+        if broken:
+            self.runners.remove(runner)
+        else:
+            self.idle.append(runner)
+        self.wakeup()
+
+    async def run(self, event: dict) -> list:
+        """Runs the sub-pipeline on an event and returns its results.
+
+        :param event: Sub-pipeline source event
+        """
+        runner = await self.acquire(event)
+        try:
+            results = [_event async for _event in runner(event)]
+        except BaseException:
+            self.release(runner, broken=True)
+            raise
+        self.release(runner)
+        return results
+
+    def stats(self) -> dict:
+        """Returns the pool usage.
+        """
+        return {
+            'size': self.size,
+            'runners': len(self.runners),
+            'idle': len(self.idle),
+            'waiting': len(self.waiters)
+        }
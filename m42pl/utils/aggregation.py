@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from m42pl.event import Event
+
+
+# Aggregators classes, per alias
+ALIASES = {} # type: dict[str, type[Aggregator]]
+
+
+class Aggregator:
+    """Base mergeable aggregator.
+
+    An aggregator computes a value (e.g. a sum) over a set of values
+    through a *state*:
+
+    * :meth:`init` returns a new (empty) state
+    * :meth:`update` accounts a value in a state
+    * :meth:`merge` combines two states computed on distinct sets of
+      values (e.g. by the chunks of a split pipeline)
+    * :meth:`finalize` returns the aggregated value of a state
+
+    The aggregators themselves are stateless; The states are plain
+    JSON-serializable values, or are converted to such values by
+    :meth:`dump` (and back by :meth:`load`), so they may be sent
+    between the pipelines layers as events fields.
+
+    Aggregators are registered by their aliases when subclassed.
+
+    :ivar _aliases_: Aggregator names
+    """
+
+    _aliases_ = [] # type: list[str]
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs) # type: ignore
+        for alias in cls._aliases_:
+            ALIASES[alias] = cls
+
+    def init(self) -> Any:
+        """Returns a new state.
+        """
+        return None
+
+    def update(self, state: Any, value: Any) -> Any:
+        """Accounts a value and returns the new state.
+
+        :param state: Current state
+        :param value: Field value (``None`` if the field is missing)
+        """
+        raise NotImplementedError()
+
+    def merge(self, state: Any, other: Any) -> Any:
+        """Merges two states and returns the new state.
+
+        :param state: Current state
+        :param other: State to merge, computed after :attr:`state`
+            (e.g. by a following chunk)
+        """
+        raise NotImplementedError()
+
+    def finalize(self, state: Any) -> Any:
+        """Returns a state's aggregated value.
+
+        :param state: Final state
+        """
+        return state
+
+    def dump(self, state: Any) -> Any:
+        """Returns a state as a JSON-serializable value.
+
+        :param state: State to dump
+        """
+        return state
+
+    def load(self, value: Any) -> Any:
+        """Returns a state dumped by :meth:`dump`.
+
+        :param value: Dumped state
+        """
+        return value
+
+
+class Count(Aggregator):
+    """Counts the values (or the events, if no field is aggregated).
+    """
+
+    _aliases_ = ['count', ]
+
+    def init(self):
+        return 0
+
+    def update(self, state, value):
+        return state + 1 if value is not None else state
+
+    def merge(self, state, other):
+        return state + other
+
+
+class Sum(Aggregator):
+    """Sums the numeric values.
+    """
+
+    _aliases_ = ['sum', ]
+
+    def init(self):
+        return 0
+
+    def update(self, state, value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return state + value
+        return state
+
+    def merge(self, state, other):
+        return state + other
+
+
+class Min(Aggregator):
+    """Returns the lowest value.
+    """
+
+    _aliases_ = ['min', ]
+
+    def update(self, state, value):
+        if value is None:
+            return state
+        if state is None:
+            return value
+        try:
+            return value if value < state else state
+        except TypeError:
+            return state
+
+    def merge(self, state, other):
+        return self.update(state, other)
+
+
+class Max(Min):
+    """Returns the highest value.
+    """
+
+    _aliases_ = ['max', ]
+
+    def update(self, state, value):
+        if value is None:
+            return state
+        if state is None:
+            return value
+        try:
+            return value if value > state else state
+        except TypeError:
+            return state
+
+
+class Avg(Aggregator):
+    """Returns the mean of the numeric values.
+
+    The state is a list ``[count, sum]``.
+    """
+
+    _aliases_ = ['avg', 'mean']
+
+    def init(self):
+        return [0, 0]
+
+    def update(self, state, value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            state[0] += 1
+            state[1] += value
+        return state
+
+    def merge(self, state, other):
+        return [state[0] + other[0], state[1] + other[1]]
+
+    def finalize(self, state):
+        return state[1] / state[0] if state[0] else None
+
+
+class Var(Aggregator):
+    """Returns the sample variance of the numeric values.
+
+    The state is a list ``[count, mean, m2]`` (Welford's algorithm);
+    The states are merged using Chan's parallel algorithm.
+    """
+
+    _aliases_ = ['var', ]
+
+    def init(self):
+        return [0, 0.0, 0.0]
+
+    def update(self, state, value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            count, mean, m2 = state
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            state[:] = count, mean, m2 + delta * (value - mean)
+        return state
+
+    def merge(self, state, other):
+        if not other[0]:
+            return state
+        if not state[0]:
+            return list(other)
+        count = state[0] + other[0]
+        delta = other[1] - state[1]
+        return [
+            count,
+            state[1] + delta * other[0] / count,
+            state[2] + other[2] + delta ** 2 * state[0] * other[0] / count
+        ]
+
+    def finalize(self, state):
+        return state[2] / (state[0] - 1) if state[0] > 1 else None
+
+
+class Stdev(Var):
+    """Returns the sample standard deviation of the numeric values.
+    """
+
+    _aliases_ = ['stdev', ]
+
+    def finalize(self, state):
+        variance = super().finalize(state)
+        return variance ** 0.5 if variance is not None else None
+
+
+class First(Aggregator):
+    """Returns the first value.
+
+    The state is a list ``[value]``, empty until a value is accounted.
+    """
+
+    _aliases_ = ['first', ]
+
+    def init(self):
+        return []
+
+    def update(self, state, value):
+        if not state and value is not None:
+            state.append(value)
+        return state
+
+    def merge(self, state, other):
+        return state or other
+
+    def finalize(self, state):
+        return state[0] if state else None
+
+
+class Last(First):
+    """Returns the last value.
+    """
+
+    _aliases_ = ['last', ]
+
+    def update(self, state, value):
+        if value is not None:
+            state[:] = [value, ]
+        return state
+
+    def merge(self, state, other):
+        return other or state
+
+
+class Values(Aggregator):
+    """Returns the distinct values, in order of appearance.
+
+    The state is the list of distinct values.
+
+    :ivar limit: Maximum number of values
+    """
+
+    _aliases_ = ['values', ]
+
+    def __init__(self, limit: int = 100):
+        """
+        :param limit: Maximum number of values
+        """
+        self.limit = limit
+
+    def init(self):
+        return []
+
+    def update(self, state, value):
+        if value is not None and len(state) < self.limit and value not in state:
+            state.append(value)
+        return state
+
+    def merge(self, state, other):
+        for value in other:
+            self.update(state, value)
+        return state
+
+
+def aggregator(name: str, *args, **kwargs) -> Aggregator:
+    """Returns a new aggregator.
+
+    :param name: Aggregator alias (see :data:`ALIASES`)
+    """
+    if name not in ALIASES:
+        raise Exception((
+            f'invalid aggregator: name="{name}", '
+            f'reason="Aggregator should be one of {", ".join(ALIASES)}"'
+        ))
+    return ALIASES[name](*args, **kwargs)
+
+
+def hashable(value: Any) -> Any:
+    """Returns a hashable version of a group-by key value.
+
+    :param value: Key value
+    """
+    if isinstance(value, list):
+        return tuple(hashable(item) for item in value)
+    elif isinstance(value, dict):
+        return tuple(sorted((key, hashable(item)) for key, item in value.items()))
+    return value
+
+
+class GroupBy:
+    """Hash group-by aggregation of events.
+
+    The events are grouped on the values of the :attr:`by` fields, and
+    each group holds one state per aggregation.
+
+    In a split pipeline, the aggregating commands run twice: once per
+    chunk in the pre-merging layer, where they aggregate their events
+    and yield the compact partial states of their groups (see
+    :meth:`partials`), and once in the merging layer, where they merge
+    the partial states (see :meth:`merge`) and yield the final results
+    (see :meth:`results`). Such commands return both instances from
+    their ``__new__`` method (a buffering command followed by a merging
+    command); :meth:`add` accepts both raw events and partial states:
+
+    .. code-block:: python
+
+        groupby = GroupBy(['host', ], {'hits': ('count', None),
+                                        'bytes': ('sum', 'size')})
+        async for event in super().target(pipeline):
+            groupby.add(event)
+        # Pre-merging command
+        for event in groupby.partials():
+            yield event
+        # Merging command
+        for event in groupby.results():
+            yield event
+
+    :ivar by: Group-by fields names
+    :ivar aggregations: Aggregations, as tuples ``(name, aggregator,
+        field)`` where ``name`` is the result field name and ``field``
+        the aggregated field name (or ``None``)
+    :ivar groups: Groups, per key, as tuples ``(values, states)``
+        where ``values`` are the group-by fields values
+    """
+
+    # Partial states meta field
+    partial_field = 'partial'
+
+    def __init__(self, by: list[str],
+                    aggregations: dict[str, tuple[str|Aggregator, str|None]]):
+        """
+        :param by: Group-by fields names
+        :param aggregations: Aggregations, per result field name, as
+            tuples ``(aggregator, field)`` where ``aggregator`` is an
+            aggregator alias or instance and ``field`` the aggregated
+            field name (``None`` to aggregate the events themselves,
+            e.g. to count them)
+        """
+        # Imported here as m42pl.fields imports m42pl.pipeline
+        from m42pl.fields import Field
+        self.by = by
+        self.aggregations = [
+            (
+                name,
+                isinstance(function, Aggregator) and function
+                or aggregator(function),
+                field
+            )
+            for name, (function, field) in aggregations.items()
+        ]
+        readers = [Field(name).reader for name in by] + [
+            field is None and (lambda event: True) or Field(field).reader
+            for _, _, field in self.aggregations
+        ]
+        if None in readers:
+            raise Exception((
+                f'invalid group-by fields: by="{by}", '
+                f'reason="Fields should be readable synchronously"'
+            ))
+        self.key_readers = readers[:len(by)] # type: list[Callable]
+        self.value_readers = readers[len(by):] # type: list[Callable]
+        self.groups = {} # type: dict[Any, tuple[list, list]]
+
+    def group(self, values: list) -> list:
+        """Returns a group's states, creating the group if necessary.
+
+        :param values: Group-by fields values
+        """
+        key = hashable(values)
+        if key not in self.groups:
+            self.groups[key] = (values, [
+                function.init()
+                for _, function, _ in self.aggregations
+            ])
+        return self.groups[key][1]
+
+    def update(self, event: dict) -> None:
+        """Accounts a raw event.
+
+        :param event: Source event
+        """
+        states = self.group([read(event) for read in self.key_readers])
+        for index, ((_, function, _), read) in enumerate(
+                zip(self.aggregations, self.value_readers)):
+            states[index] = function.update(states[index], read(event))
+
+    def merge(self, partial: dict) -> None:
+        """Merges a partial states event (see :meth:`partials`).
+
+        :param partial: Partial states event
+        """
+        partial = partial['meta'][self.partial_field]
+        states = self.group(partial['by'])
+        for index, ((_, function, _), other) in enumerate(
+                zip(self.aggregations, partial['states'])):
+            states[index] = function.merge(states[index], function.load(other))
+
+    def add(self, event: dict) -> None:
+        """Accounts a raw event or merges a partial states event.
+
+        :param event: Source event
+        """
+        if self.partial_field in event.get('meta', {}):
+            self.merge(event)
+        else:
+            self.update(event)
+
+    def partials(self):
+        """Yields (and removes) the groups partial states, as events.
+
+        The states are stored in the events meta.
+        """
+        groups, self.groups = self.groups, {}
+        for values, states in groups.values():
+            yield Event(data={}, meta={
+                self.partial_field: {
+                    'by': values,
+                    'states': [
+                        function.dump(state)
+                        for (_, function, _), state in zip(self.aggregations, states)
+                    ]
+                }
+            })
+
+    def results(self):
+        """Yields (and removes) the groups final results, as events.
+        """
+        groups, self.groups = self.groups, {}
+        for values, states in groups.values():
+            data = dict(zip(self.by, values))
+            for (name, function, _), state in zip(self.aggregations, states):
+                data[name] = function.finalize(state)
+            yield Event(data=data)
+
+
+# Registers the approximate aggregators
+import m42pl.utils.sketches # pylint: disable=wrong-import-position
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import sys
+from copy import deepcopy
+from time import monotonic
+from collections import OrderedDict
+
+from typing import Any, Hashable
+
+from m42pl.event import content_digest
+
+
+# Immutable values, returned without copy
+IMMUTABLE = (str, int, float, bool, bytes, type(None))
+
+
+def sizeof(value: Any) -> int:
+    """Returns an approximation of a value's memory size, in bytes.
+
+    Lists, tuples, sets and dicts are measured with their items.
+
+    :param value: Value to measure
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sizeof(key) + sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sizeof(item) for item in value)
+    return size
+
+
+class ResultsCache:
+    """Memoizes the results of a sub-pipeline.
+
+    The results are keyed on a set of input fields (see :attr:`fields`)
+    or, if no fields are declared, on a hash of the whole event data.
+
+    Entries are evicted when:
+
+    * They are older than :attr:`ttl` seconds
+    * The cache holds more than :attr:`size` entries (least recently
+      used first)
+    * The cache holds more than :attr:`memory` bytes (least recently
+      used first); The entries sizes are estimated (see :func:`sizeof`)
+
+    The cached values are copied when stored and when returned, to
+    prevent their modifications by the callers.
+
+    :ivar fields: Input fields names (see :mod:`m42pl.fields`), or
+        ``None`` to key the results on the event data
+    :ivar size: Maximum number of entries
+    :ivar ttl: Entries time to live, in seconds, or ``None`` for no
+        expiration
+    :ivar memory: Maximum memory size, in bytes
+    :ivar hits: Number of cache hits
+    :ivar misses: Number of cache misses
+    :ivar evictions: Number of entries evicted to honor the size or
+        memory limits
+    :ivar expirations: Number of expired entries
+    :ivar used: Current memory size, in bytes
+    """
+
+    def __init__(self, fields: list[str]|None = None, size: int = 4096,
+                    ttl: float|None = None, memory: int = 64 * 1024 * 1024):
+        """
+        :param fields: Input fields names, or ``None`` to key the
+            results on the event data
+        :param size: Maximum number of entries
+        :param ttl: Entries time to live, in seconds, or ``None`` for
+            no expiration
+        :param memory: Maximum memory size, in bytes
+        """
+        # Imported here as m42pl.fields imports m42pl.pipeline
+        from m42pl.fields import Field
+        if size < 1:
+            raise Exception((
+                f'invalid cache size: size="{size}", '
+                f'reason="Size should be >= 1"'
+            ))
+        if ttl is not None and ttl <= 0:
+            raise Exception((
+                f'invalid cache ttl: ttl="{ttl}", '
+                f'reason="TTL should be > 0"'
+            ))
+        self.fields = fields
+        self.size = size
+        self.ttl = ttl
+        self.memory = memory
+        self.readers = fields and [Field(name).reader for name in fields] or None
+        if self.readers is not None and None in self.readers:
+            raise Exception((
+                f'invalid cache fields: fields="{fields}", '
+                f'reason="Fields should be readable synchronously"'
+            ))
+        self.entries = OrderedDict() # type: OrderedDict[Hashable, tuple]
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def key(self, event: dict) -> Hashable:
+        """Returns an event's cache key.
+
+        :param event: Source event
+        """
+        if self.readers is None:
+            values = event and event.get('data', {}) or {}
+        else:
+            values = tuple(reader(event) for reader in self.readers)
+            try:
+                hash(values)
+                return values
+            except TypeError:
+                pass
+        return content_digest(values)
+
+    @staticmethod
+    def copy(value: Any) -> Any:
+        """Returns a copy of a mutable value.
+        """
+        if isinstance(value, IMMUTABLE):
+            return value
+        return deepcopy(value)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Returns a cached value.
+
+        :param key: Cache key (see :meth:`key`)
+        :return: A tuple ``(hit, value)``
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            value, size, expires = entry
+            if expires is None or expires > monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, self.copy(value)
+            self.remove(key)
+            self.expirations += 1
+        self.misses += 1
+        return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Caches a value.
+
+        :param key: Cache key (see :meth:`key`)
+        :param value: Value to cache
+        """
+        size = sizeof(value)
+        if size > self.memory:
+            return
+        if key in self.entries:
+            self.remove(key)
+        self.entries[key] = (
+            self.copy(value),
+            size,
+            self.ttl is not None and monotonic() + self.ttl or None
+        )
+        self.used += size
+        while len(self.entries) > self.size or self.used > self.memory:
+            self.remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def remove(self, key: Hashable) -> None:
+        """Removes a cached value.
+
+        :param key: Cache key
+        """
+        _, size, _ = self.entries.pop(key)
+        self.used -= size
+
+    def clear(self) -> None:
+        """Removes all the cached values.
+        """
+        self.entries.clear()
+        self.used = 0
+
+    def to_dict(self) -> dict:
+        """Returns the cache counters as a :class:`dict`.
+        """
+        return {
+            'entries': len(self.entries),
+            'used': self.used,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
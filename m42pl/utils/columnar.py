@@ -0,0 +1,850 @@
+from __future__ import annotations
+
+import ast
+import asyncio
+
+from typing import Any
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Unsupported(Exception):
+    """Raised by :class:`ColumnarEvaluator` when an expression (or a
+    batch) cannot be evaluated using NumPy.
+    """
+    pass
+
+
+# Missing field placeholder
+MISSING = object()
+
+
+class ColumnarEvaluator:
+    """Evaluates a numeric expression over a batch of events fields
+    using NumPy arrays.
+
+    The evaluator extracts the fields referenced by the expression
+    into NumPy arrays (one per field) and evaluates the expression on
+    all the events at once. It supports:
+
+    * Fields (``name``, ``name.key``, ``name['key']``) holding `int`
+      or `float` values
+    * Numeric constants
+    * Arithmetic operations (``+``, ``-``, ``*``, ``/``, ``%``),
+      comparisons, boolean operations, unary operations and
+      conditional expressions
+    * The functions ``round``, ``even``, ``toint``, ``tofloat``,
+      ``length`` and ``isnull``
+
+    The results are the same as :class:`m42pl.utils.eval.Evaluator`'s
+    ones (including the fields casting rules); The rows which cannot
+    be evaluated this way (e.g. missing fields, mixed types, division
+    by zero, integer overflows) are returned as *fallback* rows, to be
+    evaluated one by one.
+
+    The evaluator raises :class:`Unsupported` on unsupported
+    expressions, and on batches whose operands types do not match
+    (e.g. a boolean operation between an `int` and a `float`).
+
+    NumPy is an optional dependency; The evaluator raises
+    :class:`Unsupported` if it is not installed.
+
+    :ivar expression: Source expression
+    :ivar columns: Referenced fields, as ``(path, usage)`` tuples
+    :ivar called: Called functions names
+    """
+
+    # Vectorized functions and aliases
+    functions = {
+        'round':    'round',
+        'even':     'even',
+        'toint':    'toint',
+        'tofloat':  'tofloat',
+        'length':   'length',
+        'len':      'length',
+        'isnull':   'isnull',
+        'isnone':   'isnull',
+    }
+
+    # Functions reading their argument field directly
+    column_functions = ('length', 'isnull')
+
+    # Casting operators
+    arithmetic = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod)
+    comparisons = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+    # Largest integers safely represented by a float
+    exact_float = 2 ** 53
+
+    def __init__(self, expression: str):
+        """
+        :param expression: Python expression
+        """
+        if numpy is None:
+            raise Unsupported('numpy is not installed')
+        self.expression = expression
+        self.tree = ast.parse(expression, mode='eval').body
+        self.columns = [] # type: list[tuple[tuple, str]]
+        self.called = set() # type: set[str]
+        self.check(self.tree)
+
+    @staticmethod
+    def path(node: ast.AST) -> tuple|None:
+        """Returns a field node's path, or `None` if the node is not a
+        field.
+
+        :param node: Expression node
+        """
+        if isinstance(node, ast.Name):
+            return (node.id, )
+        elif isinstance(node, ast.Attribute):
+            parent = ColumnarEvaluator.path(node.value)
+            return parent is not None and parent + (node.attr, ) or None
+        elif isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Constant):
+            parent = ColumnarEvaluator.path(node.value)
+            return parent is not None and parent + (node.slice.value, ) or None
+        return None
+
+    def column(self, path: tuple, usage: str) -> None:
+        """Registers a referenced field.
+
+        :param path: Field path
+        :param usage: Field usage (`value`, `length` or `isnull`)
+        """
+        if (path, usage) not in self.columns:
+            self.columns.append((path, usage))
+
+    def check(self, node: ast.AST) -> None:
+        """Checks that an expression node is supported and registers
+        its fields.
+
+        :param node: Expression node
+        """
+        path = self.path(node)
+        if path is not None:
+            self.column(path, 'value')
+        elif isinstance(node, ast.Constant):
+            if type(node.value) not in (int, float):
+                raise Unsupported(f'constant {node.value!r}')
+        elif isinstance(node, ast.BinOp):
+            if not isinstance(node.op, self.arithmetic):
+                raise Unsupported(type(node.op).__name__)
+            self.check(node.left)
+            self.check(node.right)
+        elif isinstance(node, ast.Compare):
+            if not all(isinstance(op, self.comparisons) for op in node.ops):
+                raise Unsupported('Compare')
+            for operand in [node.left, ] + node.comparators:
+                self.check(operand)
+        elif isinstance(node, ast.BoolOp):
+            for value in node.values:
+                self.check(value)
+        elif isinstance(node, ast.UnaryOp):
+            self.check(node.operand)
+        elif isinstance(node, ast.IfExp):
+            for item in (node.test, node.body, node.orelse):
+                self.check(item)
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) \
+                    or node.func.id not in self.functions \
+                    or node.keywords:
+                raise Unsupported('Call')
+            function = self.functions[node.func.id]
+            self.called.add(node.func.id)
+            if function == 'round':
+                if len(node.args) != 2 \
+                        or not isinstance(node.args[1], ast.Constant) \
+                        or type(node.args[1].value) is not int:
+                    raise Unsupported('round')
+                self.check(node.args[0])
+            elif len(node.args) != 1:
+                raise Unsupported(function)
+            elif function in self.column_functions:
+                path = self.path(node.args[0])
+                if path is None:
+                    raise Unsupported(function)
+                self.column(path, function)
+            else:
+                self.check(node.args[0])
+        else:
+            raise Unsupported(type(node).__name__)
+
+    # ---
+
+    @staticmethod
+    def lookup(row: dict, path: tuple) -> Any:
+        """Returns a row's field value, or :data:`MISSING`.
+
+        :param row: Event fields
+        :param path: Field path
+        """
+        value = row
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                return MISSING
+            value = value[key]
+        return value
+
+    def values(self, rows: list[dict], path: tuple) -> list:
+        """Returns a field's values, or :data:`MISSING`.
+
+        :param rows: Events fields
+        :param path: Field path
+        """
+        if len(path) == 1:
+            key = path[0]
+            try:
+                return [row.get(key, MISSING) for row in rows]
+            except AttributeError:
+                pass
+        return [self.lookup(row, path) for row in rows]
+
+    def extract(self, rows: list[dict]) -> tuple[dict, Any]:
+        """Extracts the referenced fields into NumPy arrays.
+
+        :param rows: Events fields
+        :return: A tuple `(columns, valid)` where `columns` maps the
+            `(path, usage)` tuples to arrays, and `valid` is the mask
+            of the rows which can be evaluated using NumPy
+        """
+        size = len(rows)
+        valid = numpy.ones(size, dtype=bool)
+        # Rows shadowing the called functions are evaluated row by row
+        if self.called:
+            valid &= numpy.fromiter(
+                (
+                    not isinstance(row, dict)
+                    or not any(name in row for name in self.called)
+                    for row in rows
+                ),
+                dtype=bool,
+                count=size
+            )
+        columns = {}
+        for path, usage in self.columns:
+            values = self.values(rows, path)
+            if usage == 'isnull':
+                valid &= numpy.fromiter((value is not MISSING for value in values), dtype=bool, count=size)
+                columns[(path, usage)] = numpy.fromiter((value is None for value in values), dtype=bool, count=size)
+            elif usage == 'length':
+                lengths = []
+                for value in values:
+                    try:
+                        lengths.append(value is not MISSING and len(value) or 0)
+                    except TypeError:
+                        lengths.append(-1)
+                    if value is MISSING:
+                        lengths[-1] = -1
+                column = numpy.array(lengths, dtype=numpy.int64)
+                valid &= column >= 0
+                columns[(path, usage)] = column
+            else:
+                columns[(path, usage)] = self.numeric(values, valid)
+        return columns, valid
+
+    @staticmethod
+    def numeric(values: list, valid):
+        """Returns a numeric field's values as an array, and unsets the
+        `valid` mask of the non-numeric values.
+
+        When a field holds both `int` and `float` values, the minority
+        type is evaluated row by row.
+
+        :param values: Field values
+        :param valid: Valid rows mask
+        """
+        kinds = set(map(type, values))
+        if kinds == {int, }:
+            try:
+                return numpy.array(values, dtype=numpy.int64)
+            except OverflowError:
+                pass
+        elif kinds == {float, }:
+            return numpy.array(values, dtype=numpy.float64)
+        kinds = list(map(type, values))
+        if kinds.count(int) >= kinds.count(float):
+            mask = [
+                type(value) is int and -2 ** 63 <= value < 2 ** 63
+                for value in values
+            ]
+        else:
+            mask = [type(value) is float for value in values]
+        valid &= numpy.array(mask, dtype=bool)
+        return numpy.array(
+            [ok and value or 0 for ok, value in zip(mask, values)],
+            dtype=kinds.count(int) >= kinds.count(float) and numpy.int64 or numpy.float64
+        )
+
+    def __call__(self, rows: list[dict]) -> tuple[list, list[int]]:
+        """Evaluates the expression over a batch of events fields.
+
+        :param rows: Events fields
+        :return: A tuple `(results, fallback)` where `results` holds
+            the result of each row, and `fallback` lists the indexes
+            of the rows which must be evaluated one by one
+        """
+        results = [None, ] * len(rows)
+        columns, valid = self.extract(rows)
+        indexes = numpy.flatnonzero(valid)
+        if len(indexes):
+            columns = {key: column[indexes] for key, column in columns.items()}
+            invalid = numpy.zeros(len(indexes), dtype=bool)
+            try:
+                with numpy.errstate(all='ignore'):
+                    values, _ = Batch(self, columns, invalid).evaluate(self.tree)
+            except Unsupported:
+                return results, list(range(len(rows)))
+            if len(indexes) == len(rows) and not invalid.any():
+                return values.tolist(), []
+            for index, value in zip(indexes[~invalid].tolist(), values[~invalid].tolist()):
+                results[index] = value
+            valid[indexes[invalid]] = False
+        return results, numpy.flatnonzero(~valid).tolist()
+
+
+class Batch:
+    """Evaluation of an expression over a batch of rows.
+
+    The nodes are evaluated into `(array, field)` tuples, where `array`
+    is an `int64`, `float64` or `bool` NumPy array, and `field` is
+    `True` if the node is a field (see
+    :class:`m42pl.utils.eval.Compiler` for the fields casting rules).
+
+    :ivar evaluator: Parent evaluator
+    :ivar columns: Fields arrays
+    :ivar invalid: Mask of the rows to evaluate one by one
+    """
+
+    def __init__(self, evaluator: ColumnarEvaluator, columns: dict, invalid):
+        self.evaluator = evaluator
+        self.columns = columns
+        self.invalid = invalid
+        self.size = len(invalid)
+
+    def evaluate(self, node: ast.AST) -> tuple[Any, bool]:
+        """Evaluates an expression node.
+
+        :param node: Expression node
+        """
+        path = self.evaluator.path(node)
+        if path is not None:
+            return self.columns[(path, 'value')], True
+        return getattr(self, f'evaluate_{type(node).__name__}')(node), False
+
+    # ---
+
+    @staticmethod
+    def kind(array) -> type:
+        """Returns an array's Python type.
+        """
+        if array.dtype == bool:
+            return bool
+        elif array.dtype == numpy.int64:
+            return int
+        return float
+
+    @staticmethod
+    def numeric(array):
+        """Returns an array suitable for arithmetic (booleans are
+        integers).
+        """
+        if array.dtype == bool:
+            return array.astype(numpy.int64)
+        return array
+
+    @staticmethod
+    def truth(array):
+        """Returns an array's truth values.
+        """
+        if array.dtype == bool:
+            return array
+        return array != 0
+
+    def cast(self, array, kind: type):
+        """Casts an array to a Python type, as `kind(value)` does.
+
+        :param array: Source array
+        :param kind: Target type
+        """
+        if self.kind(array) is kind:
+            return array
+        elif kind is bool:
+            return array != 0
+        elif kind is float:
+            return array.astype(numpy.float64)
+        elif array.dtype == numpy.float64:
+            self.invalid |= ~numpy.isfinite(array) | (numpy.abs(array) >= 2 ** 63)
+            return numpy.where(self.invalid, 0, numpy.trunc(array)).astype(numpy.int64)
+        return array.astype(numpy.int64)
+
+    def operands(self, left: ast.AST, right: ast.AST) -> tuple:
+        """Evaluates and casts the operands of a binary operation.
+
+        :param left: Left operand node
+        :param right: Right operand node
+        """
+        (lvalue, lfield), (rvalue, rfield) = self.evaluate(left), self.evaluate(right)
+        if lfield and rfield:
+            rvalue = self.cast(rvalue, self.kind(lvalue))
+        elif lfield:
+            lvalue = self.cast(lvalue, self.kind(rvalue))
+        elif rfield:
+            rvalue = self.cast(rvalue, self.kind(lvalue))
+        return lvalue, rvalue
+
+    def inexact(self, lvalue, rvalue) -> None:
+        """Invalidates the rows where an `int` operand would be
+        compared to a `float` while not being exactly representable
+        as a `float` (Python compares them exactly).
+        """
+        for value, other in ((lvalue, rvalue), (rvalue, lvalue)):
+            if value.dtype == numpy.int64 and other.dtype != numpy.int64:
+                self.invalid |= numpy.abs(value) > self.evaluator.exact_float
+
+    def arithmetic(self, op: ast.AST, lvalue, rvalue):
+        """Applies an arithmetic operator.
+        """
+        lvalue, rvalue = self.numeric(lvalue), self.numeric(rvalue)
+        integers = lvalue.dtype == numpy.int64 and rvalue.dtype == numpy.int64
+        if isinstance(op, ast.Add):
+            result = lvalue + rvalue
+            if integers:
+                self.invalid |= ((lvalue ^ result) & (rvalue ^ result)) < 0
+            return result
+        elif isinstance(op, ast.Sub):
+            result = lvalue - rvalue
+            if integers:
+                self.invalid |= ((lvalue ^ rvalue) & (lvalue ^ result)) < 0
+            return result
+        elif isinstance(op, ast.Mult):
+            if integers:
+                self.invalid |= numpy.abs(lvalue.astype(numpy.float64) * rvalue) >= 2 ** 62
+            return lvalue * rvalue
+        # Division and modulo
+        self.invalid |= rvalue == 0
+        if integers:
+            self.invalid |= (numpy.abs(lvalue) > self.evaluator.exact_float) \
+                            | (numpy.abs(rvalue) > self.evaluator.exact_float)
+            rvalue = numpy.where(rvalue == 0, 1, rvalue)
+        if isinstance(op, ast.Div):
+            return numpy.true_divide(lvalue, rvalue)
+        return numpy.remainder(lvalue, rvalue)
+
+    def same(self, *arrays):
+        """Checks that arrays have the same type.
+        """
+        if len(set(array.dtype for array in arrays)) > 1:
+            raise Unsupported('mixed types')
+
+    # ---
+
+    def evaluate_Constant(self, node: ast.Constant):
+        return numpy.full(
+            self.size,
+            node.value,
+            dtype=type(node.value) is int and numpy.int64 or numpy.float64
+        )
+
+    def evaluate_BinOp(self, node: ast.BinOp):
+        lvalue, rvalue = self.operands(node.left, node.right)
+        return self.arithmetic(node.op, lvalue, rvalue)
+
+    def evaluate_Compare(self, node: ast.Compare):
+        result = numpy.ones(self.size, dtype=bool)
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            lvalue, rvalue = self.operands(left, right)
+            if self.kind(lvalue) is not bool or self.kind(rvalue) is not bool:
+                lvalue, rvalue = self.numeric(lvalue), self.numeric(rvalue)
+                self.inexact(lvalue, rvalue)
+            if isinstance(op, ast.Eq):
+                result &= lvalue == rvalue
+            elif isinstance(op, ast.NotEq):
+                result &= lvalue != rvalue
+            elif isinstance(op, ast.Lt):
+                result &= lvalue < rvalue
+            elif isinstance(op, ast.LtE):
+                result &= lvalue <= rvalue
+            elif isinstance(op, ast.Gt):
+                result &= lvalue > rvalue
+            else:
+                result &= lvalue >= rvalue
+            left = right
+        return result
+
+    def evaluate_BoolOp(self, node: ast.BoolOp):
+        values = [self.evaluate(value)[0] for value in node.values]
+        self.same(*values)
+        result = values[-1]
+        for value in reversed(values[:-1]):
+            if isinstance(node.op, ast.And):
+                result = numpy.where(self.truth(value), result, value)
+            else:
+                result = numpy.where(self.truth(value), value, result)
+        return result
+
+    def evaluate_UnaryOp(self, node: ast.UnaryOp):
+        value, _ = self.evaluate(node.operand)
+        if isinstance(node.op, ast.Not):
+            return ~self.truth(value)
+        value = self.numeric(value)
+        if isinstance(node.op, ast.UAdd):
+            return value
+        elif isinstance(node.op, ast.USub):
+            if value.dtype == numpy.int64:
+                self.invalid |= value == numpy.iinfo(numpy.int64).min
+            return -value
+        if value.dtype != numpy.int64:
+            raise Unsupported('Invert')
+        return ~value
+
+    def evaluate_IfExp(self, node: ast.IfExp):
+        test, _ = self.evaluate(node.test)
+        body, _ = self.evaluate(node.body)
+        orelse, _ = self.evaluate(node.orelse)
+        self.same(body, orelse)
+        return numpy.where(self.truth(test), body, orelse)
+
+    def evaluate_Call(self, node: ast.Call):
+        function = self.evaluator.functions[node.func.id]
+        if function in self.evaluator.column_functions:
+            return self.columns[(self.evaluator.path(node.args[0]), function)]
+        value = self.numeric(self.evaluate(node.args[0])[0])
+        if function == 'even':
+            return numpy.remainder(value, 2) == 0
+        elif function == 'toint':
+            return self.cast(value, int)
+        elif function == 'tofloat':
+            return self.cast(value, float)
+        # round
+        digits = node.args[1].value
+        if value.dtype == numpy.int64 and digits >= 0:
+            return value
+        elif value.dtype == numpy.float64 and digits == 0:
+            return numpy.round(value)
+        rounded = numpy.frompyfunc(lambda value: round(value, digits), 1, 1)(value.tolist())
+        return numpy.array(rounded.tolist(), dtype=value.dtype)
+
+
+class Column:
+    """Buffered values of an event field, stored by chunks.
+
+    Each chunk is encoded according to its values types:
+
+    * ``int``, ``float`` and ``bool`` values as NumPy typed arrays
+    * ``str`` values as dictionary codes (``int32`` array); The
+      dictionary is shared by all the chunks
+    * Mixed or other values as NumPy object arrays
+
+    :ivar name: Field name
+    :ivar chunks: Encoded chunks, as ``(kind, array, present)`` tuples,
+        where ``kind`` is the values type (or ``object``), and
+        ``present`` is the mask of the rows holding the field (or
+        ``None`` if all rows hold it); ``None`` for the chunks in which
+        the field is absent
+    :ivar pending: Values of the rows not yet encoded (:data:`MISSING`
+        for the rows without the field)
+    :ivar codes: Strings dictionary codes
+    :ivar strings: Strings dictionary values
+    """
+
+    def __init__(self, name: str, chunks: int, rows: int):
+        """
+        :param name: Field name
+        :param chunks: Number of chunks already encoded
+        :param rows: Number of rows not yet encoded
+        """
+        self.name = name
+        self.chunks = [None, ] * chunks # type: list[tuple|None]
+        self.pending = [MISSING, ] * rows
+        self.codes = {} # type: dict[str, int]
+        self.strings = [] # type: list[str]
+
+    @staticmethod
+    def objects(values: list):
+        """Returns a NumPy object array holding the values as-is (e.g.
+        without converting the lists into nested arrays).
+
+        :param values: Values list
+        """
+        array = numpy.empty(len(values), dtype=object)
+        for index, value in enumerate(values):
+            array[index] = value
+        return array
+
+    def freeze(self) -> None:
+        """Encodes the pending values as a new chunk.
+        """
+        values, self.pending = self.pending, []
+        present = None
+        if MISSING in values:
+            present = numpy.fromiter((value is not MISSING for value in values),
+                                        dtype=bool, count=len(values))
+            if not present.any():
+                self.chunks.append(None)
+                return
+        kinds = set(type(value) for value in values) - {type(MISSING), }
+        kind = len(kinds) == 1 and kinds.pop() or object
+        array = None
+        if kind is int:
+            try:
+                array = numpy.array([0 if value is MISSING else value
+                                        for value in values], dtype=numpy.int64)
+            except OverflowError:
+                kind = object
+        elif kind is float:
+            array = numpy.array([0.0 if value is MISSING else value
+                                    for value in values], dtype=numpy.float64)
+        elif kind is bool:
+            array = numpy.array([value is True for value in values], dtype=bool)
+        elif kind is str:
+            codes, strings = self.codes, self.strings
+            array = numpy.empty(len(values), dtype=numpy.int32)
+            for index, value in enumerate(values):
+                if value is MISSING:
+                    array[index] = -1
+                    continue
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(strings)
+                    strings.append(value)
+                array[index] = code
+        if array is None:
+            kind = object
+            array = self.objects([None if value is MISSING else value
+                                    for value in values])
+        self.chunks.append((kind, array, present))
+
+    def decode(self, chunk: tuple|None, size: int) -> list:
+        """Returns a chunk's values as a list (:data:`MISSING` for the
+        rows without the field).
+
+        :param chunk: Encoded chunk
+        :param size: Chunk size
+        """
+        if chunk is None:
+            return [MISSING, ] * size
+        kind, array, present = chunk
+        if kind is str:
+            strings = self.strings
+            values = [strings[code] for code in array.tolist()]
+        else:
+            values = array.tolist()
+        if present is not None:
+            values = [
+                value if ok else MISSING
+                for ok, value in zip(present.tolist(), values)
+            ]
+        return values
+
+
+class ColumnView:
+    """Read-only view of a buffered field's values.
+
+    :ivar name: Field name
+    :ivar kind: Values type (``int``, ``float``, ``bool``, ``str``) or
+        ``object`` for mixed or other types
+    :ivar present: Mask of the rows holding the field
+    :ivar values: Values array; Typed for the numeric and boolean
+        fields, object array otherwise; The rows without the field hold
+        ``0``, ``False`` or ``None``
+    :ivar codes: Dictionary codes of the string fields (``-1`` for the
+        rows without the field), or ``None``
+    :ivar dictionary: Strings dictionary of the string fields (see
+        :attr:`codes`), or ``None``
+    """
+
+    def __init__(self, column: Column, sizes: list[int]):
+        """
+        :param column: Buffered column
+        :param sizes: Chunks sizes
+        """
+        self.name = column.name
+        chunks = list(zip(column.chunks, sizes))
+        kinds = set(chunk[0] for chunk, _ in chunks if chunk is not None)
+        self.kind = len(kinds) == 1 and kinds.pop() or object
+        self.present = numpy.concatenate([numpy.zeros(0, dtype=bool), ] + [
+            numpy.zeros(size, dtype=bool) if chunk is None
+            else numpy.ones(size, dtype=bool) if chunk[2] is None
+            else chunk[2]
+            for chunk, size in chunks
+        ])
+        self.codes, self.dictionary = None, None
+        if self.kind is str:
+            self.codes = numpy.concatenate([
+                numpy.full(size, -1, dtype=numpy.int32) if chunk is None
+                else chunk[1]
+                for chunk, size in chunks
+            ])
+            self.dictionary = Column.objects(column.strings)
+            self.values = numpy.full(len(self.codes), None, dtype=object)
+            self.values[self.present] = self.dictionary[self.codes[self.present]]
+        elif self.kind is object:
+            self.values = Column.objects([
+                None if value is MISSING else value
+                for chunk, size in chunks
+                for value in column.decode(chunk, size)
+            ])
+        else:
+            self.values = numpy.concatenate([
+                numpy.zeros(size, dtype=self.kind) if chunk is None
+                else chunk[1]
+                for chunk, size in chunks
+            ])
+
+    def __len__(self) -> int:
+        return len(self.present)
+
+
+class ColumnarQueue:
+    """Events queue storing the events fields as typed columns (see
+    :class:`Column`).
+
+    The queue implements the same API as
+    :class:`m42pl.commands.buffering.DequeQueue`. The events fields are
+    encoded by chunks of :attr:`chunk_size` rows; The events are
+    rebuilt only when they are read (see :meth:`get_nowait` and
+    :meth:`rows`), and their fields are then ordered by column. The
+    buffered fields may be read as arrays without rebuilding the
+    events (see :meth:`column`).
+
+    Only the top-level fields are split into columns; The nested
+    values are stored as-is in object columns. The events ``meta`` and
+    ``sign`` are stored as-is.
+
+    NumPy is an optional dependency; The queue raises an error if it is
+    not installed.
+
+    :ivar maxsize: Maximum number of events (``0`` for no limit)
+    :ivar chunk_size: Number of rows per chunk
+    :ivar columns: Columns, per field name
+    :ivar sizes: Encoded chunks sizes
+    :ivar metas: Events ``meta`` and ``sign``, as tuples
+    :ivar head: Index of the next row to read
+    """
+
+    def __init__(self, maxsize: int = 0, chunk_size: int = 4096):
+        """
+        :param maxsize: Maximum number of events (``0`` for no limit)
+        :param chunk_size: Number of rows per chunk
+        """
+        if numpy is None:
+            raise Exception((
+                f'cannot create columnar queue: '
+                f'reason="NumPy is not installed"'
+            ))
+        self.maxsize = maxsize
+        self.chunk_size = max(1, chunk_size)
+        self.reset()
+
+    def reset(self) -> None:
+        """Drops the buffered events.
+        """
+        self.columns = {} # type: dict[str, Column]
+        self.sizes = [] # type: list[int]
+        self.pending = 0
+        self.metas = [] # type: list[tuple]
+        self.head = 0
+        # Decoded chunk being read, as (index, start, rows)
+        self.reading = None # type: tuple|None
+
+    def freeze(self) -> None:
+        """Encodes the pending rows.
+        """
+        if self.pending:
+            for column in self.columns.values():
+                column.freeze()
+            self.sizes.append(self.pending)
+            self.pending = 0
+
+    def qsize(self) -> int:
+        return len(self.metas) - self.head
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self.qsize()
+
+    def put_nowait(self, item: dict) -> None:
+        columns, pending = self.columns, self.pending
+        for name, value in item.get('data', {}).items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = Column(name, len(self.sizes), pending)
+            column.pending.append(value)
+        self.pending = pending = pending + 1
+        for column in columns.values():
+            if len(column.pending) < pending:
+                column.pending.append(MISSING)
+        self.metas.append((item.get('meta', {}), item.get('sign')))
+        if pending >= self.chunk_size:
+            self.freeze()
+
+    async def put(self, item: dict) -> None:
+        self.put_nowait(item)
+
+    def decode(self, index: int) -> list[dict]:
+        """Rebuilds a chunk's events data.
+
+        :param index: Chunk index
+        """
+        size = self.sizes[index]
+        rows = [{} for _ in range(size)]
+        for name, column in self.columns.items():
+            values = column.decode(column.chunks[index], size)
+            for row, value in zip(rows, values):
+                if value is not MISSING:
+                    row[name] = value
+        return rows
+
+    def get_nowait(self) -> dict:
+        if self.head >= len(self.metas):
+            raise asyncio.QueueEmpty()
+        self.freeze()
+        # Decode the chunk holding the next row
+        if self.reading is None or self.head >= self.reading[1] + len(self.reading[2]):
+            index = 0 if self.reading is None else self.reading[0] + 1
+            start = sum(self.sizes[:index])
+            while start + self.sizes[index] <= self.head:
+                start += self.sizes[index]
+                index += 1
+            self.reading = (index, start, self.decode(index))
+        _, start, rows = self.reading
+        meta, sign = self.metas[self.head]
+        data = rows[self.head - start]
+        self.head += 1
+        if self.head >= len(self.metas):
+            self.reset()
+        return {'data': data, 'meta': meta, 'sign': sign}
+
+    async def get(self) -> dict:
+        return self.get_nowait()
+
+    def names(self) -> list[str]:
+        """Returns the buffered fields names.
+        """
+        return list(self.columns)
+
+    def column(self, name: str) -> ColumnView|None:
+        """Returns a view of a buffered field's values, or ``None`` if
+        no buffered event holds the field.
+
+        The view covers all the buffered events, including the already
+        read ones.
+
+        :param name: Field name
+        """
+        self.freeze()
+        if name not in self.columns:
+            return None
+        return ColumnView(self.columns[name], self.sizes)
+
+    def rows(self):
+        """Yields (and removes) the buffered events.
+        """
+        while not self.empty():
+            yield self.get_nowait()
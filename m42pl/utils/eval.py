@@ -1,23 +1,35 @@
 from __future__ import annotations
 
+import ast
+import logging
 import ntpath
+import operator
 import regex
 import os
 
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Callable
 
-from .time import now, reltime, strftime, strptime
+from .time import now, reltime, strftime, strptime, compile_strptime
+
+
+logger = logging.getLogger('m42pl.utils.eval')
 
 
 class Undefined:
     """Undefined value placeholder.
 
-    To be returned by EvalNS when no matching field is found.
+    To be returned by EvalNS when no matching field is found. An
+    undefined value is false (e.g. `not field` is `True` if `field`
+    is not found).
     """
 
     def __init__(self, *args, **kwargs):
         pass
 
+    def __bool__(self):
+        return False
+
     def __getitem__(self, *args):
         return self
 
@@ -73,6 +85,9 @@ class EvalNS(dict):
         # Returns the requested fields
         elif name == self_name:
             return self_fields
+        # Returns the current fields keys
+        elif name == 'keys':
+            return lambda field = self_fields: list(solve(field).keys())
         # Returns the requested functions
         elif name in self_functions:
             return self_functions[name]
@@ -89,6 +104,49 @@ class EvalNS(dict):
         if isinstance(other, EvalNS):
             return super().__getattribute__('fields')
         return type(other)(super().__getattribute__('fields'))
+
+    def __value__(self, other = None):
+        """Returns the fields value and the other operand's value
+        (operators which do not cast their operands).
+        """
+        if isinstance(other, EvalNS):
+            other = super(EvalNS, other).__getattribute__('fields')
+        return super().__getattribute__('fields'), other
+
+    def __bool__(self):
+        return bool(super().__getattribute__('fields'))
+
+    def __contains__(self, other):
+        fields, other = super().__getattribute__('__value__')(other)
+        return other in fields
+
+    def __iter__(self):
+        return iter(super().__getattribute__('fields'))
+
+    def __neg__(self):
+        return -super().__getattribute__('fields')
+
+    def __pos__(self):
+        return +super().__getattribute__('fields')
+
+    def __invert__(self):
+        return ~super().__getattribute__('fields')
+
+    def __floordiv__(self, other):
+        fields, other = super().__getattribute__('__value__')(other)
+        return fields // other
+
+    def __rfloordiv__(self, other):
+        fields, other = super().__getattribute__('__value__')(other)
+        return other // fields
+
+    def __pow__(self, other):
+        fields, other = super().__getattribute__('__value__')(other)
+        return fields ** other
+
+    def __rpow__(self, other):
+        fields, other = super().__getattribute__('__value__')(other)
+        return other ** fields
     
     def __add__(self, other):
         return super().__getattribute__('__cast__')(other) + other
@@ -142,6 +200,23 @@ class EvalNS(dict):
         return super().__getattribute__('__cast__')(other) >= other
 
 
+class Value:
+    """Field value given to a function by a compiled expression.
+
+    This is the :class:`Compiler` counterpart of :class:`EvalNS`: like
+    a field read through :class:`EvalNS`, a :class:`Value` is returned
+    as-is by :func:`solve`, whatever the expected types are.
+    """
+
+    __slots__ = ('value', )
+
+    def __init__(self, value: Any):
+        """
+        :param value: Field value
+        """
+        self.value = value
+
+
 def solve(attr, types: tuple|list = (), *args):
     """Resolves an attribute returned by :class:`EvalNS`.
 
@@ -153,6 +228,8 @@ def solve(attr, types: tuple|list = (), *args):
     # return the result.
     if isinstance(attr, EvalNS):
         return super(EvalNS, attr).__getattribute__('fields')
+    elif type(attr) is Value:
+        return attr.value
     # If the attribute match one of the expected types, return it.
     # Otherwise, return the default value `args[0]` or `None` if no
     # default is given.
@@ -174,6 +251,465 @@ def solve(attr, types: tuple|list = (), *args):
     return attr
 
 
+class Uncompilable(Exception):
+    """Raised by :class:`Compiler` when an expression cannot be
+    compiled.
+    """
+    pass
+
+
+class Compiler:
+    """Compiles a (simplified) Python expression into a closure.
+
+    The closure takes the event fields (a `dict`) and returns the
+    expression's result. It reads the fields directly from the event
+    and follows the :class:`EvalNS` semantics:
+
+    * A name, attribute or key which is not found is :class:`Undefined`
+    * A *field* (i.e. a name, attribute or key read from the event)
+      used in an arithmetic operation, a comparison or an `in` test
+      against a list is cast to the type of the other operand
+    * A field named after a function shadows the function
+    * A field given to a function is wrapped in a :class:`Value`
+
+    The fields are tested (e.g. `not field`, `field and other`) and
+    negated on their values, as with :class:`EvalNS`; A missing field
+    is false. Unlike :class:`EvalNS`, the fields are plain values:
+    they can be compared by identity (e.g. `field is None`, which
+    is `False` for a missing field in both cases) and put in lists or
+    dicts.
+
+    Some functions calls are specialized when their arguments allow
+    it (see the `call_<function>` methods); E.g. constant regular
+    expressions given to `match` are compiled once.
+
+    Unsupported expressions (lambdas, comprehensions, etc.) raise
+    :class:`Uncompilable`.
+
+    :ivar functions: Functions map (see :attr:`Evaluator.functions`)
+    """
+
+    # Operators casting their fields operands
+    casting_operators = {
+        ast.Add:        operator.add,
+        ast.Sub:        operator.sub,
+        ast.Mult:       operator.mul,
+        ast.Div:        operator.truediv,
+        ast.Mod:        operator.mod,
+        ast.Eq:         operator.eq,
+        ast.NotEq:      operator.ne,
+        ast.Lt:         operator.lt,
+        ast.LtE:        operator.le,
+        ast.Gt:         operator.gt,
+        ast.GtE:        operator.ge,
+    }
+
+    # Other operators
+    operators = {
+        ast.FloorDiv:   operator.floordiv,
+        ast.Pow:        operator.pow,
+        ast.LShift:     operator.lshift,
+        ast.RShift:     operator.rshift,
+        ast.BitOr:      operator.or_,
+        ast.BitXor:     operator.xor,
+        ast.BitAnd:     operator.and_,
+        ast.Is:         operator.is_,
+        ast.IsNot:      operator.is_not,
+        ast.In:         lambda left, right: left in right,
+        ast.NotIn:      lambda left, right: left not in right,
+        ast.Not:        operator.not_,
+        ast.USub:       operator.neg,
+        ast.UAdd:       operator.pos,
+        ast.Invert:     operator.invert,
+    }
+
+    def __init__(self, functions: dict):
+        """
+        :param functions: Functions map
+        """
+        self.functions = functions
+
+    def __call__(self, expression: str) -> Callable[[dict], Any]:
+        """Compiles an expression.
+
+        :param expression: Python expression
+        """
+        function, _ = self.compile(ast.parse(expression, mode='eval').body)
+
+        def run(data: dict) -> Any:
+            value = function(data)
+            return value if type(value) is not Undefined else None
+
+        return run
+
+    def compile(self, node: ast.AST) -> tuple[Callable[[dict], Any], bool]:
+        """Compiles an expression node.
+
+        :param node: Expression node
+        :return: The node function and `True` if the node is a field
+        """
+        compiler = getattr(self, f'compile_{type(node).__name__}', None)
+        if compiler is None:
+            raise Uncompilable(type(node).__name__)
+        return compiler(node)
+
+    @staticmethod
+    def casting(function: Callable, left: bool, right: bool) -> Callable:
+        """Returns a binary operator casting its fields operands, as
+        :class:`EvalNS` does.
+
+        :param function: Binary operator
+        :param left: `True` if the left operand is a field
+        :param right: `True` if the right operand is a field
+        """
+        if left and right:
+            def operation(lvalue, rvalue):
+                if type(lvalue) is not Undefined and type(rvalue) is not Undefined:
+                    return function(lvalue, type(lvalue)(rvalue))
+                return function(lvalue, rvalue)
+        elif left:
+            def operation(lvalue, rvalue):
+                if type(lvalue) is not Undefined:
+                    return function(type(rvalue)(lvalue), rvalue)
+                return function(lvalue, rvalue)
+        elif right:
+            def operation(lvalue, rvalue):
+                if type(rvalue) is not Undefined:
+                    return function(lvalue, type(lvalue)(rvalue))
+                return function(lvalue, rvalue)
+        else:
+            return function
+        return operation
+
+    def operator(self, node: ast.AST, left: bool, right: bool) -> Callable:
+        """Returns a node's binary operator.
+
+        :param node: Operator node
+        :param left: `True` if the left operand is a field
+        :param right: `True` if the right operand is a field
+        """
+        if type(node) in self.casting_operators:
+            return self.casting(self.casting_operators[type(node)], left, right)
+        elif type(node) in (ast.In, ast.NotIn) and left:
+            def contains(lvalue, rvalue):
+                if type(lvalue) is not Undefined and isinstance(rvalue, (list, tuple)):
+                    return any(item == type(item)(lvalue) for item in rvalue)
+                return lvalue in rvalue
+            if type(node) is ast.In:
+                return contains
+            return lambda lvalue, rvalue: not contains(lvalue, rvalue)
+        elif type(node) in self.operators:
+            return self.operators[type(node)]
+        raise Uncompilable(type(node).__name__)
+
+    def lookup(self, parent: Callable, name: Any, key: Callable|None,
+                constant: Any = None) -> Callable:
+        """Returns a function reading a field's key, as
+        :meth:`EvalNS.__getitem__` does.
+
+        :param parent: Parent field function
+        :param name: Parent field name
+        :param key: Key function, or `None` if the key is constant
+        :param constant: Constant key
+        """
+        functions = self.functions
+
+        def missing(fields, key):
+            if type(fields) is Undefined:
+                return fields
+            elif key == name:
+                return fields
+            elif key in functions:
+                return functions[key]
+            return Undefined()
+
+        if key is None:
+            def run(data):
+                fields = parent(data)
+                if isinstance(fields, dict) and constant in fields:
+                    return fields[constant]
+                return missing(fields, constant)
+        else:
+            def run(data):
+                fields, value = parent(data), key(data)
+                if isinstance(fields, dict) and value in fields:
+                    return fields[value]
+                return missing(fields, value)
+        return run
+
+    @staticmethod
+    def name(node: ast.AST) -> Any:
+        """Returns a field node's name.
+
+        :param node: Field node
+        """
+        if isinstance(node, ast.Name):
+            return node.id
+        elif isinstance(node, ast.Attribute):
+            return node.attr
+        elif isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Constant):
+            return node.slice.value
+        return Undefined
+
+    def argument(self, node: ast.AST) -> Callable[[dict], Any]:
+        """Compiles a function argument; Fields are wrapped in a
+        :class:`Value`.
+
+        :param node: Argument node
+        """
+        function, field = self.compile(node)
+        if not field:
+            return function
+
+        def run(data):
+            value = function(data)
+            if type(value) is Undefined:
+                return value
+            return Value(value)
+
+        return run
+
+    # ---
+
+    def compile_Constant(self, node: ast.Constant):
+        value = node.value
+        return (lambda data: value), False
+
+    def compile_Name(self, node: ast.Name):
+        name = node.id
+        if name == 'keys':
+            def run(data):
+                if name in data:
+                    return data[name]
+                return lambda field = data: list(solve(field).keys())
+        elif name in self.functions:
+            function = self.functions[name]
+            def run(data):
+                if name in data:
+                    return data[name]
+                return function
+        else:
+            def run(data):
+                if name in data:
+                    return data[name]
+                return Undefined()
+        return run, True
+
+    def compile_Attribute(self, node: ast.Attribute):
+        parent, field = self.compile(node.value)
+        attr = node.attr
+        if field:
+            return self.lookup(parent, self.name(node.value), None, attr), True
+        return (lambda data: getattr(parent(data), attr)), False
+
+    def compile_Subscript(self, node: ast.Subscript):
+        parent, field = self.compile(node.value)
+        key, _ = self.compile(node.slice)
+        if field:
+            if isinstance(node.slice, ast.Constant):
+                return self.lookup(parent, self.name(node.value), None, node.slice.value), True
+            return self.lookup(parent, self.name(node.value), key), True
+        return (lambda data: parent(data)[key(data)]), False
+
+    def compile_Slice(self, node: ast.Slice):
+        lower, upper, step = [
+            item is not None and self.compile(item)[0] or (lambda data: None)
+            for item
+            in (node.lower, node.upper, node.step)
+        ]
+        return (lambda data: slice(lower(data), upper(data), step(data))), False
+
+    def compile_BinOp(self, node: ast.BinOp):
+        left, lfield = self.compile(node.left)
+        right, rfield = self.compile(node.right)
+        function = self.operator(node.op, lfield, rfield)
+        return (lambda data: function(left(data), right(data))), False
+
+    def compile_UnaryOp(self, node: ast.UnaryOp):
+        operand, _ = self.compile(node.operand)
+        function = self.operator(node.op, False, False)
+        return (lambda data: function(operand(data))), False
+
+    def compile_BoolOp(self, node: ast.BoolOp):
+        values = [self.compile(value)[0] for value in node.values]
+        if isinstance(node.op, ast.And):
+            def run(data):
+                for value in values:
+                    result = value(data)
+                    if not result:
+                        return result
+                return result
+        else:
+            def run(data):
+                for value in values:
+                    result = value(data)
+                    if result:
+                        return result
+                return result
+        return run, False
+
+    def compile_Compare(self, node: ast.Compare):
+        operands = [self.compile(node.left), ] + [
+            self.compile(comparator)
+            for comparator
+            in node.comparators
+        ]
+        functions = [
+            self.operator(op, operands[i][1], operands[i + 1][1])
+            for i, op
+            in enumerate(node.ops)
+        ]
+        if len(functions) == 1:
+            (left, _), (right, _) = operands
+            function = functions[0]
+            return (lambda data: function(left(data), right(data))), False
+        operands = [operand for operand, _ in operands]
+
+        def run(data):
+            left = operands[0](data)
+            for function, operand in zip(functions, operands[1:]):
+                right = operand(data)
+                if not function(left, right):
+                    return False
+                left = right
+            return True
+
+        return run, False
+
+    def compile_IfExp(self, node: ast.IfExp):
+        test, body, orelse = [
+            self.compile(item)[0]
+            for item
+            in (node.test, node.body, node.orelse)
+        ]
+        return (lambda data: body(data) if test(data) else orelse(data)), False
+
+    def compile_List(self, node: ast.List):
+        items = [self.compile(item)[0] for item in node.elts]
+        return (lambda data: [item(data) for item in items]), False
+
+    def compile_Tuple(self, node: ast.Tuple):
+        items = [self.compile(item)[0] for item in node.elts]
+        return (lambda data: tuple(item(data) for item in items)), False
+
+    def compile_Set(self, node: ast.Set):
+        items = [self.compile(item)[0] for item in node.elts]
+        return (lambda data: {item(data) for item in items}), False
+
+    def compile_Dict(self, node: ast.Dict):
+        if None in node.keys:
+            raise Uncompilable('Dict')
+        items = [
+            (self.compile(key)[0], self.compile(value)[0])
+            for key, value
+            in zip(node.keys, node.values)
+        ]
+        return (lambda data: {key(data): value(data) for key, value in items}), False
+
+    def compile_Call(self, node: ast.Call):
+        if any(isinstance(arg, ast.Starred) for arg in node.args) \
+                or any(keyword.arg is None for keyword in node.keywords):
+            raise Uncompilable('Call')
+        # Specialized functions calls
+        if isinstance(node.func, ast.Name):
+            special = getattr(self, f'call_{node.func.id}', None)
+            function = special is not None and special(node) or None
+            if function is not None:
+                name = node.func.id
+                def run(data):
+                    if name in data:
+                        return data[name]()
+                    return function(data)
+                return run, False
+        # Generic functions calls
+        function, _ = self.compile(node.func)
+        args = [self.argument(arg) for arg in node.args]
+        kwargs = [
+            (keyword.arg, self.argument(keyword.value))
+            for keyword
+            in node.keywords
+        ]
+        if kwargs:
+            return (lambda data: function(data)(
+                *[arg(data) for arg in args],
+                **{name: kwarg(data) for name, kwarg in kwargs}
+            )), False
+        elif len(args) == 0:
+            return (lambda data: function(data)()), False
+        elif len(args) == 1:
+            arg = args[0]
+            return (lambda data: function(data)(arg(data))), False
+        elif len(args) == 2:
+            arg0, arg1 = args
+            return (lambda data: function(data)(arg0(data), arg1(data))), False
+        return (lambda data: function(data)(*[arg(data) for arg in args])), False
+
+    # ---
+
+    def call_keys(self, node: ast.Call):
+        if node.keywords or len(node.args) > 1:
+            return None
+        elif not node.args:
+            return lambda data: list(data.keys())
+        field = self.argument(node.args[0])
+        return lambda data: list(solve(field(data)).keys())
+
+    def call_true(self, node: ast.Call, value: bool = True):
+        if node.keywords or len(node.args) != 1:
+            return None
+        field, cast = self.compile(node.args[0])
+        function = self.casting(operator.eq, cast, False)
+        return lambda data: function(field(data), value)
+
+    def call_false(self, node: ast.Call):
+        return self.call_true(node, False)
+
+    def call_field(self, node: ast.Call):
+        if node.keywords or len(node.args) not in (1, 2) \
+                or not all(isinstance(arg, ast.Constant) for arg in node.args[1:]):
+            return None
+        field = self.argument(node.args[0])
+        default = node.args[1].value if len(node.args) > 1 else None
+        types = (type(default), )
+        return lambda data: solve(field(data), types, default)
+
+    def call_match(self, node: ast.Call):
+        if node.keywords or len(node.args) != 2:
+            return None
+        values = node.args[1]
+        if isinstance(values, (ast.List, ast.Tuple)):
+            values = values.elts
+        else:
+            values = [values, ]
+        if not values or not all(isinstance(value, ast.Constant)
+                                    and isinstance(value.value, str)
+                                    for value in values):
+            return None
+        try:
+            patterns = [regex.compile(value.value) for value in values]
+        except regex.error:
+            return None
+        field = self.argument(node.args[0])
+
+        def run(data):
+            value = solve(field(data), (str,), '')
+            for pattern in patterns:
+                if pattern.search(value):
+                    return True
+            return False
+
+        return run
+
+    def call_strptime(self, node: ast.Call):
+        if node.keywords or len(node.args) != 2 \
+                or not isinstance(node.args[1], ast.Constant) \
+                or not isinstance(node.args[1].value, str):
+            return None
+        field = self.argument(node.args[0])
+        parse = compile_strptime(node.args[1].value)
+        return lambda data: parse(solve(field(data)))
+
+
 class Evaluator:
     """Evaluates a (simplified) Python expression.
 
@@ -181,10 +717,24 @@ class Evaluator:
     evaluate a Python expression (e.g. `eval` and `where` commands, or
     the `eval` field type).
 
+    Expressions are compiled into a closure (see :class:`Compiler`)
+    when possible, and are evaluated using :class:`EvalNS` otherwise
+    (the interpreted expressions are logged).
+
+    Evaluators are reentrant: the evaluation state is local to each
+    call, and the functions map is read-only. An evaluator may thus be
+    shared by several threads.
+
     :ivar functions: Utility functions available to ``eval`` and
         ``EvalNS``
+    :ivar closure: Compiled expression, or ``None`` if the expression
+        is interpreted
+    :ivar batch_threshold: Minimum batch size to evaluate using NumPy
+        (see :meth:`batch`)
     """
 
+    batch_threshold = 64
+
     # Evaluation functions
     functions = {
         # Misc.
@@ -242,34 +792,95 @@ class Evaluator:
         'makepath':     functions['joinpath'],
         'workdir':      functions['cwd'],
     })
+
+    # Evaluation functions are shared by all the evaluators (and
+    # threads); `keys` is bound to each evaluation's fields
+    functions = MappingProxyType(functions)
     
-    def __init__(self, expression: str):
+    def __init__(self, expression: str, interpreted: bool = False):
         """
         :param expression: Python expression to evaluate.
             This expression may uses the functions defined in
             ``Evaluator.functions``.
+        :param interpreted: Evaluate the expression with
+            :class:`EvalNS` instead of compiling it with
+            :class:`Compiler`
         """
+        self.expression = expression
         # Pre-compile the expression
         self.compiled = compile(
             source=expression,
             filename='<string>',
             mode='eval'
         )
-        # Pre-define the env
-        self.env = EvalNS(name='', functions=self.functions, fields={})
-
-    def __call__(self, data: dict = {}) -> Any:
-        """Runs evaluation and returns its result.
+        # Compile the expression into a closure; Unsupported
+        # expressions are interpreted
+        self.closure = None
+        if not interpreted:
+            try:
+                self.closure = Compiler(self.functions)(expression)
+            except Uncompilable as error:
+                logger.info((
+                    f'interpreting expression: expression="{expression}", '
+                    f'reason="Unsupported construct {error}"'
+                ))
+        # Columnar evaluator (see `batch`); Built on first use
+        self.columnar = None
+
+    def interpret(self, data: dict = {}) -> Any:
+        """Runs evaluation using :class:`EvalNS` and returns its result.
 
         :param data: Event fields used as eval globals
         """
-        # Define run-time functions
-        self.functions['keys'] = lambda field = data: list(solve(field).keys())
-        # Update environement (functions map and globals)
-        self.env.fields = data
-        # Evaluate the pre-compiled expression using built env
-        evaluated = eval(self.compiled, self.env)
+        # Evaluate the pre-compiled expression using a per-call env;
+        # `keys` is bound to the fields by EvalNS
+        evaluated = eval(
+            self.compiled,
+            EvalNS(name='', functions=self.functions, fields=data)
+        )
         # Solve the result a last time as EvalNS may returns a nested EvalNS
         solved = solve(evaluated, [], None)
         # Done
         return solved
+
+    def __call__(self, data: dict = {}) -> Any:
+        """Runs evaluation and returns its result.
+
+        :param data: Event fields used as eval globals
+        """
+        if self.closure is not None:
+            return self.closure(data)
+        return self.interpret(data)
+
+    def batch(self, rows: list[dict], *default) -> list[Any]:
+        """Runs evaluation on a batch of events fields and returns the
+        results, in order.
+
+        Numeric expressions are evaluated on the whole batch at once
+        using NumPy when it is installed (see
+        :class:`m42pl.utils.columnar.ColumnarEvaluator`); The other
+        expressions, and the rows which cannot be evaluated this way,
+        are evaluated one by one.
+
+        :param rows: Events fields
+        :param default: Result of the rows whose evaluation fails; If
+            not given, the first error is raised
+        """
+        results, fallback = [None, ] * len(rows), range(len(rows))
+        if len(rows) >= self.batch_threshold:
+            if self.columnar is None:
+                from .columnar import ColumnarEvaluator, Unsupported
+                try:
+                    self.columnar = ColumnarEvaluator(self.expression)
+                except (Unsupported, SyntaxError):
+                    self.columnar = False
+            if self.columnar:
+                results, fallback = self.columnar(rows)
+        for index in fallback:
+            try:
+                results[index] = self(rows[index])
+            except Exception:
+                if not len(default):
+                    raise
+                results[index] = default[0]
+        return results
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from m42pl.commands import Command
+
+
+class CommandMetrics:
+    """Runtime metrics of a command.
+
+    :ivar name: Command name in source script
+    :ivar line: Command line in source script
+    :ivar column: Command column in source script
+    :ivar offset: Command offset in source script
+    :ivar calls: Number of command calls
+    :ivar events_in: Number of received events
+    :ivar events_out: Number of yielded events
+    :ivar target_time: Time spent in the command, in seconds
+    :ivar blocked_time: Time spent waiting for the downstream commands
+        to process the yielded events, in seconds
+    :ivar errors: Number of command errors
+    :ivar remain: Latest amount of remaining (buffered) events
+    :ivar remain_peak: Maximum amount of remaining (buffered) events
+    :ivar spilled: Number of events spilled to disk (buffering
+        commands only)
+    :ivar spilled_bytes: Number of bytes spilled to disk (buffering
+        commands only)
+    """
+
+    __slots__ = ('name', 'line', 'column', 'offset', 'calls', 'events_in',
+                    'events_out', 'target_time', 'blocked_time', 'errors',
+                    'remain', 'remain_peak', 'spilled', 'spilled_bytes')
+
+    # Metrics names, in order
+    fields = ('calls', 'events_in', 'events_out', 'target_time',
+                'blocked_time', 'errors', 'remain', 'remain_peak',
+                'spilled', 'spilled_bytes')
+
+    def __init__(self, name: str = '', line: int = -1, column: int = -1,
+                    offset: int = -1) -> None:
+        """
+        :param name: Command name in source script
+        :param line: Command line in source script
+        :param column: Command column in source script
+        :param offset: Command offset in source script
+        """
+        self.name = name
+        self.line = line
+        self.column = column
+        self.offset = offset
+        self.reset()
+
+    def reset(self) -> None:
+        """Resets the metrics.
+        """
+        self.calls = 0
+        self.events_in = 0
+        self.events_out = 0
+        self.target_time = 0.0
+        self.blocked_time = 0.0
+        self.errors = 0
+        self.remain = 0
+        self.remain_peak = 0
+        self.spilled = 0
+        self.spilled_bytes = 0
+
+    def to_dict(self) -> dict:
+        """Returns the metrics as a :class:`dict`.
+        """
+        return {
+            'name': self.name,
+            'line': self.line,
+            'column': self.column,
+            'offset': self.offset,
+            **{field: getattr(self, field) for field in self.fields}
+        }
+
+    def merge(self, data: dict) -> None:
+        """Accounts the metrics reported by another copy of the command
+        (e.g. in a worker process).
+
+        :param data: Metrics, as returned by :meth:`to_dict`
+        """
+        for field in ('calls', 'events_in', 'events_out', 'target_time',
+                        'blocked_time', 'errors', 'spilled', 'spilled_bytes'):
+            setattr(self, field, getattr(self, field) + data.get(field, 0))
+        self.remain = data['remain']
+        self.remain_peak = max(self.remain_peak, data['remain_peak'])
+
+
+class MetricsRegistry:
+    """Holds the runtime metrics of a pipeline's commands.
+
+    The metrics are collected by :class:`m42pl.pipeline.PipelineRunner`
+    when it runs with ``stats`` enabled; Otherwise, the registry
+    remains empty.
+
+    :ivar commands: Commands metrics, per command key (see :meth:`key`)
+    """
+
+    @staticmethod
+    def key(command: Command) -> str:
+        """Returns a command's metrics key.
+
+        :param command: Command instance
+        """
+        return (
+            f'{command._offset_}:{command._lncol_[0]}:'
+            f'{command._lncol_[1]}:{command._name_}'
+        )
+
+    def __init__(self) -> None:
+        self.commands = {} # type: dict[str, CommandMetrics]
+
+    def get(self, command: Command) -> CommandMetrics:
+        """Returns a command's metrics, creating them if necessary.
+
+        :param command: Command instance
+        """
+        key = self.key(command)
+        if key not in self.commands:
+            self.commands[key] = CommandMetrics(
+                name=command._name_ or type(command).__name__,
+                line=command._lncol_[0],
+                column=command._lncol_[1],
+                offset=command._offset_
+            )
+        return self.commands[key]
+
+    def to_dict(self) -> dict:
+        """Returns the commands metrics as a :class:`dict`.
+        """
+        return {
+            key: metrics.to_dict()
+            for key, metrics
+            in self.commands.items()
+        }
+
+    def merge(self, data: dict) -> None:
+        """Accounts the commands metrics reported by another registry.
+
+        :param data: Commands metrics, as returned by :meth:`to_dict`
+        """
+        for key, metrics in data.items():
+            if key not in self.commands:
+                self.commands[key] = CommandMetrics(
+                    name=metrics['name'],
+                    line=metrics['line'],
+                    column=metrics['column'],
+                    offset=metrics['offset']
+                )
+            self.commands[key].merge(metrics)
+
+    def reset(self) -> None:
+        """Resets the commands metrics.
+
+        The commands metrics instances are kept, as they may still be
+        referenced by a running pipeline.
+        """
+        for metrics in self.commands.values():
+            metrics.reset()
+
+    def __len__(self) -> int:
+        return len(self.commands)
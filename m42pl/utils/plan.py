@@ -1,13 +1,45 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from m42pl.context import Context
+    from m42pl.utils.metrics import CommandMetrics
+
+import json
 from textwrap import dedent, indent
 from datetime import datetime
 
+import tabulate
+
+from m42pl.utils import tracing
+
 
 class Plan:
     """M42PL dispatcher and pipelines execution plan.
+
+    Once the pipelines have run with ``stats`` enabled, the plan can
+    be *analyzed* (see :meth:`analyze`): its commands are then filled
+    with their measured runtime metrics.
+
+    :ivar modes: Supported rendering modes
     """
 
+    modes = ('plantuml', 'text', 'json')
+
     class Command:
         """Represents an MPL command.
+
+        The measured metrics are ``None`` until the command is analyzed.
+
+        :ivar calls: Number of command calls
+        :ivar events_in: Number of received events
+        :ivar events_out: Number of yielded events
+        :ivar self_time: Time spent in the command, in seconds
+        :ivar cumulative_time: Time spent in the command and in the
+            next commands while processing its events, in seconds
+        :ivar peak_buffer: Maximum number of buffered events
+        :ivar errors: Number of command errors
         """
 
         def __init__(self, name: str):
@@ -15,9 +47,54 @@ class Plan:
             :param name: Command's name
             """
             self.name = name
+            self.calls = None # type: int|None
+            self.events_in = None # type: int|None
+            self.events_out = None # type: int|None
+            self.self_time = None # type: float|None
+            self.cumulative_time = None # type: float|None
+            self.peak_buffer = None # type: int|None
+            self.errors = None # type: int|None
+
+        @property
+        def measured(self) -> bool:
+            """Returns ``True`` if the command has been analyzed.
+            """
+            return self.calls is not None
+
+        def analyze(self, metrics: CommandMetrics):
+            """Sets the command's measured metrics.
+
+            :param metrics: Command runtime metrics
+            """
+            self.calls = metrics.calls
+            self.events_in = metrics.events_in
+            self.events_out = metrics.events_out
+            self.self_time = metrics.target_time
+            self.cumulative_time = metrics.target_time + metrics.blocked_time
+            self.peak_buffer = metrics.remain_peak
+            self.errors = metrics.errors
+
+        def to_dict(self) -> dict:
+            return {
+                'name': self.name,
+                'calls': self.calls,
+                'events_in': self.events_in,
+                'events_out': self.events_out,
+                'self_time': self.self_time,
+                'cumulative_time': self.cumulative_time,
+                'peak_buffer': self.peak_buffer,
+                'errors': self.errors
+            }
 
         def render_plantuml(self) -> str:
-            return f':{self.name};'
+            if not self.measured:
+                return f':{self.name};'
+            return (
+                f':{self.name}\\n'
+                f'in: {self.events_in} / out: {self.events_out}\\n'
+                f'self: {self.self_time:.6f}s / '
+                f'cumulative: {self.cumulative_time:.6f}s;'
+            )
 
     class Pipeline:
         """Represents an MPL pipeline, i.e. a list of commands.
@@ -37,6 +114,28 @@ class Plan:
             :param name: Command's name
             """
             self.commands.append(Plan.Command(name))
+
+        def analyze(self, metrics: list[CommandMetrics]):
+            """Sets the pipeline's commands measured metrics.
+
+            The commands are matched by name and in order; The matched
+            metrics are removed from ``metrics``.
+
+            :param metrics: Pipeline's commands runtime metrics, in
+                order
+            """
+            for command in self.commands:
+                for i, command_metrics in enumerate(metrics):
+                    if command_metrics.name == command.name:
+                        command.analyze(metrics.pop(i))
+                        break
+
+        def to_dict(self) -> dict:
+            return {
+                'name': self.name,
+                'runtime': self.runtime.total_seconds(),
+                'commands': [command.to_dict() for command in self.commands]
+            }
         
         def start(self):
             """Sets the pipeline start time.
@@ -47,6 +146,9 @@ class Plan:
             """Sets the pipeline end time.
             """
             self.stop_time = datetime.now()
+            if tracing.tracer is not None:
+                tracing.tracer.complete_datetime(self.name, 'pipeline',
+                    self.start_time, self.stop_time)
 
         @property
         def runtime(self):
@@ -105,6 +207,9 @@ class Plan:
             """Sets the layer stop time.
             """
             self.stop_time = datetime.now()
+            if tracing.tracer is not None:
+                tracing.tracer.complete_datetime(self.name, 'layer',
+                    self.start_time, self.stop_time)
         
         @property
         def runtime(self):
@@ -112,6 +217,17 @@ class Plan:
             """
             return self.stop_time - self.start_time
 
+        def to_dict(self) -> dict:
+            return {
+                'name': self.name,
+                'runtime': self.runtime.total_seconds(),
+                'pipelines': [
+                    pipeline.to_dict()
+                    for pipeline
+                    in self.pipelines
+                ]
+            }
+
         def render_plantuml(self) -> str:
             """Renders the layer as a PlantUML ``partition``.
             """
@@ -157,6 +273,83 @@ class Plan:
             self.add_layer()
         self.layers[-1].add_command(name)
     
+    def analyze(self, context: Context):
+        """Fills the plan's commands with their measured metrics.
+
+        The plan's pipelines are matched with the context's pipelines
+        by name. The context's pipelines which are not part of the plan
+        (e.g. sub-pipelines) but have been measured are added in a new
+        layer. If the plan is empty, it is built from the context.
+
+        :param context: Context of the executed pipelines
+        """
+        # Measured commands, per pipeline and in order
+        metrics = {
+            name: sorted(
+                pipeline.metrics.commands.values(),
+                key=lambda command_metrics: command_metrics.offset
+            )
+            for name, pipeline
+            in context.pipelines.items()
+        }
+        # Analyze the planned pipelines
+        planned = set()
+        for layer in self.layers:
+            for pipeline in layer.pipelines:
+                if pipeline.name in metrics:
+                    pipeline.analyze(metrics[pipeline.name])
+                    planned.add(pipeline.name)
+        # Add and analyze the unplanned pipelines
+        unplanned = [
+            name
+            for name, pipeline
+            in context.pipelines.items()
+            if name not in planned and len(pipeline.metrics)
+        ]
+        if len(unplanned):
+            self.add_layer()
+            for name in unplanned:
+                self.add_pipeline(name)
+                for command_metrics in list(metrics[name]):
+                    self.add_command(command_metrics.name)
+                self.layers[-1].pipelines[-1].analyze(metrics[name])
+
+    def to_dict(self) -> dict:
+        return {
+            'layers': [layer.to_dict() for layer in self.layers]
+        }
+
+    def render_json(self):
+        """Renders the plan as a JSON string.
+        """
+        return json.dumps(self.to_dict(), indent=2)
+
+    def render_text(self):
+        """Renders the plan as a text table.
+        """
+        headers = ['layer', 'pipeline', 'command', 'calls', 'in', 'out',
+                    'self (s)', 'cumulative (s)', 'peak buffer', 'errors']
+        data = []
+        for layer in self.layers:
+            for pipeline in layer.pipelines:
+                for command in pipeline.commands:
+                    if command.measured:
+                        data.append([
+                            layer.name,
+                            pipeline.name,
+                            command.name,
+                            command.calls,
+                            command.events_in,
+                            command.events_out,
+                            command.self_time,
+                            command.cumulative_time,
+                            command.peak_buffer,
+                            command.errors
+                        ])
+                    else:
+                        data.append([layer.name, pipeline.name, command.name])
+        return tabulate.tabulate(data, headers, floatfmt='.6f')
+
     def render_plantuml(self):
         """Renders the plan as a PlantUML source.
         """
@@ -177,6 +370,6 @@ class Plan:
     def render(self, mode: str = 'plantuml'):
         """Render the plan.
 
-        :param mode: Rendering mode, i.e. PlantUML
+        :param mode: Rendering mode (see :attr:`modes`)
         """
         return getattr(self, f'render_{mode}')()
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Coroutine
+
+if TYPE_CHECKING:
+    from m42pl.pipeline import Pipeline
+    from m42pl.context import Context
+
+import asyncio
+import threading
+from time import monotonic
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+# Worker process state (see :class:`ProcessPool`)
+process_state = {} # type: dict[str, Any]
+
+
+class ThreadPool:
+    """Runs coroutines in a pool of threads.
+
+    Each worker thread owns its own event loop, so blocking code
+    running in a coroutine (e.g. a command's ``target``) does not
+    block the calling event loop.
+
+    The pool keeps track of its usage:
+
+    * ``submitted``: Number of submitted coroutines
+    * ``completed``: Number of completed coroutines
+    * ``active``: Number of coroutines being run
+    * ``peak``: Maximum number of coroutines run at the same time
+    * ``wait_time``: Total time spent by the coroutines waiting for a
+      free worker thread
+
+    :ivar workers: Maximum number of worker threads
+    :ivar executor: Underlying thread pool executor
+    :ivar closed: ``True`` once the pool is shut down
+    """
+
+    def __init__(self, workers: int|None = None, name: str = 'm42pl'):
+        """
+        :param workers: Maximum number of worker threads; Defaults to
+            the :class:`ThreadPoolExecutor` default
+        :param name: Worker threads names prefix
+        """
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix=name,
+            initializer=self.init_worker
+        )
+        self.workers = self.executor._max_workers
+        self.local = threading.local()
+        self.loops = [] # type: list[asyncio.AbstractEventLoop]
+        self.lock = threading.Lock()
+        self.closed = False
+        # Usage
+        self.submitted = 0
+        self.completed = 0
+        self.active = 0
+        self.peak = 0
+        self.wait_time = 0.0
+
+    def init_worker(self) -> None:
+        """Creates the worker thread's event loop.
+        """
+        self.local.loop = asyncio.new_event_loop()
+        with self.lock:
+            self.loops.append(self.local.loop)
+
+    def run_worker(self, coroutine: Coroutine, submitted: float) -> Any:
+        """Runs a coroutine in the current worker thread.
+
+        :param coroutine: Coroutine to run
+        :param submitted: Coroutine submission time
+        """
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.wait_time += monotonic() - submitted
+        try:
+            return self.local.loop.run_until_complete(coroutine)
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.completed += 1
+
+    async def run(self, coroutine: Coroutine) -> Any:
+        """Runs a coroutine in a worker thread and returns its result.
+
+        :param coroutine: Coroutine to run
+        """
+        self.submitted += 1
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            self.run_worker,
+            coroutine,
+            monotonic()
+        )
+
+    @property
+    def saturation(self) -> float:
+        """Returns the ratio of busy worker threads.
+        """
+        return self.active / self.workers
+
+    def stats(self) -> dict:
+        """Returns the pool usage.
+        """
+        return {
+            'workers': self.workers,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'active': self.active,
+            'queued': self.submitted - self.completed - self.active,
+            'peak': self.peak,
+            'peak_saturation': self.peak / self.workers,
+            'wait_time': self.wait_time
+        }
+
+    def shutdown(self) -> None:
+        """Stops the worker threads and closes their event loops.
+        """
+        self.closed = True
+        self.executor.shutdown(wait=True)
+        for loop in self.loops:
+            loop.close()
+        self.loops = []
+
+
+def init_process(pipeline: dict, context: dict|None, positions: list,
+                    modules: tuple[list, list]) -> None:
+    """Builds and setups a pipeline in a worker process.
+
+    :param pipeline: Pipeline as :class:`dict`
+    :param context: Context as :class:`dict` (may be ``None``)
+    :param positions: Commands positions in the source script, as
+        tuples of (``_lncol_``, ``_offset_``, ``_name_``)
+    :param modules: Modules names and paths to load if the worker
+        process did not inherit them
+    """
+    import m42pl
+    from m42pl.event import Event
+    from m42pl.context import Context
+    from m42pl.pipeline import Pipeline, PipelineRunner
+    # Load missing modules
+    names, paths = modules
+    for path in paths:
+        if path not in m42pl.IMPORTED_MODULES_PATHS:
+            m42pl.load_module_path(namespace='m42pl', path=path)
+    for name in names:
+        if name not in m42pl.IMPORTED_MODULES_NAMES:
+            m42pl.load_module_name(name)
+    # Build pipeline
+    loop = asyncio.new_event_loop()
+    runner = PipelineRunner(Pipeline.from_dict(pipeline))
+    runner.context = context and Context.from_dict(context) or None
+    for command, position in zip(runner.pipeline.commands, positions):
+        command._lncol_, command._offset_, command._name_ = position
+    # Setup and enter commands
+    loop.run_until_complete(runner.setup_commands(Event()))
+    for command in runner.pipeline.commands:
+        loop.run_until_complete(command.__aenter__())
+    process_state.update(
+        loop=loop,
+        runner=runner,
+        stages=runner.compile_commands(runner.pipeline.commands)
+    )
+
+
+def run_process(events: list) -> tuple[list, dict, dict]:
+    """Runs the worker process pipeline on a batch of events.
+
+    :param events: Events batch
+    :return: The pipeline results, errors and commands metrics
+    """
+    runner = process_state['runner']
+
+    async def collect():
+        return [
+            _event async for _event
+            in runner.run_batch(process_state['stages'], events, False, 0)
+        ]
+
+    results = process_state['loop'].run_until_complete(collect())
+    errors, runner.pipeline.errors = runner.pipeline.errors, {}
+    metrics = runner.metrics.to_dict()
+    runner.metrics.reset()
+    return results, errors, metrics
+
+
+class ProcessPool:
+    """Runs a pipeline in a pool of processes.
+
+    Each worker process holds its own copy of the pipeline, rebuilt
+    from :meth:`m42pl.pipeline.Pipeline.to_dict`. Thus, the pipeline's
+    commands must be stateless.
+
+    The pool keeps track of its usage (see :class:`ThreadPool`).
+
+    :ivar workers: Maximum number of worker processes
+    :ivar executor: Underlying process pool executor
+    """
+
+    def __init__(self, workers: int|None, pipeline: Pipeline,
+                    context: Context|None = None):
+        """
+        :param workers: Maximum number of worker processes; Defaults
+            to the :class:`ProcessPoolExecutor` default
+        :param pipeline: Pipeline to run
+        :param context: Pipeline context
+        """
+        import m42pl
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_process,
+            initargs=(
+                pipeline.to_dict(),
+                context and context.to_dict() or None,
+                [
+                    (command._lncol_, command._offset_, command._name_)
+                    for command
+                    in pipeline.commands
+                ],
+                (m42pl.IMPORTED_MODULES_NAMES, m42pl.IMPORTED_MODULES_PATHS)
+            )
+        )
+        self.workers = self.executor._max_workers
+        # Usage
+        self.submitted = 0
+        self.completed = 0
+        self.peak = 0
+
+    async def run(self, events: list) -> tuple[list, dict, dict]:
+        """Runs the pipeline on a batch of events in a worker process.
+
+        :param events: Events batch
+        :return: The pipeline results, errors and commands metrics
+        """
+        self.submitted += 1
+        self.peak = max(self.peak, self.submitted - self.completed)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                run_process,
+                events
+            )
+        finally:
+            self.completed += 1
+
+    def stats(self) -> dict:
+        """Returns the pool usage.
+        """
+        return {
+            'workers': self.workers,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'peak': self.peak,
+            'peak_saturation': self.peak / self.workers
+        }
+
+    def shutdown(self) -> None:
+        """Stops the worker processes.
+        """
+        self.executor.shutdown(wait=True)
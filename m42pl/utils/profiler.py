@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from types import FrameType
+
+import sys
+import signal
+import threading
+from collections import Counter
+
+
+class Profiler:
+    """Sampling CPU profiler attributing the samples to M42PL commands.
+
+    The profiler samples the Python stacks on a ``SIGPROF`` interval
+    timer (i.e. every ``interval`` seconds of consumed CPU time). Each
+    sample is translated into an M42PL stack, from root to leaf:
+
+    * ``[<name>]``: Pipeline (or sub-pipeline) being run
+    * ``<alias>@<line>:<column>``: Command instance being run, and its
+      position in the source script
+    * ``<module>:<function>``: Python functions called by the commands
+
+    The pipeline machinery frames are omitted. Samples taken outside
+    of any pipeline are accounted as ``[other]``.
+
+    The samples are exported as collapsed stacks (see
+    :meth:`collapsed`), which may be rendered as a flame graph.
+
+    The profiler relies on ``signal.setitimer``: it is available on
+    Unix only, and must be started from the main thread.
+
+    :ivar interval: Sampling interval, in seconds of CPU time
+    :ivar all_threads: ``True`` to sample all threads (e.g. the
+        blocking commands threads pool), ``False`` to sample the main
+        thread only
+    :ivar samples: Number of samples per collapsed stack
+    :ivar commands: Number of samples per innermost pipeline and
+        command, i.e. the commands *self* samples
+    """
+
+    # Modules whose frames are omitted from the stacks
+    ignored_modules = (
+        'm42pl.pipeline',
+        'm42pl.utils.wakeup',
+        'm42pl.utils.pools',
+        'm42pl.utils.profiler'
+    )
+
+    def __init__(self, interval: float = 0.005, all_threads: bool = False):
+        """
+        :param interval: Sampling interval, in seconds of CPU time
+        :param all_threads: ``True`` to sample all threads, ``False``
+            to sample the main thread only
+        """
+        if not hasattr(signal, 'setitimer'):
+            raise Exception((
+                f'cannot start profiler: '
+                f'reason="signal.setitimer is not available on {sys.platform}"'
+            ))
+        self.interval = interval
+        self.all_threads = all_threads
+        self.samples = Counter() # type: Counter[str]
+        self.commands = Counter() # type: Counter[str]
+        self.previous_handler = None
+        self.running = False
+
+    def label(self, frame: FrameType, seen: set) -> tuple[str, str]|None:
+        """Returns a frame's kind (``pipeline``, ``command`` or
+        ``function``) and label in the M42PL stack, or ``None`` if the
+        frame must be omitted.
+
+        :param frame: Python frame
+        :param seen: Already labeled pipelines and commands instances
+        """
+        from m42pl.pipeline import PipelineRunner
+        from m42pl.commands import Command
+        code = frame.f_code
+        # Pipelines runners and commands instances
+        if code.co_argcount and code.co_varnames[0] == 'self':
+            instance = frame.f_locals.get('self')
+            if isinstance(instance, PipelineRunner):
+                if id(instance) in seen:
+                    return None
+                seen.add(id(instance))
+                return 'pipeline', f'[{instance.pipeline.name}]'
+            elif isinstance(instance, Command):
+                if id(instance) in seen:
+                    return None
+                seen.add(id(instance))
+                return 'command', (
+                    f'{instance._name_ or type(instance).__name__}'
+                    f'@{instance._lncol_[0]}:{instance._lncol_[1]}'
+                )
+        # Python functions
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith(self.ignored_modules):
+            return None
+        return 'function', f'{module}:{code.co_name}'
+
+    def sample(self, frame: FrameType) -> None:
+        """Accounts a Python stack.
+
+        :param frame: Stack leaf frame
+        """
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        # Build the M42PL stack, from root to leaf; The Python frames
+        # are kept only once a command has been reached.
+        stack = []
+        seen = set() # type: set[int]
+        pipeline, command = '[other]', None
+        for frame in reversed(frames):
+            labeled = self.label(frame, seen)
+            if labeled is None:
+                continue
+            kind, label = labeled
+            if kind == 'pipeline':
+                stack.append(label)
+                pipeline, command = label, None
+            elif kind == 'command':
+                stack.append(label)
+                command = label
+            elif command is not None:
+                stack.append(label)
+        self.samples[';'.join(stack or [pipeline, ])] += 1
+        self.commands[command and f'{pipeline} {command}' or pipeline] += 1
+
+    def handler(self, signum: int, frame: FrameType|None) -> None:
+        """``SIGPROF`` handler.
+        """
+        if self.all_threads:
+            current = threading.get_ident()
+            for ident, thread_frame in sys._current_frames().items():
+                self.sample(ident == current and frame or thread_frame)
+        elif frame is not None:
+            self.sample(frame)
+
+    def start(self) -> None:
+        """Starts sampling.
+        """
+        self.previous_handler = signal.signal(signal.SIGPROF, self.handler)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        self.running = True
+
+    def stop(self) -> None:
+        """Stops sampling.
+        """
+        if self.running:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self.previous_handler or signal.SIG_DFL)
+            self.running = False
+
+    def __enter__(self) -> Profiler:
+        self.start()
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.stop()
+
+    def collapsed(self) -> str:
+        """Returns the samples as collapsed stacks, i.e. one
+        ``<frame>;<frame>;... <count>`` line per stack.
+        """
+        return '\n'.join(
+            f'{stack} {count}'
+            for stack, count
+            in sorted(self.samples.items())
+        )
+
+    def dump(self, path: str) -> None:
+        """Writes the samples as collapsed stacks to a file.
+
+        :param path: Destination file path
+        """
+        with open(path, 'w') as fd:
+            fd.write(self.collapsed())
+            fd.write('\n')
@@ -0,0 +1,590 @@
+from __future__ import annotations
+
+import math
+import heapq
+import base64
+import random
+import hashlib
+from array import array
+
+from typing import Any
+
+from m42pl.utils.aggregation import Aggregator, hashable
+
+
+def hash64(value: Any) -> int:
+    """Returns a value's 64 bits hash.
+
+    Unlike :func:`hash`, the hash is stable across processes, so the
+    sketches built by distinct chunks can be merged. Strings and bytes
+    are hashed as is, the other values through their representation.
+
+    :param value: Value to hash
+    """
+    if isinstance(value, str):
+        data = value.encode()
+    elif isinstance(value, bytes):
+        data = value
+    else:
+        data = repr(value).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+class HyperLogLog:
+    """HyperLogLog distinct values counter.
+
+    The relative standard error is about ``1.04 / sqrt(2 ** precision)``
+    (0.8% with the default precision) for ``2 ** precision`` bytes of
+    memory.
+
+    :ivar precision: Number of hash bits used to select a register
+    :ivar registers: Registers (maximum rank per register)
+    """
+
+    def __init__(self, precision: int = 14, registers: bytearray|None = None):
+        """
+        :param precision: Number of hash bits used to select a
+            register, between 4 and 18
+        :param registers: Initial registers
+        """
+        if not 4 <= precision <= 18:
+            raise Exception((
+                f'invalid hyperloglog precision: precision="{precision}", '
+                f'reason="Precision should be between 4 and 18"'
+            ))
+        self.precision = precision
+        self.registers = registers if registers is not None \
+            else bytearray(1 << precision)
+        self.shift = 64 - precision
+        self.mask = (1 << self.shift) - 1
+
+    def update(self, value: Any) -> None:
+        """Accounts a value.
+
+        :param value: Value to count
+        """
+        digest = hash64(value)
+        index = digest >> self.shift
+        rank = self.shift - (digest & self.mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: HyperLogLog) -> None:
+        """Merges another counter of the same precision.
+
+        :param other: Counter to merge
+        """
+        if self.precision != other.precision:
+            raise Exception((
+                f'invalid hyperloglog merge: precision="{self.precision}", '
+                f'other="{other.precision}", '
+                f'reason="Counters should have the same precision"'
+            ))
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> float:
+        """Returns the estimated number of distinct values.
+        """
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        # Small cardinalities: linear counting
+        if estimate <= 2.5 * size and zeros:
+            return size * math.log(size / zeros)
+        return estimate
+
+    def dump(self) -> str:
+        """Returns the registers as a base64 string.
+        """
+        return base64.b64encode(self.registers).decode()
+
+    @classmethod
+    def load(cls, value: str) -> HyperLogLog:
+        """Returns a counter dumped by :meth:`dump`.
+
+        :param value: Dumped counter
+        """
+        registers = bytearray(base64.b64decode(value))
+        return cls(len(registers).bit_length() - 1, registers)
+
+
+class KLL:
+    """KLL quantiles sketch (Karnin, Lang and Liberty).
+
+    The values are stored in a hierarchy of compactors; Once full, a
+    compactor sorts its values and promotes one value out of two to the
+    next compactor, where each value weights twice more. The rank error
+    is about ``1.65 / k`` for ``O(k)`` values of memory.
+
+    :ivar k: Top compactor capacity (accuracy parameter)
+    :ivar compactors: Values per level (lowest level first)
+    :ivar size: Number of stored values
+    :ivar maxsize: Number of stored values triggering a compaction
+    """
+
+    def __init__(self, k: int = 200, compactors: list[list]|None = None):
+        """
+        :param k: Top compactor capacity
+        :param compactors: Initial compactors
+        """
+        if k < 8:
+            raise Exception((
+                f'invalid kll size: k="{k}", '
+                f'reason="K should be >= 8"'
+            ))
+        self.k = k
+        self.compactors = compactors or [[], ]
+        self.size = sum(len(compactor) for compactor in self.compactors)
+        self.resize()
+
+    def capacity(self, level: int) -> int:
+        """Returns a compactor's capacity.
+
+        :param level: Compactor level
+        """
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def resize(self) -> None:
+        """Updates :attr:`maxsize` after a levels change.
+        """
+        self.maxsize = sum(
+            self.capacity(level)
+            for level in range(len(self.compactors))
+        )
+
+    def compress(self) -> None:
+        """Compacts the lowest full compactor.
+        """
+        for level, compactor in enumerate(self.compactors):
+            if len(compactor) >= self.capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                    self.resize()
+                compactor.sort()
+                # Keep the odd value at its level to preserve weights
+                odd = [compactor.pop(), ] if len(compactor) % 2 else []
+                self.compactors[level + 1].extend(
+                    compactor[random.getrandbits(1)::2]
+                )
+                compactor[:] = odd
+                self.size = sum(len(compactor) for compactor in self.compactors)
+                return
+
+    def update(self, value: float) -> None:
+        """Accounts a value.
+
+        :param value: Numeric value
+        """
+        self.compactors[0].append(value)
+        self.size += 1
+        while self.size >= self.maxsize:
+            self.compress()
+
+    def merge(self, other: KLL) -> None:
+        """Merges another sketch.
+
+        :param other: Sketch to merge
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.size = sum(len(compactor) for compactor in self.compactors)
+        self.resize()
+        while self.size >= self.maxsize:
+            self.compress()
+
+    def quantile(self, q: float) -> float|None:
+        """Returns the estimated value at a given quantile.
+
+        :param q: Quantile, between ``0`` and ``1``
+        """
+        items = sorted(
+            (value, 1 << level)
+            for level, compactor in enumerate(self.compactors)
+            for value in compactor
+        )
+        if not items:
+            return None
+        target = q * sum(weight for _, weight in items)
+        rank = 0
+        for value, weight in items:
+            rank += weight
+            if rank >= target:
+                return value
+        return items[-1][0]
+
+    def dump(self) -> list[list]:
+        """Returns the compactors.
+        """
+        return self.compactors
+
+
+class CountMinSketch:
+    """Count-min frequencies sketch.
+
+    Estimates the number of occurrences of a value; The estimations
+    never under-count and over-count by at most ``e / width`` times the
+    total count, with probability ``1 - exp(-depth)``.
+
+    :ivar width: Number of counters per row
+    :ivar depth: Number of rows
+    :ivar table: Counters (rows concatenated)
+    :ivar total: Total count
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4,
+                    table: array|None = None, total: int = 0):
+        """
+        :param width: Number of counters per row
+        :param depth: Number of rows
+        :param table: Initial counters
+        :param total: Initial total count
+        """
+        if width < 1 or depth < 1:
+            raise Exception((
+                f'invalid count-min size: width="{width}", depth="{depth}", '
+                f'reason="Width and depth should be >= 1"'
+            ))
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None \
+            else array('Q', bytes(8 * width * depth))
+        self.total = total
+
+    def indexes(self, value: Any) -> list[int]:
+        """Returns a value's counters indexes (one per row).
+
+        :param value: Source value
+        """
+        digest = hash64(value)
+        first, second = digest & 0xffffffff, (digest >> 32) | 1
+        return [
+            row * self.width + (first + row * second) % self.width
+            for row in range(self.depth)
+        ]
+
+    def update(self, value: Any, count: int = 1) -> None:
+        """Accounts a value.
+
+        :param value: Value to count
+        :param count: Number of occurrences
+        """
+        digest = hash64(value)
+        first, second = digest & 0xffffffff, (digest >> 32) | 1
+        table, width = self.table, self.width
+        for row in range(self.depth):
+            table[row * width + (first + row * second) % width] += count
+        self.total += count
+
+    def estimate(self, value: Any) -> int:
+        """Returns a value's estimated number of occurrences.
+
+        :param value: Value to estimate
+        """
+        return min(self.table[index] for index in self.indexes(value))
+
+    def merge(self, other: CountMinSketch) -> None:
+        """Merges another sketch of the same size.
+
+        :param other: Sketch to merge
+        """
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise Exception((
+                f'invalid count-min merge: '
+                f'size="{self.width}x{self.depth}", '
+                f'other="{other.width}x{other.depth}", '
+                f'reason="Sketches should have the same size"'
+            ))
+        self.table = array('Q', map(sum, zip(self.table, other.table)))
+        self.total += other.total
+
+    def dump(self) -> dict:
+        """Returns the sketch as a :class:`dict`.
+        """
+        return {
+            'width': self.width,
+            'depth': self.depth,
+            'total': self.total,
+            'table': base64.b64encode(self.table.tobytes()).decode()
+        }
+
+    @classmethod
+    def load(cls, value: dict) -> CountMinSketch:
+        """Returns a sketch dumped by :meth:`dump`.
+
+        :param value: Dumped sketch
+        """
+        table = array('Q')
+        table.frombytes(base64.b64decode(value['table']))
+        return cls(value['width'], value['depth'], table, value['total'])
+
+
+class SpaceSaving:
+    """Space-saving top-K (heavy hitters) summary.
+
+    Keeps at most :attr:`k` counters; A new value replaces the value
+    with the lowest count, inheriting its count as its error. The
+    counts are over-estimated by at most the counter's error.
+
+    :ivar k: Maximum number of counters
+    :ivar counters: Counters, as ``[count, error]`` lists per value
+    """
+
+    def __init__(self, k: int = 10, counters: dict|None = None):
+        """
+        :param k: Maximum number of counters
+        :param counters: Initial counters
+        """
+        if k < 1:
+            raise Exception((
+                f'invalid space-saving size: k="{k}", '
+                f'reason="K should be >= 1"'
+            ))
+        self.k = k
+        self.counters = counters or {} # type: dict[Any, list[int]]
+
+    def update(self, value: Any, count: int = 1) -> None:
+        """Accounts a value.
+
+        :param value: Value to count
+        :param count: Number of occurrences
+        """
+        key = hashable(value)
+        counter = self.counters.get(key)
+        if counter is not None:
+            counter[0] += count
+        elif len(self.counters) < self.k:
+            self.counters[key] = [count, 0]
+        else:
+            victim = min(self.counters, key=lambda key: self.counters[key][0])
+            floor = self.counters.pop(victim)[0]
+            self.counters[key] = [floor + count, floor]
+
+    def minimum(self) -> int:
+        """Returns the lowest count, or ``0`` if the summary is not full.
+        """
+        if len(self.counters) < self.k:
+            return 0
+        return min(counter[0] for counter in self.counters.values())
+
+    def merge(self, other: SpaceSaving) -> None:
+        """Merges another summary.
+
+        The values missing from a summary are accounted with its lowest
+        count (their maximum possible count).
+
+        :param other: Summary to merge
+        """
+        mine, theirs = self.minimum(), other.minimum()
+        merged = {}
+        for key in {**self.counters, **other.counters}:
+            first = self.counters.get(key, [mine, mine])
+            second = other.counters.get(key, [theirs, theirs])
+            merged[key] = [first[0] + second[0], first[1] + second[1]]
+        self.counters = dict(heapq.nlargest(
+            self.k,
+            merged.items(),
+            key=lambda item: item[1][0]
+        ))
+
+    def top(self) -> list[list]:
+        """Returns the counters, as ``[value, count, error]`` lists,
+        highest count first.
+        """
+        return [
+            [key, count, error]
+            for key, (count, error) in sorted(
+                self.counters.items(),
+                key=lambda item: item[1][0],
+                reverse=True
+            )
+        ]
+
+    def dump(self) -> list[list]:
+        """Returns the counters (see :meth:`top`).
+        """
+        return self.top()
+
+    @classmethod
+    def load(cls, k: int, value: list[list]) -> SpaceSaving:
+        """Returns a summary dumped by :meth:`dump`.
+
+        :param k: Maximum number of counters
+        :param value: Dumped summary
+        """
+        return cls(k, {
+            hashable(key): [count, error]
+            for key, count, error in value
+        })
+
+
+class DistinctCount(Aggregator):
+    """Returns the estimated number of distinct values (HyperLogLog).
+
+    :ivar precision: HyperLogLog precision
+    """
+
+    _aliases_ = ['dc', 'distinct_count']
+
+    def __init__(self, precision: int = 14):
+        """
+        :param precision: HyperLogLog precision
+        """
+        self.precision = precision
+
+    def init(self):
+        return HyperLogLog(self.precision)
+
+    def update(self, state, value):
+        if value is not None:
+            state.update(value)
+        return state
+
+    def merge(self, state, other):
+        state.merge(other)
+        return state
+
+    def finalize(self, state):
+        return round(state.estimate())
+
+    def dump(self, state):
+        return state.dump()
+
+    def load(self, value):
+        return HyperLogLog.load(value)
+
+
+class Quantile(Aggregator):
+    """Returns the estimated quantile(s) of the numeric values (KLL).
+
+    :ivar q: Quantile, or list of quantiles, between ``0`` and ``1``
+    :ivar k: KLL accuracy parameter
+    """
+
+    _aliases_ = ['quantile', ]
+
+    def __init__(self, q: float|list[float] = 0.5, k: int = 200):
+        """
+        :param q: Quantile, or list of quantiles, between ``0`` and ``1``
+        :param k: KLL accuracy parameter
+        """
+        for quantile in q if isinstance(q, list) else [q, ]:
+            if not 0 <= quantile <= 1:
+                raise Exception((
+                    f'invalid quantile: q="{quantile}", '
+                    f'reason="Quantile should be between 0 and 1"'
+                ))
+        self.q = q
+        self.k = k
+
+    def init(self):
+        return KLL(self.k)
+
+    def update(self, state, value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            state.update(value)
+        return state
+
+    def merge(self, state, other):
+        state.merge(other)
+        return state
+
+    def finalize(self, state):
+        if isinstance(self.q, list):
+            return [state.quantile(q) for q in self.q]
+        return state.quantile(self.q)
+
+    def dump(self, state):
+        return state.dump()
+
+    def load(self, value):
+        return KLL(self.k, value)
+
+
+class Frequency(Aggregator):
+    """Returns the estimated number of occurrences of a set of values
+    (count-min sketch), as ``[value, count]`` lists.
+
+    :ivar items: Values to estimate
+    :ivar width: Count-min sketch width
+    :ivar depth: Count-min sketch depth
+    """
+
+    _aliases_ = ['frequency', ]
+
+    def __init__(self, items: list, width: int = 2048, depth: int = 4):
+        """
+        :param items: Values to estimate
+        :param width: Count-min sketch width
+        :param depth: Count-min sketch depth
+        """
+        self.items = items
+        self.width = width
+        self.depth = depth
+
+    def init(self):
+        return CountMinSketch(self.width, self.depth)
+
+    def update(self, state, value):
+        if value is not None:
+            state.update(value)
+        return state
+
+    def merge(self, state, other):
+        state.merge(other)
+        return state
+
+    def finalize(self, state):
+        return [[item, state.estimate(item)] for item in self.items]
+
+    def dump(self, state):
+        return state.dump()
+
+    def load(self, value):
+        return CountMinSketch.load(value)
+
+
+class TopK(Aggregator):
+    """Returns the most frequent values (space-saving), as
+    ``[value, count]`` lists, most frequent first.
+
+    The summary keeps more counters than the number of returned values
+    to improve their accuracy.
+
+    :ivar k: Number of values
+    :ivar counters: Number of counters
+    """
+
+    _aliases_ = ['top', 'topk']
+
+    def __init__(self, k: int = 10, counters: int|None = None):
+        """
+        :param k: Number of values
+        :param counters: Number of counters; Defaults to ``10 * k``
+        """
+        self.k = k
+        self.counters = counters or 10 * k
+
+    def init(self):
+        return SpaceSaving(self.counters)
+
+    def update(self, state, value):
+        if value is not None:
+            state.update(value)
+        return state
+
+    def merge(self, state, other):
+        state.merge(other)
+        return state
+
+    def finalize(self, state):
+        return [[value, count] for value, count, _ in state.top()[:self.k]]
+
+    def dump(self, state):
+        return state.dump()
+
+    def load(self, value):
+        return SpaceSaving.load(self.counters, value)
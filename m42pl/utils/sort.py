@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import heapq
+from collections import deque
+
+from typing import Any, Callable, Iterator, Union
+
+from m42pl.utils.cache import sizeof
+from m42pl.utils.spill import Segment
+
+
+# Sort key specification: a field name (prefixed with ``-`` for a
+# descending order), a key extractor, or a tuple ``(key, descending)``
+KeySpec = Union[str, Callable, tuple]
+
+
+class Descending:
+    """Sort key component sorted in descending order.
+
+    :ivar value: Wrapped component
+    """
+
+    __slots__ = ('value', )
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: Descending) -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Descending) and self.value == other.value
+
+    def __getstate__(self):
+        return self.value
+
+    def __setstate__(self, state):
+        self.value = state
+
+
+def normalize(value: Any) -> tuple:
+    """Returns a key component comparable with any other one.
+
+    Components are ordered by type first (``None``, numbers, strings,
+    then other values by their representation), then by value.
+
+    :param value: Extracted key value
+    """
+    if value is None:
+        return (0, 0)
+    elif isinstance(value, (int, float)):
+        return (1, value)
+    elif isinstance(value, str):
+        return (2, value)
+    return (3, repr(value))
+
+
+class ExternalSort:
+    """Sorts an unbounded number of events with a bounded memory.
+
+    The events are accumulated in memory until their approximate size
+    (see :func:`m42pl.utils.cache.sizeof`) reaches :attr:`memory`; They
+    are then sorted and written to a temporary file (a *run*, see
+    :class:`m42pl.utils.spill.Segment`). Once all the events are added,
+    the runs and the remaining in-memory events are merged (k-way heap
+    merge) and streamed out.
+
+    The sort is stable. If :attr:`limit` is set, only the first
+    :attr:`limit` events are kept, in memory (no runs are written).
+
+    Example, in a buffering command's :meth:`target`:
+
+    .. code-block:: python
+
+        sorter = ExternalSort(['-count', 'name'])
+        async for event in super().target(pipeline):
+            sorter.add(event)
+        for event in sorter:
+            yield event
+
+    :ivar keys: Key extractors and their order, as tuples
+        ``(extractor, descending)``
+    :ivar limit: Maximum number of sorted events, or ``None``
+    :ivar memory: In-memory events maximum size, in bytes
+    :ivar directory: Runs files directory, or ``None`` for the
+        system's temporary directory
+    :ivar fanin: Number of runs merged together once written (runs
+        are merged by levels, so each event is rewritten a logarithmic
+        number of times)
+    :ivar buffer: In-memory events, as ``(key, sequence, event)``
+    :ivar buffer_bytes: In-memory events approximate size, in bytes
+    :ivar runs: Sorted runs files
+    :ivar levels: Sorted runs merge levels
+    :ivar count: Number of added events
+    """
+
+    def __init__(self, keys: list[KeySpec], limit: int|None = None,
+                    memory: int = 64 * 1024 * 1024,
+                    directory: str|None = None, fanin: int = 64):
+        """
+        :param keys: Sort keys; Each key is a field name (prefixed
+            with ``-`` for a descending order), a key extractor
+            (called with the event) or a tuple ``(key, descending)``
+        :param limit: Maximum number of sorted events (``None`` for
+            no limit)
+        :param memory: In-memory events maximum size, in bytes
+        :param directory: Runs files directory
+        :param fanin: Number of runs merged together
+        """
+        if limit is not None and limit < 0:
+            raise Exception((
+                f'invalid sort limit: limit="{limit}", '
+                f'reason="Limit should be >= 0"'
+            ))
+        if memory < 1:
+            raise Exception((
+                f'invalid sort memory: memory="{memory}", '
+                f'reason="Memory should be >= 1"'
+            ))
+        self.keys = [self.extractor(key) for key in keys]
+        self.limit = limit
+        self.memory = memory
+        self.directory = directory
+        self.fanin = max(2, fanin)
+        self.buffer = [] # type: list[tuple]
+        self.buffer_bytes = 0
+        self.runs = [] # type: list[Segment]
+        self.levels = [] # type: list[int]
+        self.count = 0
+
+    @staticmethod
+    def extractor(key: KeySpec) -> tuple[Callable, bool]:
+        """Compiles a key specification.
+
+        :param key: Key specification
+        :return: A tuple ``(extractor, descending)``
+        """
+        # Imported here as m42pl.fields imports m42pl.pipeline
+        from m42pl.fields import Field
+        descending = False
+        if isinstance(key, tuple):
+            key, descending = key
+        elif isinstance(key, str) and key.startswith('-'):
+            key, descending = key[1:], True
+        if isinstance(key, str):
+            reader = Field(key).reader
+            if reader is None:
+                raise Exception((
+                    f'invalid sort key: key="{key}", '
+                    f'reason="Key should be readable synchronously"'
+                ))
+            return reader, bool(descending)
+        return key, bool(descending)
+
+    def key(self, event: dict) -> tuple:
+        """Returns an event's sort key.
+
+        :param event: Source event
+        """
+        return tuple(
+            Descending(normalize(extract(event))) if descending
+            else normalize(extract(event))
+            for extract, descending in self.keys
+        )
+
+    def add(self, event: dict) -> None:
+        """Adds an event.
+
+        :param event: Event to sort
+        """
+        item = (self.key(event), self.count, event)
+        self.count += 1
+        # Top-N: keep the first `limit` events in a heap whose root is
+        # the last kept event
+        if self.limit is not None:
+            entry = (Descending(item[:2]), item)
+            if len(self.buffer) < self.limit:
+                heapq.heappush(self.buffer, entry)
+            elif self.limit and item[:2] < self.buffer[0][0].value:
+                heapq.heapreplace(self.buffer, entry)
+            return
+        self.buffer.append(item)
+        self.buffer_bytes += sizeof(event.get('data'))
+        if self.buffer_bytes >= self.memory:
+            self.spill()
+
+    def spill(self) -> None:
+        """Sorts the in-memory events and writes them as a new run.
+        """
+        self.buffer.sort(key=lambda item: item[:2])
+        run = Segment(self.directory)
+        run.write(deque(self.buffer))
+        run.seal()
+        self.runs.append(run)
+        self.levels.append(0)
+        self.buffer = []
+        self.buffer_bytes = 0
+        # Merge the latest runs while they fill a level
+        while (
+            len(self.levels) >= self.fanin
+            and len(set(self.levels[-self.fanin:])) == 1
+        ):
+            self.compact()
+
+    def compact(self) -> None:
+        """Merges the latest :attr:`fanin` runs into a single one.
+        """
+        runs, level = self.runs[-self.fanin:], self.levels[-1]
+        del self.runs[-self.fanin:], self.levels[-self.fanin:]
+        merged = Segment(self.directory)
+        items = deque() # type: deque[tuple]
+        for item in heapq.merge(*[self.read(run) for run in runs],
+                                key=lambda item: item[:2]):
+            items.append(item)
+            if len(items) >= 1024:
+                merged.write(items)
+        merged.write(items)
+        merged.seal()
+        self.runs.append(merged)
+        self.levels.append(level + 1)
+
+    @staticmethod
+    def read(run: Segment) -> Iterator[tuple]:
+        """Reads a run, then deletes it.
+
+        :param run: Run file
+        """
+        try:
+            while run.count > 0:
+                yield run.read()
+        finally:
+            run.close()
+
+    def __iter__(self) -> Iterator[dict]:
+        """Yields the sorted events.
+
+        The sorter is emptied once iterated.
+        """
+        if self.limit is not None:
+            items = sorted((entry[1] for entry in self.buffer),
+                            key=lambda item: item[:2])
+            self.buffer = []
+            for item in items:
+                yield item[2]
+            return
+        self.buffer.sort(key=lambda item: item[:2])
+        runs = [self.read(run) for run in self.runs]
+        buffer, self.buffer, self.runs, self.levels = self.buffer, [], [], []
+        self.buffer_bytes = 0
+        for item in heapq.merge(*runs, buffer, key=lambda item: item[:2]):
+            yield item[2]
+
+    def close(self) -> None:
+        """Drops the added events and deletes the runs files.
+        """
+        for run in self.runs:
+            run.close()
+        self.runs = []
+        self.levels = []
+        self.buffer = []
+        self.buffer_bytes = 0
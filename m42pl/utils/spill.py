@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import mmap
+import struct
+import pickle
+import asyncio
+import tempfile
+from collections import deque
+
+from typing import IO
+
+from m42pl.utils.cache import sizeof
+
+
+# Frame header: encoded event length
+HEADER = struct.Struct('<I')
+
+
+class Segment:
+    """Spilled events temporary file.
+
+    The events are encoded with :mod:`pickle` and written as
+    length-prefixed frames. Once sealed (see :meth:`seal`), the segment
+    is read back sequentially or through a memory map.
+
+    :ivar file: Temporary file (deleted once closed)
+    :ivar count: Number of unread events
+    :ivar size: Written bytes
+    :ivar map: File memory map, or ``None`` when reading sequentially
+    :ivar offset: Read offset in the memory map
+    :ivar sealed: ``True`` once the segment is being read
+    """
+
+    def __init__(self, directory: str|None = None):
+        """
+        :param directory: Temporary file directory; Defaults to the
+            system's temporary directory
+        """
+        self.file = tempfile.TemporaryFile(prefix='m42pl-spill-',
+                                            dir=directory) # type: IO[bytes]
+        self.count = 0
+        self.size = 0
+        self.map = None # type: mmap.mmap|None
+        self.offset = 0
+        self.sealed = False
+
+    def write(self, events: deque) -> None:
+        """Writes (and removes) the events.
+
+        :param events: Events to write, in order
+        """
+        while len(events):
+            frame = pickle.dumps(events.popleft(), pickle.HIGHEST_PROTOCOL)
+            self.file.write(HEADER.pack(len(frame)))
+            self.file.write(frame)
+            self.count += 1
+            self.size += HEADER.size + len(frame)
+
+    def seal(self, use_mmap: bool = True) -> None:
+        """Ends the writes and prepares the reads.
+
+        :param use_mmap: ``True`` to read the file through a memory
+            map, ``False`` to read it sequentially
+        """
+        self.file.flush()
+        self.file.seek(0)
+        if use_mmap and self.size > 0:
+            try:
+                self.map = mmap.mmap(self.file.fileno(), 0,
+                                        access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                self.map = None
+        self.sealed = True
+
+    def read(self) -> dict:
+        """Reads the next event.
+        """
+        if self.map is not None:
+            length, = HEADER.unpack_from(self.map, self.offset)
+            self.offset += HEADER.size
+            event = pickle.loads(self.map[self.offset:self.offset + length])
+            self.offset += length
+        else:
+            length, = HEADER.unpack(self.file.read(HEADER.size))
+            event = pickle.loads(self.file.read(length))
+        self.count -= 1
+        return event
+
+    def close(self) -> None:
+        """Closes and deletes the file.
+        """
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+
+class SpillQueue:
+    """Events queue spilling its events to temporary files once they
+    exceed a memory threshold.
+
+    The queue implements the same API as
+    :class:`m42pl.commands.buffering.DequeQueue`, and is used by the
+    buffering commands of the pipelines setting a spill threshold (see
+    :attr:`m42pl.pipeline.Pipeline.spill`).
+
+    The events are kept in memory until their approximate size (see
+    :func:`m42pl.utils.cache.sizeof`) reaches :attr:`threshold`; They
+    are then written to a temporary file (see :class:`Segment`). The
+    events order is kept: the spilled events are read back (in
+    order) before the in-memory ones.
+
+    :ivar maxsize: Maximum number of events (``0`` for no limit)
+    :ivar threshold: In-memory events maximum size, in bytes
+    :ivar directory: Temporary files directory, or ``None`` for the
+        system's temporary directory
+    :ivar use_mmap: ``True`` to read the spilled events through a
+        memory map, ``False`` to read them sequentially
+    :ivar memory: In-memory events
+    :ivar sizes: In-memory events approximate sizes, in bytes
+    :ivar memory_bytes: In-memory events approximate size, in bytes
+    :ivar segments: Spilled events files, oldest first
+    :ivar spilled: Total number of spilled events
+    :ivar spilled_bytes: Total number of spilled bytes
+    """
+
+    def __init__(self, maxsize: int = 0, threshold: int = 256 * 1024 * 1024,
+                    directory: str|None = None, use_mmap: bool = True):
+        """
+        :param maxsize: Maximum number of events (``0`` for no limit)
+        :param threshold: In-memory events maximum size, in bytes
+        :param directory: Temporary files directory
+        :param use_mmap: ``True`` to read the spilled events through a
+            memory map, ``False`` to read them sequentially
+        """
+        if threshold < 1:
+            raise Exception((
+                f'invalid spill threshold: threshold="{threshold}", '
+                f'reason="Threshold should be >= 1"'
+            ))
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.directory = directory
+        self.use_mmap = use_mmap
+        self.memory = deque() # type: deque[dict]
+        self.sizes = deque() # type: deque[int]
+        self.memory_bytes = 0
+        self.segments = deque() # type: deque[Segment]
+        self.spilled = 0
+        self.spilled_bytes = 0
+
+    def spill(self) -> None:
+        """Writes the in-memory events to the latest segment.
+
+        A new segment is created if the latest one is already being
+        read.
+        """
+        if not len(self.segments) or self.segments[-1].sealed:
+            self.segments.append(Segment(self.directory))
+        segment = self.segments[-1]
+        count, size = segment.count, segment.size
+        segment.write(self.memory)
+        self.spilled += segment.count - count
+        self.spilled_bytes += segment.size - size
+        self.sizes.clear()
+        self.memory_bytes = 0
+
+    def qsize(self) -> int:
+        return len(self.memory) + sum(segment.count for segment in self.segments)
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self.qsize()
+
+    def put_nowait(self, item: dict) -> None:
+        size = sizeof(item.get('data'))
+        self.memory.append(item)
+        self.sizes.append(size)
+        self.memory_bytes += size
+        if self.memory_bytes >= self.threshold:
+            self.spill()
+
+    async def put(self, item: dict) -> None:
+        self.put_nowait(item)
+
+    def get_nowait(self) -> dict:
+        if len(self.segments):
+            segment = self.segments[0]
+            if not segment.sealed:
+                segment.seal(self.use_mmap)
+            item = segment.read()
+            if segment.count == 0:
+                segment.close()
+                self.segments.popleft()
+            return item
+        if not self.memory:
+            raise asyncio.QueueEmpty()
+        self.memory_bytes -= self.sizes.popleft()
+        return self.memory.popleft()
+
+    async def get(self) -> dict:
+        return self.get_nowait()
+
+    def close(self) -> None:
+        """Drops the queued events and deletes the temporary files.
+        """
+        while len(self.segments):
+            self.segments.popleft().close()
+        self.memory.clear()
+        self.sizes.clear()
+        self.memory_bytes = 0
@@ -34,6 +34,17 @@ ROUND_VALUES = {
     'mon':  {'microsecond': 0, 'second': 0, 'minute': 0, 'hour': 0, 'day': 1},
 }
 
+# Numeric `strptime` directives patterns (see :func:`compile_strptime`)
+STRPTIME_DIRECTIVES = {
+    'Y':    r'(?P<Y>\d\d\d\d)',
+    'm':    r'(?P<m>1[0-2]|0[1-9]|[1-9])',
+    'd':    r'(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])',
+    'H':    r'(?P<H>2[0-3]|[0-1]\d|\d)',
+    'M':    r'(?P<M>[0-5]\d|\d)',
+    'S':    r'(?P<S>6[0-1]|[0-5]\d|\d)',
+    'f':    r'(?P<f>[0-9]{1,6})',
+}
+
 # Delta values
 DELTA_VALUES = {
     'ms':   '',
@@ -108,3 +119,54 @@ def strptime(expression, format: str):
     :format: Time string format
     """
     return datetime.datetime.strptime(expression, format).timestamp()
+
+
+def compile_strptime(format: str):
+    """Returns a function parsing a time string with the given format
+    into an epoch float, as :func:`strptime` does.
+
+    Formats made of numeric directives only (year, month, day, hour,
+    minute, second and microsecond) are compiled once into a regex;
+    Other formats are parsed with :func:`strptime`.
+
+    :param format: Time string format
+    """
+    pattern, directives = [], set()
+    position = 0
+    while position < len(format):
+        char = format[position]
+        if char == '%':
+            directive = format[position + 1:position + 2]
+            if directive == '%':
+                pattern.append('%')
+            elif directive in STRPTIME_DIRECTIVES and directive not in directives:
+                pattern.append(STRPTIME_DIRECTIVES[directive])
+                directives.add(directive)
+            else:
+                return lambda expression: strptime(expression, format)
+            position += 2
+        elif char.isspace():
+            if not pattern or pattern[-1] != r'\s+':
+                pattern.append(r'\s+')
+            position += 1
+        else:
+            pattern.append(regex.escape(char))
+            position += 1
+    rx = regex.compile(''.join(pattern), regex.IGNORECASE)
+
+    def parse(expression: str) -> float:
+        found = rx.match(expression)
+        if found is None or found.end() != len(expression):
+            raise ValueError(f'time data {expression!r} does not match format {format!r}')
+        fields = found.groupdict()
+        return datetime.datetime(
+            int(fields.get('Y') or 1900),
+            int(fields.get('m') or 1),
+            int(fields.get('d') or 1),
+            int(fields.get('H') or 0),
+            int(fields.get('M') or 0),
+            int(fields.get('S') or 0),
+            int((fields.get('f') or '0').ljust(6, '0'))
+        ).timestamp()
+
+    return parse
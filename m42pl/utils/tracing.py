@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import os
+import json
+import random
+import asyncio
+import threading
+from time import perf_counter
+from datetime import datetime
+from contextvars import ContextVar
+
+
+# Active tracer (see :meth:`Tracer.start`)
+tracer = None # type: Tracer|None
+
+# Current event sampling decision (``None`` if undecided)
+sampled = ContextVar('m42pl_trace_sampled', default=None)
+
+
+class Tracer:
+    """Records execution spans and exports them in the Chrome trace
+    event format (loadable by ``chrome://tracing`` and Perfetto).
+
+    Once started, the tracer is used by:
+
+    * The pipelines runners, which open a span around each command
+      call and each generated event
+    * The sub-pipelines fields (``PipeField``), which open a span
+      around each sub-pipeline run
+    * The execution plans, which record the dispatchers layers and
+      pipelines
+
+    The runners decide whether to trace an event (or events batch)
+    when it enters the processors; The decision holds for the whole
+    event processing, including its sub-pipelines runs. In
+    ``concurrent`` mode, and outside of an event processing (e.g. for
+    the generated events), the spans are sampled individually.
+
+    Spans are recorded as *complete* events (``"ph": "X"``), one track
+    per asyncio task (or thread).
+
+    :ivar path: Trace file path
+    :ivar sample_rate: Ratio of traced events (``0.0`` to ``1.0``)
+    :ivar max_spans: Maximum number of recorded spans; The following
+        spans are dropped
+    :ivar spans: Recorded spans
+    :ivar dropped: Number of dropped spans
+    """
+
+    def __init__(self, path: str, sample_rate: float = 1.0,
+                    max_spans: int = 1000000):
+        """
+        :param path: Trace file path
+        :param sample_rate: Ratio of traced events (``0.0`` to ``1.0``)
+        :param max_spans: Maximum number of recorded spans
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise Exception((
+                f'invalid trace sample rate: sample_rate="{sample_rate}", '
+                f'reason="Rate should be between 0.0 and 1.0"'
+            ))
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_spans = max_spans
+        self.spans = [] # type: list[dict]
+        self.dropped = 0
+        self.pid = os.getpid()
+        self.tracks = {} # type: dict[int, int]
+        self.origin = perf_counter()
+        self.origin_time = datetime.now()
+
+    def start(self) -> Tracer:
+        """Sets the tracer as the active one.
+        """
+        global tracer
+        self.origin = perf_counter()
+        self.origin_time = datetime.now()
+        tracer = self
+        return self
+
+    def stop(self) -> None:
+        """Unsets the active tracer and writes the trace file.
+        """
+        global tracer
+        if tracer is self:
+            tracer = None
+        self.dump(self.path)
+
+    def __enter__(self) -> Tracer:
+        return self.start()
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.stop()
+
+    def begin(self) -> bool:
+        """Decides whether to trace the current event.
+
+        The decision is kept if it has already been taken (e.g. by the
+        parent pipeline of a sub-pipeline).
+
+        :return: ``True`` if the decision has been taken by the caller,
+            which must then call :meth:`end` once the event is
+            processed
+        """
+        if sampled.get() is None:
+            sampled.set(random.random() < self.sample_rate)
+            return True
+        return False
+
+    def end(self, owner: bool) -> None:
+        """Forgets the current event tracing decision.
+
+        :param owner: Value returned by :meth:`begin`
+        """
+        if owner:
+            sampled.set(None)
+
+    def enabled(self) -> bool:
+        """Returns ``True`` if the current event is traced.
+
+        Outside of an event processing, spans are sampled
+        individually.
+        """
+        decision = sampled.get()
+        if decision is None:
+            return random.random() < self.sample_rate
+        return decision
+
+    def now(self) -> float:
+        """Returns the current time, in seconds.
+        """
+        return perf_counter()
+
+    def track(self) -> int:
+        """Returns the current track identifier.
+
+        One track is allocated per asyncio task (or per thread outside
+        of a task).
+        """
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = task is not None and id(task) or threading.get_ident()
+        if key not in self.tracks:
+            self.tracks[key] = len(self.tracks) + 1
+            self.spans.append({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': self.pid,
+                'tid': self.tracks[key],
+                'args': {
+                    'name': task is not None and task.get_name()
+                            or threading.current_thread().name
+                }
+            })
+        return self.tracks[key]
+
+    def complete(self, name: str, category: str, start: float,
+                    end: float|None = None, args: dict = {}) -> None:
+        """Records a span.
+
+        :param name: Span name
+        :param category: Span category (e.g. ``command``)
+        :param start: Span start time, as returned by :meth:`now`
+        :param end: Span end time; Defaults to now
+        :param args: Span arguments
+        """
+        if len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return
+        if end is None:
+            end = perf_counter()
+        self.spans.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self.origin) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': self.pid,
+            'tid': self.track(),
+            'args': args
+        })
+
+    def complete_datetime(self, name: str, category: str, start: datetime,
+                            end: datetime, args: dict = {}) -> None:
+        """Records a span from wall-clock times (e.g. the execution
+        plans times).
+
+        :param name: Span name
+        :param category: Span category (e.g. ``layer``)
+        :param start: Span start time
+        :param end: Span end time
+        :param args: Span arguments
+        """
+        self.complete(
+            name,
+            category,
+            self.origin + (start - self.origin_time).total_seconds(),
+            self.origin + (end - self.origin_time).total_seconds(),
+            args
+        )
+
+    def to_dict(self) -> dict:
+        """Returns the trace in the Chrome trace event format.
+        """
+        return {
+            'traceEvents': self.spans,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'sample_rate': self.sample_rate,
+                'dropped': self.dropped
+            }
+        }
+
+    def dump(self, path: str) -> None:
+        """Writes the trace to a file.
+
+        :param path: Destination file path
+        """
+        with open(path, 'w') as fd:
+            json.dump(self.to_dict(), fd)
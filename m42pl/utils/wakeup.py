@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+import asyncio
+
+
+class WakeupIterator:
+    """Iterates over an asynchronous iterator and signals when it
+    takes too long to produce an item.
+
+    When the source iterator does not produce an item within
+    ``timeout`` seconds, :meth:`__anext__` returns :attr:`WAKEUP`;
+    The pending item is returned by the next call. A single wake-up is
+    signaled per pending item.
+
+    The source iterator is driven by a single task for the iterator's
+    lifetime, and the timeout is checked by a single loop timer which
+    is re-armed only when it expires: no task nor timer is created for
+    each item.
+
+    :ivar WAKEUP: Wake-up signal
+    :ivar wakeups: Number of signaled wake-ups
+    """
+
+    WAKEUP = object()
+
+    # Empty item slot
+    EMPTY = object()
+
+    def __init__(self, iterator: AsyncIterator, timeout: float):
+        """
+        :param iterator: Source iterator
+        :param timeout: Items timeout in seconds
+        """
+        self.iterator = iterator
+        self.timeout = timeout
+        self.loop = asyncio.get_running_loop()
+        self.task = None    # type: asyncio.Task|None
+        self.timer = None   # type: asyncio.TimerHandle|None
+        # Items requests and responses
+        self.request = self.loop.create_future()
+        self.response = None # type: asyncio.Future|None
+        self.requested = False
+        self.item = self.EMPTY
+        # Wake-up state
+        self.deadline = 0.0
+        self.woken = False
+        self.wakeups = 0
+
+    def __aiter__(self) -> WakeupIterator:
+        return self
+
+    async def pump(self) -> None:
+        """Gets the source iterator items on request.
+        """
+        while True:
+            await self.request
+            self.request = self.loop.create_future()
+            try:
+                item = await self.iterator.__anext__()
+            except Exception as error:
+                item = error
+            self.item = item
+            self.requested = False
+            if self.response is not None and not self.response.done():
+                self.response.set_result(None)
+            if isinstance(item, Exception):
+                return
+
+    def expire(self) -> None:
+        """Signals a wake-up if an item is awaited for too long.
+        """
+        self.timer = None
+        if self.response is None or self.response.done() or self.woken:
+            return
+        if self.loop.time() >= self.deadline:
+            self.woken = True
+            self.wakeups += 1
+            self.response.set_result(self.WAKEUP)
+        else:
+            self.timer = self.loop.call_at(self.deadline, self.expire)
+
+    async def __anext__(self):
+        # Request the next item
+        if self.task is None:
+            self.task = self.loop.create_task(self.pump())
+        if not self.requested and self.item is self.EMPTY:
+            self.requested = True
+            self.request.set_result(None)
+        # Wait for the item or for a wake-up
+        if self.item is self.EMPTY:
+            self.response = self.loop.create_future()
+            if not self.woken:
+                self.deadline = self.loop.time() + self.timeout
+                if self.timer is None:
+                    self.timer = self.loop.call_at(self.deadline, self.expire)
+            try:
+                if await self.response is self.WAKEUP:
+                    return self.WAKEUP
+            finally:
+                self.response = None
+        # Return the item
+        item, self.item = self.item, self.EMPTY
+        self.woken = False
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def aclose(self) -> None:
+        """Stops the iterator and closes the source iterator (if it
+        is closable, e.g. an asynchronous generator).
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        # Run the source generator's cleanup (e.g. `finally` blocks)
+        aclose = getattr(self.iterator, 'aclose', None)
+        if aclose is not None:
+            await aclose()
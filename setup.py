@@ -26,4 +26,8 @@ setup(
     'tabulate',
     'prompt_toolkit',
   ],
+  extras_require={
+    # Vectorized expressions evaluation (see `m42pl.utils.columnar`)
+    'numpy': ['numpy', ],
+  },
 )